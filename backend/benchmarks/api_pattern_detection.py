@@ -0,0 +1,107 @@
+# backend/benchmarks/api_pattern_detection.py
+"""
+외부 API 패턴 감지 마이크로벤치마크
+
+수 MB 크기의 합성 diff에 대해
+- legacy: 패턴 목록마다 any(pattern in code_diff) 로 diff를 반복해서 훑는 기존 방식
+- matcher: 모든 패턴을 하나로 컴파일한 PatternMatcher (diff 한 번 훑기)
+의 실행 시간을 비교합니다. --extra-patterns로 내부 API가 늘어난 상황(패턴 수 증가)도 재현합니다.
+
+사용법:
+    cd backend
+    python benchmarks/api_pattern_detection.py --sizes 1 4 16 --extra-patterns 0 500
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.api_registry import ApiDetectorRegistry  # noqa: E402
+from services.pattern_matcher import PatternMatcher  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+
+def legacy_detect(code_diff, api_patterns, url_patterns):
+    """기존 detect_external_apis와 같은 방식 (목록마다 diff 전체를 다시 검색)"""
+    detected = []
+    for api_type, patterns in api_patterns.items():
+        if any(pattern in code_diff for pattern in patterns):
+            detected.append(api_type)
+    for url, api_type in url_patterns.items():
+        if url in code_diff and api_type not in detected:
+            detected.append(api_type)
+    return detected
+
+
+def build_matcher(api_patterns, url_patterns):
+    return PatternMatcher(
+        [(pattern, ("code", api_type)) for api_type, patterns in api_patterns.items() for pattern in patterns]
+        + [(url, ("url", api_type)) for url, api_type in url_patterns.items()]
+    )
+
+
+def synthetic_diff(megabytes, seed=0):
+    """API 패턴이 없는 일반 코드 변경 diff (최악의 경우: 끝까지 훑어야 함)"""
+    rng = random.Random(seed)
+    words = ["def", "return", "self", "value", "config", "items", "result", "for", "in", "if", "None", "data"]
+    lines = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        line = rng.choice("+- ") + "    " + " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def extra_patterns(count, seed=1):
+    """내부 API가 늘어난 상황을 흉내 낸 추가 식별자 패턴"""
+    rng = random.Random(seed)
+    patterns = {}
+    for index in range(count):
+        name = "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(6, 14)))
+        patterns.setdefault(f"internal-{index % 50}", []).append(name + "Client")
+    return patterns
+
+
+def _time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 패턴 감지 방식 비교")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 16], help="diff 크기 (MB)")
+    parser.add_argument("--extra-patterns", type=int, nargs="+", default=[0, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--docs", default=os.path.join(ROOT, "RAG"), help="API 식별 패턴을 읽을 RAG 문서 디렉터리")
+    args = parser.parse_args()
+
+    registry = ApiDetectorRegistry(args.docs)
+    url_patterns = registry.url_patterns
+
+    print(f"{'patterns':>9} {'size(MB)':>9} {'legacy(ms)':>11} {'matcher(ms)':>12} {'speedup':>8}")
+    for extra in args.extra_patterns:
+        api_patterns = {**registry.api_patterns, **extra_patterns(extra)}
+        matcher = build_matcher(api_patterns, url_patterns)
+        pattern_count = sum(len(patterns) for patterns in api_patterns.values()) + len(url_patterns)
+        for megabytes in args.sizes:
+            code_diff = synthetic_diff(megabytes)
+            legacy = _time(lambda: legacy_detect(code_diff, api_patterns, url_patterns), args.repeat)
+            compiled = _time(lambda: matcher.find(code_diff), args.repeat)
+            print(
+                f"{pattern_count:>9} {megabytes:>9g} {legacy * 1000:>11.1f} "
+                f"{compiled * 1000:>12.1f} {legacy / compiled:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
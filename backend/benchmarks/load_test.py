@@ -0,0 +1,124 @@
+# backend/benchmarks/load_test.py
+"""
+분석 엔드포인트 동시 처리량 부하 테스트
+
+실행 중인 백엔드 서버에 동시성 단계별로 /analyze 요청을 보내고,
+같은 시간 동안 /health 응답 지연을 함께 측정합니다.
+LLM 호출이 이벤트 루프를 막지 않는다면 동시성이 올라갈수록 처리량이 늘고
+/health 지연은 수 ms 수준을 유지해야 합니다.
+
+사용법:
+    python benchmarks/load_test.py --url http://localhost:8000 --levels 1 4 16 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+SAMPLE_REQUEST = {
+    "code_diff": "=== auth/jwt_handler.py ===\n@@ -12,3 +12,4 @@\n-    TOKEN_EXPIRE_TIME = 30\n+    TOKEN_EXPIRE_TIME = 60 * 24\n",
+    "filename": "1개 파일",
+    "commit_message": "feat: 토큰 만료 시간 조정",
+    "provider": "Azure OpenAI",
+    "model": "gpt-4",
+    "analysis_types": ["코드 품질", "버그 탐지"]
+}
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _probe_health(session, base_url, stop_event, latencies):
+    """부하가 걸린 동안 /health 응답 지연 측정"""
+    while not stop_event.is_set():
+        started = time.perf_counter()
+        try:
+            async with session.get(f"{base_url}/health") as response:
+                await response.read()
+            latencies.append(time.perf_counter() - started)
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def _run_level(session, base_url, endpoint, concurrency, total):
+    """동시성 단계 하나 실행"""
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    latencies = []
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                async with session.post(f"{base_url}{endpoint}", json=SAMPLE_REQUEST) as response:
+                    data = await response.json()
+                    if response.status != 200 or not data.get("success"):
+                        failures += 1
+            except aiohttp.ClientError:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    health_latencies = []
+    stop_event = asyncio.Event()
+    health_task = asyncio.create_task(_probe_health(session, base_url, stop_event, health_latencies))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop_event.set()
+    await health_task
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "failures": failures,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": _percentile(latencies, 95),
+        "health_max": max(health_latencies) if health_latencies else 0.0
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="분석 엔드포인트 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/analyze")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests-per-worker", type=int, default=2)
+    args = parser.parse_args()
+
+    timeout = aiohttp.ClientTimeout(total=300)
+    connector = aiohttp.TCPConnector(limit=max(args.levels) + 1)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        print(f"{'동시성':>6} {'요청':>6} {'실패':>6} {'처리량(req/s)':>14} {'p50(s)':>8} {'p95(s)':>8} {'/health 최대(s)':>16}")
+        for level in args.levels:
+            result = await _run_level(
+                session, args.url, args.endpoint, level, level * args.requests_per_worker
+            )
+            print(
+                f"{result['concurrency']:>6} {result['requests']:>6} {result['failures']:>6} "
+                f"{result['throughput']:>14.2f} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+                f"{result['health_max']:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+# backend/benchmarks/prompt_layout.py
+"""
+프롬프트 레이아웃 비교 (v1: diff가 지침보다 앞 / v2: 고정 지침 → 지식 → 요청별 데이터)
+
+실제 커밋 diff와 RAG/*.md 문서로 두 레이아웃의 프롬프트를 만들어
+- 요청당 프롬프트 토큰 수
+- 연속된 요청 사이에 공유되는 prefix 토큰 수 (Azure OpenAI는 1024토큰 이상 같은 prefix부터 128토큰 단위로 캐시)
+를 비교합니다. --live를 주면 .env의 Azure OpenAI 설정으로 실제 호출해 첫 토큰 지연과 cached_tokens도 측정합니다.
+
+사용법:
+    cd backend
+    python benchmarks/prompt_layout.py --commits 20
+    python benchmarks/prompt_layout.py --commits 20 --same-knowledge
+    python benchmarks/prompt_layout.py --commits 10 --live
+"""
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.llm_service import (  # noqa: E402
+    AzureOpenAIService, RAG_SYSTEM_PROMPT, CRITICAL_SYSTEM_PROMPT,
+    RAG_ANALYSIS_GUIDE, CRITICAL_ANALYSIS_GUIDE, ANALYSIS_SECTIONS
+)
+from services.azure_rag_service import AzureRAGService  # noqa: E402
+from services.knowledge_chunks import split_sections  # noqa: E402
+from services.token_counter import count_tokens, _encoding  # noqa: E402
+from config import settings  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+ANALYSIS_TYPES = ["코드 품질", "버그 탐지"]
+
+# 캐시 대상이 되는 최소 prefix와 증가 단위 (Azure OpenAI prompt caching)
+CACHE_MIN_TOKENS = 1024
+CACHE_INCREMENT = 128
+
+
+def legacy_rag_prompt(code_diff, commit_message, filename, analysis_types, api_knowledge):
+    """v1 레이아웃 재현: diff가 먼저, API 지식은 본문과 응답 형식 안에 두 번"""
+    analysis_text = "\n".join(
+        f"- {name}: {ANALYSIS_SECTIONS[name]}" for name in analysis_types if name in ANALYSIS_SECTIONS
+    )
+    response_format = RAG_ANALYSIS_GUIDE.split("**응답 형식:**", 1)[1].replace(
+        "### 📚 관련 API 가이드라인 요약\n(제공된 가이드라인 중 이번 변경과 관련된 내용만 요약, 가이드라인이 없으면 생략)",
+        f"##관련 API 가이드라인 요약:\n{api_knowledge}"
+    )
+    return f"""다음 코드 변경사항을 분석해주세요:
+
+**파일명:** {filename}
+**커밋 메시지:** {commit_message}
+
+**코드 변경사항:**
+```diff
+{code_diff}
+```
+**분석 요청 항목:**
+{analysis_text}
+
+{api_knowledge}
+
+**위에 제공된 API 가이드라인이 있다면 반드시 참고하여 해당 API 사용 시 주의사항을 중점적으로 분석해주세요.**
+
+**응답 형식:**{response_format}"""
+
+
+def legacy_critical_prompt(code_diff, commit_message, filename):
+    """v1 레이아웃 재현: diff 다음에 고정 지침과 응답 형식"""
+    instructions = CRITICAL_ANALYSIS_GUIDE.split("\n", 2)[2]
+    return f"""다음 커밋 변경사항을 분석하여 **치명적인 오류 가능성**을 찾아주세요:
+
+**파일명:** {filename}
+**커밋 메시지:** {commit_message}
+
+**코드 변경사항:**
+```diff
+{code_diff}
+```
+
+{instructions}"""
+
+
+def load_commits(repo, limit):
+    """git log -p 출력 → [(메시지, diff)] (너무 큰 커밋은 앞부분만)"""
+    output = subprocess.run(
+        ["git", "-C", repo, "log", "-n", str(limit), "-p", "--no-color", "--format=%x1e%s"],
+        capture_output=True, text=True, encoding="utf-8", errors="replace", check=True
+    ).stdout
+    commits = []
+    for record in output.split("\x1e")[1:]:
+        subject, _, diff = record.partition("\n")
+        if diff.strip():
+            commits.append((subject, diff.strip()[:20000]))
+    return commits
+
+
+def load_knowledge():
+    """RAG/*.md 문서를 검색 결과 형식으로 포맷팅 (문서마다 하나)"""
+    rag = AzureRAGService.__new__(AzureRAGService)  # 포맷팅 메서드만 사용 (검색 클라이언트 불필요)
+    blocks = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "RAG", "*.md"))):
+        with open(path, encoding="utf-8") as doc:
+            blocks.append(rag.format_knowledge_for_prompt([
+                dict(section, score=1.0) for section in split_sections(os.path.basename(path), doc.read())
+            ]))
+    return blocks or [""]
+
+
+def build_prompts(commits, knowledge_blocks, same_knowledge=False):
+    """
+    레이아웃별 [(system, user)] 목록 - 요청 순서대로 RAG/치명적 분석을 번갈아 구성
+    same_knowledge: 모든 RAG 요청이 같은 API 문서를 참조 (같은 외부 API를 쓰는 커밋이 이어지는 경우)
+    """
+    service = AzureOpenAIService.__new__(AzureOpenAIService)  # 프롬프트 생성 메서드만 사용
+    layouts = {"v1": [], "v2": []}
+    for index, (subject, diff) in enumerate(commits):
+        filename = f"{diff.count('diff --git')}개 파일"
+        if index % 2 == 0:
+            knowledge = knowledge_blocks[0 if same_knowledge else (index // 2) % len(knowledge_blocks)]
+            layouts["v1"].append((RAG_SYSTEM_PROMPT, legacy_rag_prompt(diff, subject, filename, ANALYSIS_TYPES, knowledge)))
+            layouts["v2"].append((RAG_SYSTEM_PROMPT, service._create_analysis_prompt_with_rag(
+                diff, subject, filename, ANALYSIS_TYPES, knowledge
+            )))
+        else:
+            layouts["v1"].append((CRITICAL_SYSTEM_PROMPT, legacy_critical_prompt(diff, subject, filename)))
+            layouts["v2"].append((CRITICAL_SYSTEM_PROMPT, service._create_critical_analysis_prompt(
+                diff, subject, filename, ANALYSIS_TYPES
+            )))
+    return layouts
+
+
+def _tokens(text):
+    encoding = _encoding(settings.llm_tokenizer)
+    return encoding.encode(text, disallowed_special=()) if encoding is not None else None
+
+
+def shared_prefix_tokens(previous, current):
+    """앞서 보낸 같은 종류의 프롬프트와 공유하는 prefix 토큰 수"""
+    a, b = previous[0] + "\n" + previous[1], current[0] + "\n" + current[1]
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if tokens_a is None:
+        # 토크나이저가 없으면 공유 문자열 prefix의 추정 토큰 수
+        length = len(os.path.commonprefix([a, b]))
+        return count_tokens(a[:length])
+    length = 0
+    for left, right in zip(tokens_a, tokens_b):
+        if left != right:
+            break
+        length += 1
+    return length
+
+
+def cacheable(prefix_tokens):
+    if prefix_tokens < CACHE_MIN_TOKENS:
+        return 0
+    return CACHE_MIN_TOKENS + (prefix_tokens - CACHE_MIN_TOKENS) // CACHE_INCREMENT * CACHE_INCREMENT
+
+
+def report_offline(layouts):
+    print(f"{'layout':>6} {'prompt tok(avg)':>16} {'shared prefix(avg)':>19} {'cacheable(avg)':>15}")
+    for name, prompts in layouts.items():
+        totals = [count_tokens(system) + count_tokens(user) for system, user in prompts]
+        prefixes, cached = [], []
+        last_by_system = {}
+        for prompt in prompts:
+            previous = last_by_system.get(prompt[0])
+            if previous is not None:
+                prefix = shared_prefix_tokens(previous, prompt)
+                prefixes.append(prefix)
+                cached.append(cacheable(prefix))
+            last_by_system[prompt[0]] = prompt
+        print(
+            f"{name:>6} {statistics.mean(totals):>16.0f} "
+            f"{statistics.mean(prefixes or [0]):>19.0f} {statistics.mean(cached or [0]):>15.0f}"
+        )
+
+
+async def run_live(layouts, max_tokens):
+    """실제 호출: 레이아웃별 첫 토큰 지연, 전체 지연, cached_tokens"""
+    from openai import AsyncAzureOpenAI
+    client = AsyncAzureOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        timeout=settings.llm_timeout
+    )
+    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    print(f"\n{'layout':>6} {'ttft p50(s)':>12} {'total p50(s)':>13} {'cached tok(avg)':>16}")
+    for name, prompts in layouts.items():
+        first_token, total, cached = [], [], []
+        for system, user in prompts:
+            started = time.perf_counter()
+            stream = await client.chat.completions.create(
+                model=deployment,
+                messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+                temperature=0.1,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            first = None
+            async for chunk in stream:
+                if first is None and chunk.choices and chunk.choices[0].delta.content:
+                    first = time.perf_counter() - started
+                if chunk.usage is not None:
+                    details = getattr(chunk.usage, "prompt_tokens_details", None)
+                    cached.append(getattr(details, "cached_tokens", 0) or 0)
+            total.append(time.perf_counter() - started)
+            first_token.append(first or total[-1])
+        print(
+            f"{name:>6} {statistics.median(first_token):>12.2f} {statistics.median(total):>13.2f} "
+            f"{statistics.mean(cached or [0]):>16.0f}"
+        )
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 레이아웃 v1/v2 비교")
+    parser.add_argument("--repo", default=ROOT, help="diff를 가져올 git 저장소")
+    parser.add_argument("--commits", type=int, default=20)
+    parser.add_argument("--live", action="store_true", help="Azure OpenAI에 실제 요청")
+    parser.add_argument("--max-tokens", type=int, default=200)
+    parser.add_argument("--same-knowledge", action="store_true", help="모든 RAG 요청에 같은 API 문서 사용")
+    args = parser.parse_args()
+
+    layouts = build_prompts(load_commits(args.repo, args.commits), load_knowledge(), args.same_knowledge)
+    report_offline(layouts)
+    if args.live:
+        asyncio.run(run_live(layouts, args.max_tokens))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend/benchmarks/rag_retrieval.py
+"""
+로컬 RAG 인덱스 검색 마이크로벤치마크 (Azure Search 불필요)
+
+RAG/*.md 문서를 제목 단위 섹션으로 나눠(--copies로 복제해 섹션 수를 늘릴 수 있음)
+- 인덱스 빌드 시간
+- 저장된 인덱스의 mmap 로드 시간
+- API 종류별 검색어로 search(top=1) 한 번의 지연 (p50/p99)
+를 측정합니다. --embeddings를 주면 해시 임베딩 점수도 함께 계산합니다.
+
+사용법:
+    cd backend
+    python benchmarks/rag_retrieval.py
+    python benchmarks/rag_retrieval.py --copies 200 --embeddings
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.azure_rag_service import QUERY_TERMS  # noqa: E402
+from services.local_knowledge_index import LocalKnowledgeIndex, load_sections, docs_fingerprint  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 RAG 인덱스 검색 지연 측정")
+    parser.add_argument("--docs", default=os.path.join(ROOT, "RAG"), help="RAG 문서 디렉터리")
+    parser.add_argument("--copies", type=int, default=1, help="문서를 복제해 인덱스 크기 늘리기")
+    parser.add_argument("--embeddings", action="store_true", help="해시 임베딩 행렬 포함")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    documents = [
+        dict(section, filename=f"{copy}-{section['filename']}")
+        for copy in range(args.copies)
+        for section in load_sections(args.docs)
+    ]
+
+    started = time.perf_counter()
+    built = LocalKnowledgeIndex.build(documents, args.embeddings)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        fingerprint = docs_fingerprint(args.docs, args.embeddings)
+        built.save(index_dir, fingerprint)
+        started = time.perf_counter()
+        index = LocalKnowledgeIndex.load(index_dir, fingerprint)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        queries = list(QUERY_TERMS.values())
+        latencies = []
+        for number in range(args.queries):
+            started = time.perf_counter()
+            index.search(queries[number % len(queries)], top=1)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        print(f"sections={len(documents)} terms={len(index.vocab)} embeddings={args.embeddings}")
+        print(f"build: {build_ms:.1f}ms  mmap load: {load_ms:.1f}ms")
+        latencies.sort()
+        print(
+            f"search p50: {statistics.median(latencies):.3f}ms  "
+            f"p99: {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms"
+        )
+        for api_type, terms in QUERY_TERMS.items():
+            top = index.search(terms, top=1)
+            print(f"  {api_type:>16} → {top[0]['filename'] + ' / ' + top[0]['section'] if top else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,5 +12,80 @@ class Settings:
         self.api_port = int(os.getenv("API_PORT", "8000"))
         self.debug = os.getenv("DEBUG", "True").lower() == "true"
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        # LLM 호출 설정
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        self.llm_timeout = float(os.getenv("LLM_TIMEOUT", "120"))
+        # 큰 diff 분할 분석: 조각당 diff 토큰 상한과 요청당 조각 동시 분석 수
+        self.llm_chunk_tokens = int(os.getenv("LLM_CHUNK_TOKENS", "12000"))
+        self.llm_chunk_concurrency = int(os.getenv("LLM_CHUNK_CONCURRENCY", "4"))
+        # 토큰 계산 (tiktoken 인코딩 이름, 어휘 파일 캐시 위치는 TIKTOKEN_CACHE_DIR)
+        self.llm_tokenizer = os.getenv("LLM_TOKENIZER", "o200k_base")
+        # 호출 전 프롬프트 토큰 한도와 응답 최대 토큰 (한도는 모델 컨텍스트 - 응답 토큰 이하로)
+        self.llm_max_prompt_tokens = int(os.getenv("LLM_MAX_PROMPT_TOKENS", "100000"))
+        self.llm_max_completion_tokens = int(os.getenv("LLM_MAX_COMPLETION_TOKENS", "2000"))
+        # 프롬프트 구성 전 diff 압축
+        # DIFF_CONTEXT_LINES: 변경 줄 주변에 남길 문맥 줄 수 (-1이면 원본 유지, 0이면 문맥 제거)
+        # DIFF_GENERATED_FILES: 잠금/압축/vendor/생성/바이너리 파일 처리 방식 ("summary" 요약 한 줄, "drop" 제외)
+        # DIFF_SKIP_PATTERNS: 추가로 요약 처리할 경로 glob (예: "docs/*,*.svg")
+        self.diff_compaction = os.getenv("DIFF_COMPACTION", "true").lower() == "true"
+        self.diff_context_lines = int(os.getenv("DIFF_CONTEXT_LINES", "2"))
+        self.diff_generated_files = os.getenv("DIFF_GENERATED_FILES", "summary").lower()
+        self.diff_skip_patterns = [
+            pattern.strip().lower() for pattern in os.getenv("DIFF_SKIP_PATTERNS", "").split(",") if pattern.strip()
+        ]
+        # RAG 검색 백엔드 ("azure": Azure AI Search, "local": RAG/*.md 로컬 BM25 인덱스)
+        # RAG_INDEX_DIR 비우면 시작할 때마다 메모리에 빌드, RAG_EMBEDDINGS=true면 해시 임베딩 점수도 사용
+        self.rag_backend = os.getenv("RAG_BACKEND", "azure").lower()
+        self.rag_docs_dir = os.getenv(
+            "RAG_DOCS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RAG")
+        )
+        self.rag_index_dir = os.getenv("RAG_INDEX_DIR", "")
+        self.rag_embeddings = os.getenv("RAG_EMBEDDINGS", "false").lower() == "true"
+        # RAG 문서 변경 확인 주기(초) - 바뀌면 API 감지 패턴/로컬 인덱스를 재시작 없이 다시 로드
+        self.rag_reload_interval = float(os.getenv("RAG_RELOAD_INTERVAL", "5"))
+        # 프롬프트에 넣을 RAG 지식: 점수 높은 섹션부터 토큰 예산만큼 (여러 문서에 걸쳐 선택)
+        self.rag_knowledge_tokens = int(os.getenv("RAG_KNOWLEDGE_TOKENS", "800"))
+        self.rag_top_sections = int(os.getenv("RAG_TOP_SECTIONS", "12"))
+        self.rag_top_documents = int(os.getenv("RAG_TOP_DOCUMENTS", "3"))  # Azure 검색 결과 문서 수
+        # RAG 검색 한 번의 제한 시간(초) - 넘기면 지식 없이 분석 진행
+        self.rag_search_timeout = float(os.getenv("RAG_SEARCH_TIMEOUT", "3"))
+        # 패턴 조합별 RAG 지식 캐시 (RAG_CACHE_SIZE=0이면 사용 안 함)
+        self.rag_cache_size = int(os.getenv("RAG_CACHE_SIZE", "64"))
+        self.rag_cache_ttl = float(os.getenv("RAG_CACHE_TTL", "600"))
+        # 분석 결과 캐시 (ANALYSIS_CACHE_DB 비우면 메모리만 사용, App Service는 /home 아래가 영구 저장소)
+        self.analysis_cache_size = int(os.getenv("ANALYSIS_CACHE_SIZE", "256"))
+        self.analysis_cache_db = os.getenv("ANALYSIS_CACHE_DB", "")
+        self.analysis_cache_disk_max = int(os.getenv("ANALYSIS_CACHE_DISK_MAX", "10000"))
+        # GitHub API 커넥션 풀
+        self.github_max_connections = int(os.getenv("GITHUB_MAX_CONNECTIONS", "100"))
+        self.github_max_connections_per_host = int(os.getenv("GITHUB_MAX_CONNECTIONS_PER_HOST", "30"))
+        self.github_dns_cache_ttl = int(os.getenv("GITHUB_DNS_CACHE_TTL", "300"))
+        self.github_keepalive_timeout = float(os.getenv("GITHUB_KEEPALIVE_TIMEOUT", "30"))
+        self.github_timeout = float(os.getenv("GITHUB_TIMEOUT", "10"))
+        self.github_connect_timeout = float(os.getenv("GITHUB_CONNECT_TIMEOUT", "5"))
+        self.github_http_cache_size = int(os.getenv("GITHUB_HTTP_CACHE_SIZE", "1000"))
+        # GitHub rate limit 스케줄러 (대기 한도는 초 단위)
+        self.github_rate_limit_retries = int(os.getenv("GITHUB_RATE_LIMIT_RETRIES", "2"))
+        self.github_bulk_reserve_ratio = float(os.getenv("GITHUB_BULK_RESERVE_RATIO", "0.1"))
+        self.github_interactive_max_wait = float(os.getenv("GITHUB_INTERACTIVE_MAX_WAIT", "30"))
+        self.github_bulk_max_wait = float(os.getenv("GITHUB_BULK_MAX_WAIT", "3600"))
+        # 다건 커밋 분석
+        self.github_batch_concurrency = int(os.getenv("GITHUB_BATCH_CONCURRENCY", "8"))
+        self.batch_max_commits = int(os.getenv("BATCH_MAX_COMMITS", "100"))
+        # 로컬 clone 저장소 매핑 (예: "owner/repo=/home/repos/repo,owner2/repo2=/home/repos/repo2")
+        self.local_git_repos = {
+            name.strip().lower(): path.strip()
+            for name, path in (
+                item.split("=", 1) for item in os.getenv("LOCAL_GIT_REPOS", "").split(",") if "=" in item
+            )
+        }
+
+        # 커밋 이력 인덱스 (HISTORY_INDEX_DIR 비우면 메모리만 사용)
+        self.history_index_dir = os.getenv("HISTORY_INDEX_DIR", "")
+        self.history_checkpoint_commits = int(os.getenv("HISTORY_CHECKPOINT_COMMITS", "500"))
+        # 이 개수보다 많은 파일을 바꾼 커밋은 동시 변경 행렬에서 제외 (대규모 일괄 변경)
+        self.cochange_max_files = int(os.getenv("COCHANGE_MAX_FILES", "50"))
+        # 예측 모델의 빌드 성공 확률이 이 값 이상이면 LLM 분석 생략 (0이면 항상 LLM 호출)
+        self.predict_skip_llm_above = float(os.getenv("PREDICT_SKIP_LLM_ABOVE", "0"))
 
 settings = Settings()
\ No newline at end of file
@@ -1,12 +1,58 @@
 # backend/main.py
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+from typing import List, AsyncIterator, Dict, Any
+import asyncio
+import json
 import time
 from services.llm_service import AzureOpenAIService
+from services.github_service import GitHubService
+from services.local_git_service import LocalGitService, REVISION_PATTERN
+from services.commit_source import CommitSource, CommitSourceError
+from services.history_miner import HistoryMiner
+from services.history_index import format_history_for_prompt
+from services.commit_risk_model import featurize
+from services.token_counter import load_tokenizer, add_usage
+from services.diff_compactor import compact_files, compact_diff
+from models.github_models import GitHubConfig, AnalysisRequest, CommitDetailResponse
+from config import settings
 
-app = FastAPI(title="GitHub Commit Analyzer API")
+# GitHub API 클라이언트 (커넥션 풀을 요청 간에 공유)
+github_service = GitHubService()
+
+# 로컬 clone이 설정된 저장소는 GitHub API 대신 디스크에서 직접 읽음
+local_git_services = {
+    name: LocalGitService(path) for name, path in settings.local_git_repos.items()
+}
+
+def _commit_source(owner: str, repo: str) -> CommitSource:
+    """저장소별 커밋 공급원 선택 (로컬 clone 우선)"""
+    return local_git_services.get(f"{owner}/{repo}".lower(), github_service)
+
+# 커밋 이력 기반 경로 위험도 인덱스
+history_miner = HistoryMiner(
+    settings.history_index_dir,
+    settings.history_checkpoint_commits,
+    settings.cochange_max_files,
+    settings.github_batch_concurrency
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 세션을 미리 만들어 두고, 종료 시 커넥션 풀을 정리
+    await github_service.get_session()
+    await asyncio.to_thread(history_miner.load)
+    await asyncio.to_thread(load_tokenizer)
+    yield
+    await github_service.close()
+    await llm_service.client.close()
+    await llm_service.rag_service.close()
+    llm_service.cache.close()
+
+app = FastAPI(title="GitHub Commit Analyzer API", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -34,6 +80,9 @@ class AIAnalysisResponse(BaseModel):
     success: bool
     result: str
     error: str = None
+    history_risk: Dict[str, Any] = None  # 이력 인덱스가 있는 저장소만 (/analyze-real-commit)
+    token_usage: Dict[str, int] = None  # 로컬 토크나이저 기준 프롬프트/응답 토큰 수, LLM 호출 수
+    compaction: Dict[str, int] = None  # diff 압축으로 줄인 바이트/토큰 수
 
 
 
@@ -42,25 +91,34 @@ async def analyze_code(request: AIAnalysisRequest):
     """
     AI 코드 분석 엔드포인트 - 실제 Azure OpenAI 연동
     """
+    token_usage = {}
+    compaction = {}
     try:
+        code_diff, compaction = compact_diff(request.code_diff)
+        
         # 실제 Azure OpenAI로 분석
-        analysis_result = llm_service.analyze_code(
-            code_diff=request.code_diff,
+        analysis_result = await llm_service.analyze_code(
+            code_diff=code_diff,
             commit_message=request.commit_message,
             filename=request.filename,
-            analysis_types=request.analysis_types
+            analysis_types=request.analysis_types,
+            usage=token_usage
         )
         
         return AIAnalysisResponse(
             success=True,
-            result=analysis_result
+            result=analysis_result,
+            token_usage=token_usage,
+            compaction=compaction
         )
         
     except Exception as e:
         return AIAnalysisResponse(
             success=False,
             result="",
-            error=f"분석 중 오류가 발생했습니다: {str(e)}"
+            error=f"분석 중 오류가 발생했습니다: {str(e)}",
+            token_usage=token_usage,
+            compaction=compaction
         )
 
 @app.get("/")
@@ -71,6 +129,24 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": time.time()}
 
+@app.get("/metrics")
+async def metrics():
+    """캐시 등 내부 상태 카운터"""
+    return {
+        "analysis_cache": llm_service.cache.stats(),
+        "single_flight": llm_service.inflight.stats(),
+        "api_detection": llm_service.rag_service.stats(),
+        "github_http_cache": github_service.http_cache.stats(),
+        "github_rate_limit": github_service.rate_limiter.stats(),
+        "history_index": history_miner.stats()
+    }
+
+@app.post("/rag/reload")
+async def reload_rag_index():
+    """RAG 인덱스 재빌드 후 호출 - 로컬 인덱스 다시 빌드, 패턴 조합별 지식 캐시 비우기"""
+    await asyncio.to_thread(llm_service.rag_service.reload_index)
+    return llm_service.rag_service.stats()
+
 # 새로운 요청 모델
 class CommitAnalysisRequest(BaseModel):
     commit_sha: str
@@ -83,6 +159,27 @@ class RealCommitAnalysisRequest(BaseModel):
     analysis_types: List[str]
     github_token: str = None
 
+class PredictFile(BaseModel):
+    filename: str
+    additions: int = 0
+    deletions: int = 0
+
+class PredictRequest(BaseModel):
+    repo_owner: str
+    repo_name: str
+    # commit_sha를 주면 커밋을 조회해 예측, 아니면 files / commit_message로 직접 예측 (아직 커밋하지 않은 변경)
+    commit_sha: str = None
+    github_token: str = None
+    commit_message: str = ""
+    files: List[PredictFile] = []
+
+class HistoryIngestRequest(BaseModel):
+    owner: str
+    repo: str
+    # git 옵션으로 해석되는 값("-"로 시작 등)은 422로 거부
+    branch: str = Field("main", pattern=REVISION_PATTERN.pattern)
+    token: str = None
+
 DUMMY_COMMITS = {
     "abc123": {
         "sha": "abc123def456789",
@@ -142,54 +239,149 @@ DUMMY_COMMITS = {
 }
 
 
+class AnalysisInputError(Exception):
+    """분석 대상 커밋을 준비하지 못한 경우 (사용자에게 그대로 보여줄 메시지)"""
+    pass
+
+def _combine_patches(files) -> str:
+    """파일들을 하나의 diff로 합치기"""
+    all_patches = []
+    for file in files:
+        if file.get("patch"):
+            all_patches.append(f"=== {file.get('filename')} ===\n{file.get('patch')}")
+    return "\n\n".join(all_patches)
+
+def _compact_files(files, compaction: Dict[str, int]) -> str:
+    """LLM에 보낼 diff (압축 단계 적용, 절감 통계는 compaction에 누적)"""
+    code_diff, stats = compact_files(files)
+    add_usage(compaction, **stats)
+    return code_diff
+
+def _prepare_dummy_commit(commit_sha: str, compaction: Dict[str, int] = None):
+    """더미 커밋 데이터에서 (LLM용 diff, 커밋 메시지, 파일 요약) 준비"""
+    commit_data = None
+    for dummy_sha, data in DUMMY_COMMITS.items():
+        if commit_sha.lower().startswith(dummy_sha.lower()):
+            commit_data = data
+            break
+    
+    if not commit_data:
+        raise AnalysisInputError(
+            f"커밋 SHA '{commit_sha}'를 찾을 수 없습니다. 사용 가능한 SHA: abc123, def456, ghi789"
+        )
+    
+    code_diff = _compact_files(commit_data["files"], compaction)
+    filename_summary = f"{len(commit_data['files'])}개 파일"
+    return code_diff, commit_data["commit"]["message"], filename_summary
+
+async def _fetch_real_commit(request: RealCommitAnalysisRequest) -> CommitDetailResponse:
+    """GitHub API(또는 로컬 clone)로 커밋 상세 정보 조회"""
+    config = GitHubConfig(
+        owner=request.repo_owner,
+        repo=request.repo_name,
+        token=request.github_token
+    )
+    source = _commit_source(request.repo_owner, request.repo_name)
+    try:
+        commit_detail = await source.get_commit_detail(config, request.commit_sha)
+    except CommitSourceError as e:
+        if e.status == 404:
+            raise AnalysisInputError(
+                f"커밋을 찾을 수 없습니다. Repository: {request.repo_owner}/{request.repo_name}, SHA: {request.commit_sha}"
+            )
+        elif e.status is not None:
+            raise AnalysisInputError(f"GitHub API 오류: HTTP {e.status}")
+        raise AnalysisInputError(str(e))
+    return commit_detail
+
+def _prepare_commit_detail(commit_detail: CommitDetailResponse):
+    """커밋 상세 정보에서 (압축 전 combined_diff, 커밋 메시지, 파일 요약) 준비"""
+    files = [file.dict() for file in commit_detail.files]
+    if not files:
+        raise AnalysisInputError("분석할 파일 변경사항이 없습니다.")
+    
+    combined_diff = _combine_patches(files)
+    if not combined_diff:
+        raise AnalysisInputError("분석할 코드 변경사항이 없습니다.")
+    
+    filename_summary = f"{len(files)}개 파일"
+    return combined_diff, commit_detail.commit.message, filename_summary
+
+def _history_risk(owner: str, repo: str, sha: str, files, combined_diff: str, commit_message: str):
+    """
+    이력 인덱스 기반 위험 신호 (인덱스가 없으면 None, API 호출 없이 메모리/mmap 조회만 수행)
+    - 변경 파일 위험도 + 동시 수정 조합 + 변경 내용이 비슷한 과거 실패 커밋 + 빌드 성공 확률 예측
+    - files: [(파일명, 추가 줄 수, 삭제 줄 수)]
+    """
+    index = history_miner.get(owner, repo)
+    if index is None:
+        return None
+    assessment = index.assess(filename for filename, _, _ in files)
+    similarity = history_miner.similarity(owner, repo)
+    if similarity is not None:
+        assessment["similar_failures"] = similarity.query(combined_diff, exclude=sha)
+    model = history_miner.model(owner, repo)
+    if model is not None:
+        assessment["prediction"] = model.predict(featurize(assessment, files, commit_message))
+    return assessment
+
+def _fast_path_result(history_risk):
+    """예측 모델이 충분히 안전하다고 판단하면 LLM 대신 반환할 결과 (PREDICT_SKIP_LLM_ABOVE 설정 시)"""
+    prediction = (history_risk or {}).get("prediction")
+    if not settings.predict_skip_llm_above or not prediction:
+        return None
+    if prediction["success_probability"] < settings.predict_skip_llm_above:
+        return None
+    return f"""## 🚨 치명적 이슈 분석
+
+### ⚡ 위험도 평가
+- **전체 위험도**: 🟢 낮음
+- **빌드 성공률**: {prediction['success_probability'] * 100:.0f}%
+- **배포 안전성**: 🟢 안전
+
+이력 기반 예측 모델이 안전한 변경({prediction['grade']})으로 판단해 상세 LLM 분석을 생략했습니다."""
+
+
 # 새로운 엔드포인트
 @app.post("/analyze-commit", response_model=AIAnalysisResponse)
 async def analyze_specific_commit(request: CommitAnalysisRequest):
     """
     특정 커밋 SHA로 코드 분석
     """
+    token_usage = {}
+    compaction = {}
     try:
-        # 더미 커밋 데이터에서 검색
-        commit_data = None
-        for dummy_sha, data in DUMMY_COMMITS.items():
-            if request.commit_sha.lower().startswith(dummy_sha.lower()):
-                commit_data = data
-                break
-        
-        if not commit_data:
-            return AIAnalysisResponse(
-                success=False,
-                result="",
-                error=f"커밋 SHA '{request.commit_sha}'를 찾을 수 없습니다. 사용 가능한 SHA: abc123, def456, ghi789"
-            )
-        
-        # 파일들을 하나의 diff로 합치기
-        all_patches = []
-        for file in commit_data["files"]:
-            if file.get("patch"):
-                all_patches.append(f"=== {file.get('filename')} ===\n{file.get('patch')}")
-        
-        combined_diff = "\n\n".join(all_patches)
-        filename_summary = f"{len(commit_data['files'])}개 파일"
+        code_diff, commit_message, filename_summary = _prepare_dummy_commit(request.commit_sha, compaction)
         
         # LLM 분석 호출
-        analysis_result = llm_service.analyze_code_for_critical_issues(
-            code_diff=combined_diff,
-            commit_message=commit_data["commit"]["message"],
+        analysis_result = await llm_service.analyze_code_for_critical_issues(
+            code_diff=code_diff,
+            commit_message=commit_message,
             filename=filename_summary,
-            analysis_types=request.analysis_types
+            analysis_types=request.analysis_types,
+            usage=token_usage
         )
         
         return AIAnalysisResponse(
             success=True,
-            result=analysis_result
+            result=analysis_result,
+            token_usage=token_usage,
+            compaction=compaction
         )
         
+    except AnalysisInputError as e:
+        return AIAnalysisResponse(
+            success=False,
+            result="",
+            error=str(e)
+        )
     except Exception as e:
         return AIAnalysisResponse(
             success=False,
             result="",
-            error=f"분석 중 오류가 발생했습니다: {str(e)}"
+            error=f"분석 중 오류가 발생했습니다: {str(e)}",
+            token_usage=token_usage,
+            compaction=compaction
         )
     
 
@@ -198,87 +390,296 @@ async def analyze_real_commit(request: RealCommitAnalysisRequest):
     """
     실제 GitHub API로 특정 커밋 분석
     """
+    token_usage = {}
+    compaction = {}
     try:
-        # GitHub API로 커밋 상세 정보 조회
-        url = f"https://api.github.com/repos/{request.repo_owner}/{request.repo_name}/commits/{request.commit_sha}"
-        headers = {}
-        if request.github_token:
-            headers["Authorization"] = f"token {request.github_token}"
-        
-        import requests as req  # 이름 충돌 방지
-        response = req.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 404:
-            return AIAnalysisResponse(
-                success=False,
-                result="",
-                error=f"커밋을 찾을 수 없습니다. Repository: {request.repo_owner}/{request.repo_name}, SHA: {request.commit_sha}"
-            )
-        elif response.status_code != 200:
-            return AIAnalysisResponse(
-                success=False,
-                result="",
-                error=f"GitHub API 오류: HTTP {response.status_code}"
-            )
-        
-        commit_data = response.json()
-        
-        # 파일들을 하나의 diff로 합치기
-        files = commit_data.get("files", [])
-        if not files:
-            return AIAnalysisResponse(
-                success=False,
-                result="",
-                error="분석할 파일 변경사항이 없습니다."
-            )
-        
-        all_patches = []
-        for file in files:
-            if file.get("patch"):
-                all_patches.append(f"=== {file.get('filename')} ===\n{file.get('patch')}")
+        commit_detail = await _fetch_real_commit(request)
+        combined_diff, commit_message, filename_summary = _prepare_commit_detail(commit_detail)
+        history_risk = _history_risk(
+            request.repo_owner, request.repo_name, commit_detail.sha,
+            [(file.filename, file.additions, file.deletions) for file in commit_detail.files],
+            combined_diff, commit_message
+        )
         
-        if not all_patches:
-            return AIAnalysisResponse(
-                success=False,
-                result="",
-                error="분석할 코드 변경사항이 없습니다."
+        # LLM 분석 호출 (예측 모델이 안전하다고 판단하면 생략)
+        analysis_result = _fast_path_result(history_risk)
+        if analysis_result is None:
+            analysis_result = await llm_service.analyze_code_for_critical_issues(
+                code_diff=_compact_files([file.dict() for file in commit_detail.files], compaction),
+                commit_message=commit_message,
+                filename=filename_summary,
+                analysis_types=request.analysis_types,
+                history_context=format_history_for_prompt(history_risk),
+                usage=token_usage
             )
         
-        combined_diff = "\n\n".join(all_patches)
-        filename_summary = f"{len(files)}개 파일"
-        
-        # LLM 분석 호출
-        analysis_result = llm_service.analyze_code_for_critical_issues(
-            code_diff=combined_diff,
-            commit_message=commit_data["commit"]["message"],
-            filename=filename_summary,
-            analysis_types=request.analysis_types
-        )
-        
         return AIAnalysisResponse(
             success=True,
-            result=analysis_result
+            result=analysis_result,
+            history_risk=history_risk,
+            token_usage=token_usage,
+            compaction=compaction
         )
         
-    except req.exceptions.Timeout:
+    except AnalysisInputError as e:
         return AIAnalysisResponse(
             success=False,
             result="",
-            error="GitHub API 요청 시간이 초과되었습니다."
+            error=str(e)
         )
-    except req.exceptions.ConnectionError:
+    except Exception as e:
         return AIAnalysisResponse(
             success=False,
             result="",
-            error="GitHub API에 연결할 수 없습니다."
+            error=f"분석 중 오류가 발생했습니다: {str(e)}",
+            token_usage=token_usage,
+            compaction=compaction
+        )
+
+# AnalysisOptions 항목 → LLM 분석 유형
+ANALYSIS_OPTION_TYPES = {
+    "check_syntax": "코드 품질",
+    "check_security": "보안 취약점",
+    "check_performance": "성능 최적화",
+    "check_logic": "버그 탐지"
+}
+
+@app.post("/analyze-batch")
+async def analyze_batch(request: AnalysisRequest):
+    """
+    여러 커밋 일괄 분석 - 커밋 조회와 LLM 분석을 겹쳐서 동시에 진행
+    """
+    if not request.commit_shas:
+        raise HTTPException(status_code=400, detail="분석할 커밋 SHA를 입력해주세요.")
+    if len(request.commit_shas) > settings.batch_max_commits:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.batch_max_commits}개 커밋까지 분석할 수 있습니다."
         )
+    
+    config = GitHubConfig(owner=request.owner, repo=request.repo, token=request.token)
+    analysis_types = [
+        analysis_type
+        for option, analysis_type in ANALYSIS_OPTION_TYPES.items()
+        if getattr(request.analysis_options, option)
+    ]
+    # 배치 전체 합계
+    token_usage = {}
+    compaction = {}
+    
+    async def analyzer(sha, commit_message, files):
+        combined_diff = _combine_patches(files)
+        if not combined_diff:
+            raise AnalysisInputError("분석할 코드 변경사항이 없습니다.")
+        history_risk = _history_risk(
+            request.owner, request.repo, sha,
+            [(file["filename"], file["additions"], file["deletions"]) for file in files],
+            combined_diff, commit_message
+        )
+        return await llm_service.analyze_code_for_critical_issues(
+            code_diff=_compact_files(files, compaction),
+            commit_message=commit_message,
+            filename=f"{len(files)}개 파일",
+            analysis_types=analysis_types,
+            history_context=format_history_for_prompt(history_risk),
+            usage=token_usage
+        )
+    
+    result = await _commit_source(request.owner, request.repo).analyze_commits(
+        config,
+        request.commit_shas,
+        request.file_types,
+        request.analysis_options,
+        analyzer=analyzer
+    )
+    result["token_usage"] = token_usage
+    result["compaction"] = compaction
+    return result
+
+
+# ===== 커밋 이력 인덱스 =====
+@app.post("/history/ingest")
+async def ingest_history(request: HistoryIngestRequest):
+    """
+    저장소 커밋 이력 수집 시작 (백그라운드 실행, 이미 수집한 커밋 이후의 새 커밋만 처리)
+    """
+    config = GitHubConfig(owner=request.owner, repo=request.repo, token=request.token, branch=request.branch)
+    started = history_miner.start(_commit_source(request.owner, request.repo), config)
+    return {"started": started, **history_miner.status(request.owner, request.repo)}
+
+@app.post("/predict")
+async def predict(request: PredictRequest):
+    """
+    LLM 없이 이력 기반 모델로 빌드 성공 확률과 위험도 등급 예측
+    """
+    model = history_miner.model(request.repo_owner, request.repo_name)
+    index = history_miner.get(request.repo_owner, request.repo_name)
+    if model is None or index is None:
+        raise HTTPException(
+            status_code=404,
+            detail="예측 모델이 없습니다. /history/ingest로 이력을 먼저 수집해주세요."
+        )
+    
+    commit_message = request.commit_message
+    files = [(file.filename, file.additions, file.deletions) for file in request.files]
+    if request.commit_sha:
+        try:
+            commit_detail = await _fetch_real_commit(request)
+        except AnalysisInputError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        commit_message = commit_detail.commit.message
+        files = [(file.filename, file.additions, file.deletions) for file in commit_detail.files]
+    if not files:
+        raise HTTPException(status_code=400, detail="예측할 파일 변경사항이 없습니다.")
+    
+    started = time.perf_counter()
+    assessment = index.assess(filename for filename, _, _ in files)
+    prediction = model.predict(featurize(assessment, files, commit_message))
+    return {
+        **prediction,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        "model": model.metrics
+    }
+
+@app.get("/history/{owner}/{repo}")
+async def history_status(owner: str, repo: str):
+    """이력 수집 진행 상황 및 인덱스 크기"""
+    return history_miner.status(owner, repo)
+
+@app.get("/history/{owner}/{repo}/risk")
+async def history_path_risk(owner: str, repo: str, path: str):
+    """파일/디렉터리 경로 위험도 조회"""
+    index = history_miner.get(owner, repo)
+    if index is None:
+        raise HTTPException(status_code=404, detail="수집된 이력이 없습니다. /history/ingest를 먼저 호출해주세요.")
+    return index.path_risk(path)
+
+
+# ===== 스트리밍(SSE) 엔드포인트 =====
+def _sse_event(event: str, payload: dict) -> str:
+    """Server-Sent Events 형식으로 한 이벤트 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+async def _sse_stream(prepare, analyze, summary: Dict[str, Any] = None) -> AsyncIterator[str]:
+    """
+    분석 결과를 SSE로 전달
+    - event: delta  → {"text": 토큰 조각}
+    - event: error  → {"error": 오류 메시지}
+    - event: done   → summary (토큰 사용량, diff 압축 통계 등 분석이 끝난 뒤의 값)
+    """
+    # 첫 바이트를 즉시 보내 프록시/클라이언트가 연결을 스트림으로 인식하도록 함
+    yield ": stream-start\n\n"
+    try:
+        combined_diff, commit_message, filename_summary = await prepare()
+        async for delta in analyze(combined_diff, commit_message, filename_summary):
+            yield _sse_event("delta", {"text": delta})
+        yield _sse_event("done", summary or {})
+    except AnalysisInputError as e:
+        yield _sse_event("error", {"error": str(e)})
     except Exception as e:
-        return AIAnalysisResponse(
-            success=False,
-            result="",
-            error=f"분석 중 오류가 발생했습니다: {str(e)}"
+        yield _sse_event("error", {"error": f"분석 중 오류가 발생했습니다: {str(e)}"})
+
+def _sse_response(stream: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 리버스 프록시 버퍼링 방지
+        }
+    )
+
+@app.post("/analyze/stream")
+async def analyze_code_stream(request: AIAnalysisRequest):
+    """
+    /analyze의 스트리밍 버전 - 토큰을 생성되는 즉시 SSE로 전달
+    """
+    token_usage = {}
+    compaction = {}
+
+    async def prepare():
+        code_diff, stats = compact_diff(request.code_diff)
+        compaction.update(stats)
+        return code_diff, request.commit_message, request.filename
+
+    def analyze(code_diff, commit_message, filename):
+        return llm_service.analyze_code_stream(
+            code_diff=code_diff,
+            commit_message=commit_message,
+            filename=filename,
+            analysis_types=request.analysis_types,
+            usage=token_usage
         )
 
+    return _sse_response(_sse_stream(
+        prepare, analyze, {"token_usage": token_usage, "compaction": compaction}
+    ))
+
+@app.post("/analyze-commit/stream")
+async def analyze_specific_commit_stream(request: CommitAnalysisRequest):
+    """
+    /analyze-commit의 스트리밍 버전
+    """
+    token_usage = {}
+    compaction = {}
+
+    async def prepare():
+        return _prepare_dummy_commit(request.commit_sha, compaction)
+
+    def analyze(code_diff, commit_message, filename):
+        return llm_service.analyze_code_for_critical_issues_stream(
+            code_diff=code_diff,
+            commit_message=commit_message,
+            filename=filename,
+            analysis_types=request.analysis_types,
+            usage=token_usage
+        )
+
+    return _sse_response(_sse_stream(
+        prepare, analyze, {"token_usage": token_usage, "compaction": compaction}
+    ))
+
+@app.post("/analyze-real-commit/stream")
+async def analyze_real_commit_stream(request: RealCommitAnalysisRequest):
+    """
+    /analyze-real-commit의 스트리밍 버전
+    """
+    history_risk = None
+    token_usage = {}
+    compaction = {}
+
+    async def prepare():
+        nonlocal history_risk
+        commit_detail = await _fetch_real_commit(request)
+        combined_diff, commit_message, filename_summary = _prepare_commit_detail(commit_detail)
+        history_risk = _history_risk(
+            request.repo_owner, request.repo_name, commit_detail.sha,
+            [(file.filename, file.additions, file.deletions) for file in commit_detail.files],
+            combined_diff, commit_message
+        )
+        code_diff = _compact_files([file.dict() for file in commit_detail.files], compaction)
+        return code_diff, commit_message, filename_summary
+
+    async def fast_path(result):
+        yield result
+
+    def analyze(code_diff, commit_message, filename):
+        fast_result = _fast_path_result(history_risk)
+        if fast_result is not None:
+            return fast_path(fast_result)
+        return llm_service.analyze_code_for_critical_issues_stream(
+            code_diff=code_diff,
+            commit_message=commit_message,
+            filename=filename,
+            analysis_types=request.analysis_types,
+            history_context=format_history_for_prompt(history_risk),
+            usage=token_usage
+        )
+
+    return _sse_response(_sse_stream(
+        prepare, analyze, {"token_usage": token_usage, "compaction": compaction}
+    ))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,157 @@
+# backend/services/analysis_cache.py
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any
+
+
+def make_cache_key(
+    kind: str,
+    code_diff: str,
+    commit_message: str,
+    filename: str,
+    analysis_types: List[str],
+    deployment: str,
+    prompt_version: str,
+    context: str = "",
+    knowledge_version: str = ""
+) -> str:
+    """
+    분석 입력 전체에 대한 내용 기반(content-addressed) 키 생성
+    knowledge_version: 프롬프트에 들어가는 RAG 문서 버전 (RAG 분석만, 문서가 바뀌면 다른 키)
+    """
+    fields = {
+        "kind": kind,
+        "diff": code_diff,
+        "message": commit_message,
+        "filename": filename,
+        # 선택 순서와 무관하게 같은 키가 되도록 정렬
+        "analysis_types": sorted(analysis_types),
+        "deployment": deployment,
+        "prompt_version": prompt_version
+    }
+    # 추가 문맥(이력 요약 등)이 없으면 기존 키와 동일하게 유지
+    if context:
+        fields["context"] = context
+    if knowledge_version:
+        fields["knowledge_version"] = knowledge_version
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    분석 결과 캐시
+    - 1단계: 메모리 LRU (OrderedDict)
+    - 2단계(선택): SQLite 파일 - App Service 재시작 후에도 유지
+    """
+
+    def __init__(self, max_entries: int = 256, db_path: str = "", max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        print(f"분석 결과 캐시 초기화 - 메모리 {max_entries}개, 디스크: {db_path or '사용 안 함'}")
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (메모리 → 디스크 순)"""
+        value = self._memory_get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self._db is not None:
+            value = await asyncio.to_thread(self._disk_get, key)
+            if value is not None:
+                self.disk_hits += 1
+                self._memory_put(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """캐시 저장 (메모리 + 디스크)"""
+        self._memory_put(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_put, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정용 적중/실패 카운터"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "memory_capacity": self.max_entries,
+            "disk_enabled": self._db is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key: str, value: str):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT result FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+            return row[0]
+
+    def _disk_put(self, key: str, value: str):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, result, accessed_at) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            # 디스크 상한 초과 시 가장 오래 사용되지 않은 항목부터 정리
+            self._db.execute(
+                "DELETE FROM analysis_cache WHERE key IN ("
+                "SELECT key FROM analysis_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
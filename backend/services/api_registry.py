@@ -0,0 +1,147 @@
+# backend/services/api_registry.py
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from services.pattern_matcher import PatternMatcher
+from services.knowledge_chunks import split_sections
+from services.local_knowledge_index import load_documents, docs_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 감지 패턴을 읽어 올 RAG 문서 섹션 제목
+PATTERN_SECTION = "API 식별 패턴"
+# "- URL: `a`, `b`" 형식의 항목 (라벨 뒤 백틱으로 감싼 값들)
+BULLET_PATTERN = re.compile(r"^\s*[-*]\s*([^:]+):(.*)$")
+CODE_SPAN_PATTERN = re.compile(r"`([^`]+)`")
+# 이 라벨의 값은 URL 패턴, 나머지(Package/Class/Method/Keyword 등)는 코드 식별자 패턴
+URL_LABELS = {"url", "host", "domain"}
+
+
+def parse_identification_patterns(content: str) -> Dict[str, List[str]]:
+    """
+    RAG 문서의 "## API 식별 패턴" 섹션 → {"url": [...], "code": [...]}
+    Method 값의 "()"는 떼어 호출 형태와 상관없이 찾도록 함
+    """
+    patterns: Dict[str, List[str]] = {"url": [], "code": []}
+    for section in split_sections("", content):
+        if section["section"] != PATTERN_SECTION:
+            continue
+        for line in section["content"].splitlines():
+            match = BULLET_PATTERN.match(line)
+            if match is None:
+                continue
+            kind = "url" if match.group(1).strip().lower() in URL_LABELS else "code"
+            for value in CODE_SPAN_PATTERN.findall(match.group(2)):
+                value = value.strip()
+                if value.endswith("()"):
+                    value = value[:-2]
+                if value and value not in patterns[kind]:
+                    patterns[kind].append(value)
+    return patterns
+
+
+class _Registry:
+    """한 시점의 문서로 만든 감지기 (교체만 하고 수정하지 않음)"""
+
+    def __init__(self, api_patterns: Dict[str, List[str]], url_patterns: Dict[str, str]):
+        self.api_patterns = api_patterns
+        self.url_patterns = url_patterns
+        # 식별자/URL 패턴 전체를 하나로 컴파일한 매처 (값: (패턴 종류, API 종류))
+        self.matcher = PatternMatcher(
+            [(pattern, ("code", api_type)) for api_type, patterns in api_patterns.items() for pattern in patterns]
+            + [(url, ("url", api_type)) for url, api_type in url_patterns.items()]
+        )
+
+
+class ApiDetectorRegistry:
+    """
+    RAG 문서에서 자동 생성하는 외부 API 감지기
+    - API 종류 = 문서 파일명(확장자 제외), 패턴 = 문서의 "## API 식별 패턴" 섹션
+    - 새 내부 API는 RAG 디렉터리에 마크다운 문서를 추가하는 것만으로 감지 대상이 됨
+    - due()가 True일 때(reload_interval마다) changed()로 문서 지문(파일명/수정 시각/크기)을 확인해 바뀌면 load()
+      (uvicorn 재시작 불필요, 로드 중인 요청은 이전 감지기를 그대로 사용)
+    """
+
+    def __init__(self, docs_dir: str, reload_interval: float = 5.0):
+        self.docs_dir = docs_dir
+        self.reload_interval = reload_interval
+        self.fingerprint: Optional[str] = None
+        # 로드한 문서 내용의 해시 (분석 결과 캐시 키에 포함 - 수정 시각만 바뀐 재배포에는 그대로)
+        self.version = ""
+        self.reloads = 0
+        self._checked_at = time.monotonic()
+        self._registry = _Registry({}, {})
+        self.load()
+
+    def load(self):
+        """문서를 읽어 감지기를 새로 만들고 한 번에 교체 (실패하면 기존 감지기 유지)"""
+        fingerprint = docs_fingerprint(self.docs_dir, False)
+        try:
+            api_patterns: Dict[str, List[str]] = {}
+            url_patterns: Dict[str, str] = {}
+            digest = hashlib.sha256()
+            for document in load_documents(self.docs_dir):
+                digest.update(f"{document['filename']}\0{document['content']}\0".encode("utf-8"))
+                patterns = parse_identification_patterns(document["content"])
+                if not patterns["code"] and not patterns["url"]:
+                    continue
+                api_type = os.path.splitext(document["filename"])[0]
+                api_patterns[api_type] = patterns["code"]
+                for url in patterns["url"]:
+                    url_patterns.setdefault(url, api_type)
+            registry = _Registry(api_patterns, url_patterns)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"API 감지 패턴 로드 실패, 기존 패턴을 유지합니다: {e}")
+            return
+        self._registry = registry
+        if self.fingerprint is not None:
+            self.reloads += 1
+        self.fingerprint = fingerprint
+        self.version = digest.hexdigest()
+        logger.info(
+            f"API 감지 패턴 로드 - API {len(api_patterns)}개, "
+            f"패턴 {sum(len(patterns) for patterns in api_patterns.values()) + len(url_patterns)}개"
+        )
+
+    def due(self) -> bool:
+        """마지막 확인 후 reload_interval초가 지났으면 True (확인 시각 갱신)"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        self._checked_at = now
+        return True
+
+    def changed(self) -> bool:
+        """마지막 로드 이후 문서가 바뀌었는지 (파일 시스템 조회가 있으므로 스레드에서 호출)"""
+        return docs_fingerprint(self.docs_dir, False) != self.fingerprint
+
+    @property
+    def api_patterns(self) -> Dict[str, List[str]]:
+        return self._registry.api_patterns
+
+    @property
+    def url_patterns(self) -> Dict[str, str]:
+        return self._registry.url_patterns
+
+    def detect(self, code: str) -> List[str]:
+        """코드에 나타난 API 종류 - 식별자 패턴으로 찾은 API를 문서 순서대로, 그다음 URL로만 찾은 API"""
+        registry = self._registry
+        found = registry.matcher.find(code)
+        detected = [api_type for api_type in registry.api_patterns if ("code", api_type) in found]
+        for api_type in registry.url_patterns.values():
+            if ("url", api_type) in found and api_type not in detected:
+                detected.append(api_type)
+        return detected
+
+    def stats(self) -> Dict[str, Any]:
+        registry = self._registry
+        return {
+            "apis": len(registry.api_patterns),
+            "patterns": sum(len(patterns) for patterns in registry.api_patterns.values())
+            + len(registry.url_patterns),
+            "reloads": self.reloads
+        }
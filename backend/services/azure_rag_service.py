@@ -1,9 +1,49 @@
+import asyncio
 import os
-from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient
 from azure.core.credentials import AzureKeyCredential
+from services.api_registry import ApiDetectorRegistry
+from services.diff_lines import added_code
+from services.local_knowledge_index import LocalKnowledgeIndex
+from services.knowledge_cache import KnowledgeCache
+from services.knowledge_chunks import split_sections, relative_scores, pack_chunks, format_chunk
+from services.single_flight import SingleFlight
+from config import settings
+
+# API 종류(RAG 문서 파일명)별 검색어 (유사어 포함, 없는 API는 파일명으로 검색)
+QUERY_TERMS = {
+    'hr-api': ['hr', 'human resources', 'employee api', '인사 시스템'],
+    'payment-gateway': ['payment', 'billing', '결제 시스템', '결제 api'],
+    'support-desk': ['support', 'ticket', '고객지원', '헬프데스크'],
+    'inventory-system': ['inventory', 'warehouse', 'stock', '재고 시스템'],
+    'approval-system': ['approval', 'workflow', '결재', '승인 프로세스']
+}
+
+def query_terms(api_type):
+    return QUERY_TERMS.get(api_type, [api_type.replace('-', ' ')])
 
 class AzureRAGService:
     def __init__(self):
+        # API 감지 시 검사한 줄(추가된 코드)과 건너뛴 줄(삭제/문맥/헤더) 누적 수
+        self.scanned_lines = 0
+        self.skipped_lines = 0
+        # 감지된 패턴 조합별 포맷팅된 지식 캐시 + 같은 조합의 동시 검색 병합
+        self.knowledge_cache = KnowledgeCache(settings.rag_cache_size, settings.rag_cache_ttl)
+        self.inflight = SingleFlight()
+        # 시간 초과/실패로 지식 없이 진행한 검색 수
+        self.search_timeouts = 0
+        self.search_failures = 0
+        # RAG 문서의 "API 식별 패턴" 섹션으로 만든 감지기 (문서가 바뀌면 자동으로 다시 로드)
+        self.api_registry = ApiDetectorRegistry(settings.rag_docs_dir, settings.rag_reload_interval)
+        self.reload_task = None
+        
+        # RAG_BACKEND=local이면 Azure Search 없이 RAG 문서 로컬 인덱스로 검색
+        self.local_index = None
+        self.search_client = None
+        if settings.rag_backend == "local":
+            self.local_index = self._build_local_index()
+            return
+        
         self.endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
         self.api_key = os.getenv("AZURE_SEARCH_API_KEY")
         self.index_name = os.getenv("AZURE_SEARCH_INDEX_NAME")
@@ -16,130 +56,188 @@ class AzureRAGService:
         )
         print(f"Azure RAG Service 초기화 완료 - Index: {self.index_name}")
     
+    async def close(self):
+        if self.search_client is not None:
+            await self.search_client.close()
+    
+    def _build_local_index(self):
+        local_index = LocalKnowledgeIndex.from_directory(
+            settings.rag_docs_dir, settings.rag_index_dir, settings.rag_embeddings
+        )
+        print(f"로컬 RAG 인덱스 사용 - 섹션 {len(local_index.documents)}개")
+        return local_index
+    
+    def reload_index(self):
+        """
+        인덱스 재빌드 후 호출 - API 감지 패턴 다시 로드, 지식 캐시 비우기
+        (로컬 백엔드는 RAG 문서로 인덱스를 다시 빌드, Azure는 인덱서가 갱신한 결과를 다음 검색부터 사용)
+        """
+        self.api_registry.load()
+        self._reload_knowledge()
+    
+    def _reload_knowledge(self):
+        if self.local_index is not None:
+            self.local_index = self._build_local_index()
+        self.knowledge_cache.invalidate()
+    
+    @property
+    def knowledge_version(self):
+        """현재 RAG 문서 버전 - 문서가 바뀌면 이전 지침으로 만든 분석 결과를 캐시에서 쓰지 않도록"""
+        return self.api_registry.version
+    
+    def _reload_if_changed(self):
+        """RAG 문서가 바뀌었으면 감지 패턴과 지식 인덱스 다시 로드 (스레드에서 실행)"""
+        try:
+            if self.api_registry.changed():
+                print("RAG 문서 변경 감지 - API 감지 패턴과 지식 인덱스 다시 로드")
+                self.reload_index()
+        except Exception as e:
+            print(f"RAG 문서 다시 로드 실패: {e}")
+    
     def detect_external_apis(self, code_diff):
-        """코드에서 외부 API 사용 패턴 감지"""
-        detected_patterns = []
-        
-        hr_patterns = [
-            'hr-api', 'HRServiceClient', 'EmployeeManager', 'PayrollAPI', 
-            'getEmployee', 'updateSalary', 'getOrganization', 'hr-client', 'employee-api'
-        ]
-        if any(pattern in code_diff for pattern in hr_patterns):
-            detected_patterns.append('hr-api')
-        
-        payment_patterns = [
-            'payment', 'PaymentProcessor', 'BillingManager', 'RefundService', 
-            'processPayment', 'refundTransaction', 'validateCard', 'payment-gateway', 'billing-client'
-        ]
-        if any(pattern in code_diff for pattern in payment_patterns):
-            detected_patterns.append('payment')
-        
-        support_patterns = [
-            'support-api', 'TicketManager', 'SupportAPI', 'CustomerService', 
-            'createTicket', 'updateStatus', 'searchTickets', 'support-client', 'ticket-api'
-        ]
-        if any(pattern in code_diff for pattern in support_patterns):
-            detected_patterns.append('support')
-        
-        inventory_patterns = [
-            'inventory', 'InventoryManager', 'StockService', 'WarehouseAPI',
-            'updateStock', 'checkAvailability', 'reserveItems', 'inventory-client', 'warehouse-api'
-        ]
-        if any(pattern in code_diff for pattern in inventory_patterns):
-            detected_patterns.append('inventory')
-        
-        approval_patterns = [
-            'approval', 'ApprovalManager', 'WorkflowEngine', 'ProcessAPI',
-            'submitRequest', 'approveRequest', 'getApprovalStatus', 'approval-client', 'workflow-engine'
-        ]
-        if any(pattern in code_diff for pattern in approval_patterns):
-            detected_patterns.append('approval')
-        
-        url_patterns = {
-            'hr-api.company.com': 'hr-api',
-            'internal-hr.example.com': 'hr-api',
-            'payment.company.com': 'payment',
-            'billing-api.internal': 'payment',
-            'support-api.company.com': 'support',
-            'helpdesk.internal': 'support',
-            'inventory-api.company.com': 'inventory',
-            'stock.internal': 'inventory',
-            'approval-api.company.com': 'approval',
-            'workflow.internal': 'approval'
+        """
+        코드에서 외부 API 사용 패턴 감지 (모든 패턴을 한 번 훑기로 검사)
+        삭제된 줄, 문맥 줄, 파일 헤더는 제외하고 추가된 코드 줄만 검사
+        RAG 문서 변경 확인/다시 로드는 백그라운드 스레드에서 진행하고, 교체 전까지는 현재 감지기로 감지
+        """
+        if self.api_registry.due() and (self.reload_task is None or self.reload_task.done()):
+            self.reload_task = asyncio.ensure_future(asyncio.to_thread(self._reload_if_changed))
+        added, scanned, skipped = added_code(code_diff)
+        self.scanned_lines += scanned
+        self.skipped_lines += skipped
+        print(f"API 패턴 검사: 추가된 줄 {scanned}개 검사, {skipped}개 건너뜀")
+        return self.api_registry.detect(added)
+
+    def stats(self):
+        stats = {
+            "scanned_lines": self.scanned_lines,
+            "skipped_lines": self.skipped_lines,
+            "backend": "local" if self.local_index is not None else "azure",
+            "registry": self.api_registry.stats(),
+            "search_timeouts": self.search_timeouts,
+            "search_failures": self.search_failures
         }
-        
-        for url, api_type in url_patterns.items():
-            if url in code_diff and api_type not in detected_patterns:
-                detected_patterns.append(api_type)
-        
-        return detected_patterns
+        if self.local_index is not None:
+            stats["local_index"] = self.local_index.stats()
+        stats["knowledge_cache"] = self.knowledge_cache.stats()
+        return stats
 
-    def search_api_knowledge(self, detected_patterns):
-        """감지된 API 패턴으로 관련 지식 검색"""
+    async def get_api_knowledge(self, detected_patterns):
+        """
+        감지된 API 패턴 조합에 대한 프롬프트용 지식 (검색 + 포맷팅)
+        정렬된 패턴 튜플 기준으로 캐시, 같은 조합을 동시에 찾는 요청은 검색 한 번으로 병합
+        """
         if not detected_patterns:
-            return []
+            return ""
         
-        try:
-            # 유사어 포함된 쿼리 구성
-            query_terms = {
-                'hr-api': ['hr', 'human resources', 'employee api', '인사 시스템'],
-                'payment': ['payment', 'billing', '결제 시스템', '결제 api'],
-                'support': ['support', 'ticket', '고객지원', '헬프데스크'],
-                'inventory': ['inventory', 'warehouse', 'stock', '재고 시스템'],
-                'approval': ['approval', 'workflow', '결재', '승인 프로세스']
-            }
-
-            expanded_terms = []
-            for pattern in detected_patterns:
-                expanded_terms += query_terms.get(pattern, [pattern])
-
-            search_query = " OR ".join(set(expanded_terms))
-
-            print(search_query, "로 RAG 검색 시작")
-
-            results = self.search_client.search(
-                search_text=search_query,
-                top=1,
-                include_total_count=True
-            )
-
-            print(results.get_count(), "개 결과 발견")
-
-            knowledge_docs = []
-
-            for result in results:
-                captions = result.get('@search.captions') or [{}]
-                caption_text = captions[0].get('text', '') if captions else ''
-                filename = result.get('metadata_storage_name', '') or result.get('metadata_storage_path', '')
-                
-                print(f"검색 결과: {filename} - {result.get('@search.score', 0)}")
-                
-                knowledge_docs.append({
-                    'filename': filename,
-                    'content': result.get('content', ''),
-                    'caption': caption_text,
-                    'score': result.get('@search.score', 0)
-                })
-
-            print(f"RAG 검색 완료: {len(knowledge_docs)}개 문서 발견")
-            return knowledge_docs
+        key = tuple(sorted(set(detected_patterns)))
+        cached = self.knowledge_cache.get(key)
+        if cached is not None:
+            print(f"RAG 지식 캐시 적중: {key}")
+            return cached
+        
+        return await self.inflight.do("|".join(key), lambda: self._fetch_knowledge(key))
 
+    async def _fetch_knowledge(self, key):
+        """
+        검색 + 포맷팅 후 캐시에 저장
+        검색이 RAG_SEARCH_TIMEOUT초를 넘기거나 실패하면 빈 지식으로 분석을 진행하고 캐시하지 않음
+        """
+        generation = self.knowledge_cache.generation
+        try:
+            knowledge_sections = await asyncio.wait_for(self._search(key), settings.rag_search_timeout)
+        except asyncio.TimeoutError:
+            self.search_timeouts += 1
+            print(f"RAG 검색 시간 초과 ({settings.rag_search_timeout}초) - 지식 없이 분석")
+            return ""
         except Exception as e:
+            self.search_failures += 1
             print(f"RAG 검색 실패: {e}")
-            return []
+            return ""
+        api_knowledge = self.format_knowledge_for_prompt(knowledge_sections)
+        self.knowledge_cache.put(key, api_knowledge, generation)
+        return api_knowledge
+
+    async def _search(self, detected_patterns):
+        # 로컬 인덱스는 이미 섹션 단위, Azure는 검색된 문서를 섹션으로 나눠 임시 인덱스 구성
+        if self.local_index is not None:
+            index = self.local_index
+        else:
+            sections = await self._search_azure_sections(detected_patterns)
+            if not sections:
+                return []
+            index = LocalKnowledgeIndex.build(sections)
+        
+        knowledge_sections = self._rank_sections(index, detected_patterns)
+        print(f"RAG 섹션 선택 후보: {len(knowledge_sections)}개")
+        return knowledge_sections
+
+    def _rank_sections(self, index, detected_patterns):
+        """
+        API 패턴마다 따로 섹션 점수를 매기고 패턴별로 정규화
+        (여러 API가 감지돼도 API마다 관련 문서의 섹션이 같은 점수대에서 토큰 예산을 나눠 가짐)
+        """
+        ranked = {}
+        for pattern in detected_patterns:
+            results = index.search(query_terms(pattern), top=settings.rag_top_sections)
+            for section in relative_scores(results):
+                key = (section['filename'], section['order'])
+                if key not in ranked or ranked[key]['score'] < section['score']:
+                    ranked[key] = section
+        return sorted(ranked.values(), key=lambda section: section['score'], reverse=True)
+
+    async def _search_azure_sections(self, detected_patterns):
+        """Azure AI Search에서 관련 문서를 찾아 제목 단위 섹션으로 분할"""
+        # 유사어 포함된 쿼리 구성
+        expanded_terms = []
+        for pattern in detected_patterns:
+            expanded_terms += query_terms(pattern)
+        
+        search_query = " OR ".join(set(expanded_terms))
+
+        print(search_query, "로 RAG 검색 시작")
+
+        results = await self.search_client.search(
+            search_text=search_query,
+            top=settings.rag_top_documents,
+            include_total_count=True
+        )
+
+        print(await results.get_count(), "개 결과 발견")
+
+        sections = []
+
+        async for result in results:
+            captions = result.get('@search.captions') or [{}]
+            caption_text = captions[0].get('text', '') if captions else ''
+            filename = result.get('metadata_storage_name', '') or result.get('metadata_storage_path', '')
+            score = result.get('@search.score', 0)
+            
+            print(f"검색 결과: {filename} - {score}")
+            
+            if score > 0.5:  # 기준 완화
+                sections += [
+                    dict(chunk, caption=caption_text)
+                    for chunk in split_sections(filename, result.get('content', ''))
+                ]
+
+        print(f"RAG 검색 완료: {len(sections)}개 섹션")
+        return sections
 
-    def format_knowledge_for_prompt(self, knowledge_docs):
-        """검색된 지식을 프롬프트용으로 포맷팅"""
-        if not knowledge_docs:
+    def format_knowledge_for_prompt(self, knowledge_sections):
+        """검색된 섹션을 점수 순으로 토큰 예산(RAG_KNOWLEDGE_TOKENS)만큼 골라 문서별로 포맷팅"""
+        sections = pack_chunks(knowledge_sections, settings.rag_knowledge_tokens)
+        if not sections:
             return ""
 
         formatted = "\n\n🔍 **관련 외부 API 가이드라인:**\n"
 
-        for doc in knowledge_docs:
-            if doc['score'] > 0.5:  # 기준 완화
-                formatted += f"\n### 📋 {doc['filename']}\n"
-                if doc.get('caption'):
-                    formatted += f"🧠 요약: {doc['caption']}\n\n"
-                content = doc['content'][:1500] + "..." if len(doc['content']) > 1500 else doc['content']
-                formatted += f"{content}\n"
+        filename = None
+        for section in sections:
+            if section['filename'] != filename:
+                filename = section['filename']
+                formatted += f"\n### 📋 {filename}\n"
+                if section.get('caption'):
+                    formatted += f"🧠 요약: {section['caption']}\n\n"
+            formatted += format_chunk(section)
         return formatted
\ No newline at end of file
@@ -0,0 +1,138 @@
+# backend/services/cochange_matrix.py
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class CoChangeMatrix:
+    """
+    파일×파일 동시 변경 행렬 (CSR 희소 행렬)
+    - counts[i, j]: 파일 i와 j가 함께 바뀐 커밋 수 (대각선은 파일 i의 변경 커밋 수)
+    - failures[i, j]: 그중 실패 커밋 수
+    - 새 커밋은 행 단위 dict 델타에 누적하고, 델타가 커지면 CSR에 합쳐 압축
+    - 조회는 CSR 행 슬라이스 + 해당 행의 델타만 읽음
+    """
+
+    def __init__(self, max_files: int = 50, compact_threshold: int = 200000):
+        # 대규모 일괄 변경(포맷팅, 벤더 갱신)은 조합 수가 파일 수의 제곱이고 의미도 적어 제외
+        self.max_files = max_files
+        self.compact_threshold = compact_threshold
+        self._counts = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self._failures = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self._pending_counts: Dict[int, Dict[int, int]] = {}
+        self._pending_failures: Dict[int, Dict[int, int]] = {}
+        self._pending_entries = 0
+        self._size = 0
+        self.skipped_commits = 0
+
+    def add_commit(self, path_ids: Iterable[int], failed: bool):
+        """커밋 하나의 변경 파일 조합 반영"""
+        ids = sorted(set(path_ids))
+        if len(ids) > self.max_files:
+            self.skipped_commits += 1
+            return
+        if ids:
+            self._size = max(self._size, ids[-1] + 1)
+        self._accumulate(self._pending_counts, ids)
+        if failed:
+            self._accumulate(self._pending_failures, ids)
+
+    def mark_failed(self, path_ids: Iterable[int]):
+        """이미 반영한 커밋이 나중에 실패로 라벨링된 경우 (revert)"""
+        ids = sorted(set(path_ids))
+        if len(ids) <= self.max_files:
+            self._accumulate(self._pending_failures, ids)
+
+    def _accumulate(self, pending: Dict[int, Dict[int, int]], ids: List[int]):
+        for i in ids:
+            row = pending.get(i)
+            if row is None:
+                row = pending[i] = {}
+            for j in ids:
+                row[j] = row.get(j, 0) + 1
+        self._pending_entries += len(ids) * len(ids)
+        if self._pending_entries >= self.compact_threshold:
+            self.compact()
+
+    def compact(self):
+        """누적된 델타를 CSR 행렬에 합침"""
+        shape = (self._size, self._size)
+        self._counts = self._merge(self._counts, self._pending_counts, shape)
+        self._failures = self._merge(self._failures, self._pending_failures, shape)
+        self._pending_counts = {}
+        self._pending_failures = {}
+        self._pending_entries = 0
+
+    def _merge(
+        self,
+        matrix: sparse.csr_matrix,
+        pending: Dict[int, Dict[int, int]],
+        shape: Tuple[int, int]
+    ) -> sparse.csr_matrix:
+        if matrix.shape != shape:
+            matrix = matrix.copy()
+            matrix.resize(shape)
+        if not pending:
+            return matrix
+        rows, cols, values = [], [], []
+        for i, row in pending.items():
+            rows.extend([i] * len(row))
+            cols.extend(row.keys())
+            values.extend(row.values())
+        delta = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.int32), (np.asarray(rows), np.asarray(cols))),
+            shape=shape
+        )
+        return (matrix + delta).tocsr()
+
+    def _row(
+        self,
+        matrix: sparse.csr_matrix,
+        pending: Dict[int, Dict[int, int]],
+        path_id: int
+    ) -> Dict[int, int]:
+        row: Dict[int, int] = {}
+        if path_id < matrix.shape[0]:
+            start, end = matrix.indptr[path_id], matrix.indptr[path_id + 1]
+            row = dict(zip(matrix.indices[start:end].tolist(), matrix.data[start:end].tolist()))
+        for j, value in pending.get(path_id, {}).items():
+            row[j] = row.get(j, 0) + value
+        return row
+
+    def count(self, i: int, j: int) -> Tuple[int, int]:
+        """(i, j) 조합의 (동시 변경 커밋 수, 실패 커밋 수)"""
+        return (
+            self._row(self._counts, self._pending_counts, i).get(j, 0),
+            self._row(self._failures, self._pending_failures, i).get(j, 0)
+        )
+
+    def top_k(self, path_id: int, k: int = 5) -> List[Tuple[int, int, int, int]]:
+        """
+        파일과 가장 자주 함께 바뀐 파일 k개
+        반환: [(상대 파일 id, 동시 변경 커밋 수, 실패 커밋 수, 기준 파일 변경 커밋 수)]
+        """
+        counts = self._row(self._counts, self._pending_counts, path_id)
+        total = counts.pop(path_id, 0)
+        if not counts:
+            return []
+        others = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        if len(values) > k:
+            top = np.argpartition(-values, k)[:k]
+        else:
+            top = np.arange(len(values))
+        top = top[np.argsort(-values[top], kind="stable")]
+        failures = self._row(self._failures, self._pending_failures, path_id)
+        return [
+            (int(others[index]), int(values[index]), failures.get(int(others[index]), 0), total)
+            for index in top
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": self._size,
+            "nonzero": int(self._counts.nnz),
+            "pending_entries": self._pending_entries,
+            "skipped_commits": self.skipped_commits
+        }
@@ -0,0 +1,246 @@
+# backend/services/commit_risk_model.py
+import json
+import math
+import os
+import re
+import zlib
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
+
+from services.history_index import HistoryIndex, FIX_PATTERN
+
+# 빌드 성공 확률 → 위험도 등급 (README의 Safe / Caution / High Risk / Critical)
+GRADE_THRESHOLDS = [
+    (0.9, "Safe"),
+    (0.75, "Caution"),
+    (0.5, "High Risk"),
+    (0.0, "Critical")
+]
+
+EXTENSION_BUCKETS = 32
+MESSAGE_BUCKETS = 256
+NUMERIC_FEATURES = 11
+FEATURE_SIZE = NUMERIC_FEATURES + EXTENSION_BUCKETS + MESSAGE_BUCKETS
+
+TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣_]+")
+
+# 학습/보정/평가에 필요한 최소 커밋 수 (보정과 평가는 각각 이만큼 필요)
+MIN_TRAINING_COMMITS = 30
+MIN_CALIBRATION_COMMITS = 50
+
+
+def grade_for(success_probability: float) -> str:
+    for threshold, grade in GRADE_THRESHOLDS:
+        if success_probability >= threshold:
+            return grade
+    return GRADE_THRESHOLDS[-1][1]
+
+
+def _bucket(value: str, buckets: int) -> int:
+    return zlib.crc32(value.encode("utf-8")) % buckets
+
+
+def featurize(
+    assessment: Dict[str, Any],
+    files: List[Tuple[str, int, int]],
+    message: str
+) -> np.ndarray:
+    """
+    커밋 하나의 특징 벡터
+    - 수치: churn, 파일 수, 경로 위험도, 신규 경로 비율, 동시 수정 조합 실패율/누락 파일 수, 수정 커밋 여부
+    - 파일 확장자: 해시 버킷별 비율
+    - 메시지 토큰: 해시 버킷 bag-of-words (수정 성격 단어는 수정 커밋 여부 특징으로 따로 반영)
+    """
+    vector = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    additions = sum(file[1] for file in files)
+    deletions = sum(file[2] for file in files)
+    risks = [item["risk"] for item in assessment["files"]] or [assessment["baseline_risk"]]
+    new_paths = sum(1 for item in assessment["files"] if item["scope"] != item["path"])
+    companions = [companion for items in assessment["co_changes"].values() for companion in items]
+    missing = sum(1 for companion in companions if not companion["in_commit"] and companion["confidence"] >= 0.5)
+
+    vector[0] = math.log1p(additions)
+    vector[1] = math.log1p(deletions)
+    vector[2] = math.log1p(len(files))
+    vector[3] = math.log1p(max((file[1] + file[2] for file in files), default=0))
+    vector[4] = max(risks)
+    vector[5] = sum(risks) / len(risks)
+    vector[6] = new_paths / len(files) if files else 0.0
+    vector[7] = assessment["baseline_risk"]
+    vector[8] = max((companion["failure_rate"] for companion in companions), default=assessment["baseline_risk"])
+    vector[9] = math.log1p(missing)
+    first_line = (message or "").split("\n", 1)[0]
+    vector[10] = 1.0 if FIX_PATTERN.search(first_line) else 0.0
+
+    for path, _, _ in files:
+        extension = os.path.splitext(path)[1].lower() or path.rsplit("/", 1)[-1]
+        vector[NUMERIC_FEATURES + _bucket(extension, EXTENSION_BUCKETS)] += 1.0 / len(files)
+
+    subject = FIX_PATTERN.sub(" ", first_line).lower()
+    for token in set(TOKEN_PATTERN.findall(subject)):
+        vector[NUMERIC_FEATURES + EXTENSION_BUCKETS + _bucket(token, MESSAGE_BUCKETS)] = 1.0
+    return vector
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -30, 30)))
+
+
+class CommitRiskModel:
+    """
+    로컬 빌드 성공 확률 예측 모델 (L2 정규화 로지스틱 회귀 + Platt 보정)
+    - 학습/추론 모두 NumPy만 사용, 추론은 특징 벡터 내적 한 번
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float,
+        mean: np.ndarray,
+        std: np.ndarray,
+        platt: Tuple[float, float] = (1.0, 0.0),
+        metrics: Optional[Dict[str, Any]] = None
+    ):
+        self.weights = weights
+        self.bias = bias
+        self.mean = mean
+        self.std = std
+        self.platt = platt
+        self.metrics = metrics or {}
+
+    def failure_probability(self, features: np.ndarray) -> float:
+        logit = float(((features - self.mean) / self.std) @ self.weights + self.bias)
+        a, b = self.platt
+        return float(_sigmoid(np.array(a * logit + b)))
+
+    def predict(self, features: np.ndarray) -> Dict[str, Any]:
+        success = 1.0 - self.failure_probability(features)
+        return {
+            "success_probability": round(success, 4),
+            "grade": grade_for(success)
+        }
+
+    def _logits(self, matrix: np.ndarray) -> np.ndarray:
+        return ((matrix - self.mean) / self.std) @ self.weights + self.bias
+
+    @classmethod
+    def fit(
+        cls,
+        matrix: np.ndarray,
+        labels: np.ndarray,
+        l2: float = 1e-3,
+        iterations: int = 300,
+        learning_rate: float = 0.1
+    ) -> "CommitRiskModel":
+        """
+        시간순 앞 80%로 학습, 뒤 20%를 다시 시간순으로 반씩 나눠 앞쪽으로 Platt 보정, 뒤쪽으로 평가
+        (보정에 쓴 커밋으로 평가하면 Brier 점수가 낙관적으로 나오므로 분리)
+        (보정/평가용 커밋이 부족하면 보정 없이 전체로 학습)
+        """
+        count = len(labels)
+        split = int(count * 0.8) if count - int(count * 0.8) >= 2 * MIN_CALIBRATION_COMMITS else count
+        train, train_labels = matrix[:split], labels[:split]
+
+        mean = train.mean(axis=0)
+        std = train.std(axis=0)
+        std[std < 1e-6] = 1.0
+        standardized = (train - mean) / std
+
+        # 전체 배치 경사하강 (Adam)
+        weights = np.zeros(matrix.shape[1], dtype=np.float64)
+        bias = float(np.log((train_labels.mean() + 1e-3) / (1 - train_labels.mean() + 1e-3)))
+        moments = np.zeros_like(weights), np.zeros_like(weights)
+        for step in range(1, iterations + 1):
+            error = _sigmoid(standardized @ weights + bias) - train_labels
+            gradient = standardized.T @ error / split + l2 * weights
+            moments = (0.9 * moments[0] + 0.1 * gradient, 0.999 * moments[1] + 0.001 * gradient ** 2)
+            corrected_first = moments[0] / (1 - 0.9 ** step)
+            corrected_second = moments[1] / (1 - 0.999 ** step)
+            weights -= learning_rate * corrected_first / (np.sqrt(corrected_second) + 1e-8)
+            bias -= learning_rate * float(error.mean())
+
+        model = cls(weights, bias, mean, std)
+        if split < count:
+            evaluation_start = split + (count - split) // 2
+            model.platt = _fit_platt(model._logits(matrix[split:evaluation_start]), labels[split:evaluation_start])
+            holdout, holdout_labels = matrix[evaluation_start:], labels[evaluation_start:]
+            probabilities = _sigmoid(model.platt[0] * model._logits(holdout) + model.platt[1])
+            model.metrics = {
+                "calibration_commits": int(evaluation_start - split),
+                "holdout_commits": int(len(holdout_labels)),
+                "brier": round(float(np.mean((probabilities - holdout_labels) ** 2)), 4),
+                "baseline_brier": round(float(np.mean((train_labels.mean() - holdout_labels) ** 2)), 4)
+            }
+        model.metrics.update({
+            "trained_commits": int(split),
+            "failure_rate": round(float(labels.mean()), 4)
+        })
+        return model
+
+    def save(self, path: str):
+        with open(path + ".tmp", "wb") as model_file:
+            np.savez(
+                model_file,
+                weights=self.weights,
+                bias=np.array(self.bias),
+                mean=self.mean,
+                std=self.std,
+                platt=np.array(self.platt),
+                metrics=np.array(json.dumps(self.metrics))
+            )
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["CommitRiskModel"]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if data["weights"].shape[0] != FEATURE_SIZE:
+                return None  # 특징 구성이 바뀐 이전 모델은 재학습 대상
+            return cls(
+                data["weights"],
+                float(data["bias"]),
+                data["mean"],
+                data["std"],
+                tuple(data["platt"].tolist()),
+                json.loads(str(data["metrics"]))
+            )
+
+
+def _fit_platt(logits: np.ndarray, labels: np.ndarray, iterations: int = 200) -> Tuple[float, float]:
+    """보정용 커밋 로짓에 대한 Platt scaling (sigmoid(a * logit + b)) 계수 추정"""
+    a, b = 1.0, 0.0
+    for _ in range(iterations):
+        error = _sigmoid(a * logits + b) - labels
+        a -= 0.05 * float(np.mean(error * logits))
+        b -= 0.05 * float(np.mean(error))
+    return a, b
+
+
+def training_set(index: HistoryIndex, max_commits: int = 50000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    이력 인덱스에서 학습 데이터 생성
+    - 커밋을 시간순으로 빈 인덱스에 다시 쌓으면서, 각 커밋의 특징은 그 이전 이력만으로 계산 (미래 정보 누출 방지)
+    """
+    records = sorted(index.commits.values(), key=lambda record: record.timestamp)[-max_commits:]
+    replay = HistoryIndex(cochange_max_files=index.cochange.max_files)
+    rows, labels = [], []
+    for record in records:
+        files = [(index.paths[path_id], additions, deletions) for path_id, additions, deletions in record.files]
+        if files:
+            assessment = replay.assess(path for path, _, _ in files)
+            rows.append(featurize(assessment, files, record.subject))
+            labels.append(1.0 if record.failed else 0.0)
+        replay.add_labeled_commit(record.sha, record.timestamp, record.subject, record.failed, files, record.fix)
+    if not rows:
+        return np.zeros((0, FEATURE_SIZE), dtype=np.float32), np.zeros(0)
+    return np.stack(rows), np.array(labels)
+
+
+def train_from_history(index: HistoryIndex) -> Optional[CommitRiskModel]:
+    """실패/성공 커밋이 모두 충분할 때만 모델 학습 (부족하면 None)"""
+    matrix, labels = training_set(index)
+    if len(labels) < MIN_TRAINING_COMMITS or labels.min() == labels.max():
+        return None
+    return CommitRiskModel.fit(matrix, labels)
@@ -0,0 +1,174 @@
+# backend/services/commit_source.py
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import aclosing
+from typing import List, Optional, Dict, Any, Awaitable, Callable, AsyncIterator, Deque
+
+from config import settings
+from services.github_rate_limiter import PRIORITY_INTERACTIVE, PRIORITY_BULK
+from models.github_models import (
+    GitHubConfig,
+    CommitResponse,
+    CommitDetailResponse,
+    FileChange,
+    AnalysisOptions
+)
+
+logger = logging.getLogger(__name__)
+
+class CommitSourceError(Exception):
+    """커밋 조회 실패 (status: HTTP 상태 코드 기준, 알 수 없으면 None)"""
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class CommitSource(ABC):
+    """
+    커밋 데이터 공급원 공통 기반 (GitHub API, 로컬 git 저장소)
+    하위 클래스는 get_commit_detail/iter_commits만 구현하면 다건 분석/이력 순회를 그대로 사용 가능
+    (구현하지 않으면 요청 처리 중이 아니라 인스턴스 생성 시 TypeError)
+    """
+    
+    @abstractmethod
+    async def get_commit_detail(
+        self,
+        config: GitHubConfig,
+        sha: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> CommitDetailResponse:
+        """특정 커밋의 상세 정보 조회"""
+    
+    @abstractmethod
+    def iter_commits(
+        self,
+        config: GitHubConfig,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        per_page: int = 100,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[CommitResponse]:
+        """커밋 목록 전체 순회 (최신 커밋부터)"""
+    
+    async def iter_commit_details(
+        self,
+        config: GitHubConfig,
+        stop_at: Optional[str] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[CommitDetailResponse]:
+        """
+        히스토리 전체를 최신 커밋부터 상세 정보와 함께 순회 (이력 수집용)
+        - stop_at 커밋에 도달하면 중단 (이전 수집 이후의 새 커밋만 처리)
+        - 상세 조회는 concurrency 개수만큼 미리 요청해 두고 순서대로 반환
+        """
+        window = concurrency or settings.github_batch_concurrency
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            async with aclosing(self.iter_commits(config, priority=PRIORITY_BULK)) as commits:
+                async for commit in commits:
+                    if commit.sha == stop_at:
+                        break
+                    pending.append(asyncio.ensure_future(
+                        self.get_commit_detail(config, commit.sha, priority=PRIORITY_BULK)
+                    ))
+                    if len(pending) >= window:
+                        yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # 소비자가 중간에 멈추면 미리 요청해 둔 상세 조회 취소
+            for future in pending:
+                future.cancel()
+    
+    async def analyze_commits(
+        self,
+        config: GitHubConfig,
+        commit_shas: List[str],
+        file_types: List[str],
+        analysis_options: AnalysisOptions,
+        analyzer: Optional[Callable[[str, str, List[Dict[str, Any]]], Awaitable[str]]] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        여러 커밋 동시 분석
+        - 커밋 상세 조회는 concurrency 개수만큼 동시에 진행
+        - analyzer(커밋 SHA, 커밋 메시지, 파일 목록)가 주어지면 조회가 끝난 커밋부터 바로 LLM 분석을 시작해
+          나머지 커밋 조회와 겹쳐 실행
+        - 커밋별 오류는 해당 커밋 결과에만 기록 (결과 순서는 요청 순서 유지)
+        """
+        fetch_semaphore = asyncio.Semaphore(concurrency or settings.github_batch_concurrency)
+        
+        async def process(sha: str) -> Optional[Dict[str, Any]]:
+            try:
+                async with fetch_semaphore:
+                    # 다건 분석은 배치 요청으로 처리해 대화형 요청에 예산 양보
+                    commit_detail = await self.get_commit_detail(config, sha, priority=PRIORITY_BULK)
+                
+                # 파일 타입 필터링
+                filtered_files = self._filter_files_by_type(
+                    commit_detail.files, file_types
+                )
+                
+                if not filtered_files:
+                    return None
+                
+                analysis_result = {
+                    "commit_sha": sha,
+                    "commit_message": commit_detail.commit.message,
+                    "author": commit_detail.commit.author.name,
+                    "date": commit_detail.commit.author.date,
+                    "files_analyzed": len(filtered_files),
+                    "files": [
+                        {
+                            "filename": file.filename,
+                            "status": file.status,
+                            "additions": file.additions,
+                            "deletions": file.deletions,
+                            "changes": file.changes,
+                            "patch": file.patch
+                        }
+                        for file in filtered_files
+                    ],
+                    "analysis_status": "ready_for_llm"  # LLM 분석 대기
+                }
+                
+                if analyzer is not None:
+                    # 조회 슬롯을 반납한 뒤 분석하므로 다른 커밋 조회와 겹쳐 진행됨
+                    analysis_result["analysis"] = await analyzer(
+                        commit_detail.sha, commit_detail.commit.message, analysis_result["files"]
+                    )
+                    analysis_result["analysis_status"] = "analyzed"
+                return analysis_result
+                
+            except Exception as e:
+                logger.error(f"커밋 {sha} 분석 중 오류: {str(e)}")
+                return {
+                    "commit_sha": sha,
+                    "error": str(e),
+                    "analysis_status": "failed"
+                }
+        
+        results = await asyncio.gather(*(process(sha) for sha in commit_shas))
+        analysis_results = [result for result in results if result is not None]
+        
+        return {
+            "total_commits": len(commit_shas),
+            "analyzed_commits": len([r for r in analysis_results if "error" not in r]),
+            "failed_commits": len([r for r in analysis_results if "error" in r]),
+            "results": analysis_results
+        }
+    
+    def _filter_files_by_type(
+        self, 
+        files: List[FileChange], 
+        file_types: List[str]
+    ) -> List[FileChange]:
+        """파일 타입으로 필터링"""
+        if not file_types:
+            return files
+        
+        return [
+            file for file in files
+            if any(file.filename.endswith(ext) for ext in file_types)
+        ]
@@ -0,0 +1,110 @@
+# backend/services/diff_chunker.py
+import re
+from typing import List, Callable, Tuple
+
+from services.token_counter import count_tokens
+
+# _combine_patches가 만드는 파일 구분 헤더 ("=== 파일명 ===")
+FILE_HEADER_PATTERN = re.compile(r"^=== (.+) ===$")
+
+
+def split_files(code_diff: str) -> List[Tuple[str, List[str]]]:
+    """combined diff → [(파일 헤더 줄, 본문 줄 목록)] (헤더가 없는 diff는 파일 하나로 취급)"""
+    files: List[Tuple[str, List[str]]] = []
+    header, lines = "", []
+    for line in code_diff.split("\n"):
+        if FILE_HEADER_PATTERN.match(line) or line.startswith("diff --git "):
+            if header or any(lines):
+                files.append((header, lines))
+            header, lines = line, []
+        else:
+            lines.append(line)
+    if header or any(lines):
+        files.append((header, lines))
+    return files
+
+
+def _split_hunks(lines: List[str]) -> List[List[str]]:
+    """파일 본문 → 헝크 목록 (첫 @@ 앞의 줄은 첫 헝크에 포함)"""
+    hunks: List[List[str]] = []
+    current: List[str] = []
+    for line in lines:
+        if line.startswith("@@") and any(not previous.startswith(("---", "+++", "index ")) for previous in current):
+            hunks.append(current)
+            current = []
+        current.append(line)
+    if current:
+        hunks.append(current)
+    return hunks
+
+
+def split_diff(
+    code_diff: str,
+    max_tokens: int,
+    count: Callable[[str], int] = count_tokens
+) -> List[str]:
+    """
+    diff를 파일 → 헝크 → 줄 경계 순으로 나눠 약 max_tokens 이하 조각으로 묶음
+    - 파일이 여러 조각으로 나뉘면 각 조각 앞에 파일 헤더를 다시 붙임
+    - 헝크가 여러 조각으로 나뉘면 각 조각 앞에 @@ 줄을 다시 붙임
+    - 조각 토큰 수는 구성 단위 토큰 수의 합(+ 줄바꿈)으로 계산해 각 줄을 한 번만 토큰화
+    """
+    if count(code_diff) <= max_tokens:
+        return [code_diff]
+
+    # 1. 가장 작은 단위(헤더 포함 블록)로 분해: [(텍스트, 토큰 수)]
+    blocks: List[Tuple[str, int]] = []
+    for header, lines in split_files(code_diff):
+        header_prefix = f"{header}\n" if header else ""
+        line_tokens = [count(line) + 1 for line in lines]
+        prefix_tokens = count(header_prefix)
+        if prefix_tokens + sum(line_tokens) <= max_tokens:
+            blocks.append((header_prefix + "\n".join(lines), prefix_tokens + sum(line_tokens)))
+            continue
+        position = 0
+        for hunk in _split_hunks(lines):
+            hunk_tokens = line_tokens[position:position + len(hunk)]
+            position += len(hunk)
+            if prefix_tokens + sum(hunk_tokens) <= max_tokens:
+                blocks.append((header_prefix + "\n".join(hunk), prefix_tokens + sum(hunk_tokens)))
+                continue
+            hunk_header = f"{hunk[0]}\n" if hunk[0].startswith("@@") else ""
+            body = hunk[1:] if hunk_header else hunk
+            body_tokens = hunk_tokens[1:] if hunk_header else hunk_tokens
+            prefix = header_prefix + hunk_header
+            base = prefix_tokens + (hunk_tokens[0] if hunk_header else 0)
+            piece: List[str] = []
+            used = base
+            for line, tokens in zip(body, body_tokens):
+                if piece and used + tokens > max_tokens:
+                    blocks.append((prefix + "\n".join(piece), used))
+                    piece, used = [], base
+                if base + tokens > max_tokens:
+                    # 한 줄이 예산보다 큰 경우(압축된 파일 등)는 문자 단위로 자름
+                    blocks.extend(_split_text(prefix, line, max_tokens - base, count))
+                    continue
+                piece.append(line)
+                used += tokens
+            if piece:
+                blocks.append((prefix + "\n".join(piece), used))
+
+    # 2. 예산 안에서 인접 블록을 순서대로 묶음
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for text, tokens in blocks:
+        if current and used + tokens + 1 > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, used = [], 0
+        current.append(text)
+        used += tokens + 1
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _split_text(prefix: str, line: str, budget: int, count: Callable[[str], int]) -> List[Tuple[str, int]]:
+    # 문자당 토큰 수는 보통 1 이하이므로 budget 글자씩 자르면 예산을 넘지 않음
+    budget = max(budget, 1)
+    pieces = [line[start:start + budget] for start in range(0, len(line), budget)]
+    return [(prefix + piece, count(prefix + piece)) for piece in pieces]
@@ -0,0 +1,275 @@
+# backend/services/diff_compactor.py
+import re
+from fnmatch import fnmatch
+from typing import List, Dict, Any, Tuple, Optional
+
+from config import settings
+from services.diff_chunker import split_files
+from services.token_counter import count_tokens
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+
+# 공백 비교 시 그대로 두는 문자열 리터럴 (닫는 따옴표가 없으면 줄 끝까지)
+STRING_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?|`(?:\\.|[^`\\])*`?)""")
+# 단어 문자 사이의 공백 (한 칸으로 보존, 나머지 토큰 사이 공백은 무시)
+WORD_GAP_PATTERN = re.compile(r"(?<=\w)\s+(?=\w)")
+
+# 내용 대신 요약 한 줄만 보낼 파일 (경로 glob, 소문자로 비교)
+SKIP_FILE_PATTERNS = {
+    "lockfile": [
+        "*package-lock.json", "*yarn.lock", "*pnpm-lock.yaml", "*poetry.lock", "*pipfile.lock",
+        "*cargo.lock", "*go.sum", "*composer.lock", "*gemfile.lock", "*.lock"
+    ],
+    "minified": ["*.min.js", "*.min.css", "*.map"],
+    "vendor": [
+        "vendor/*", "*/vendor/*", "node_modules/*", "*/node_modules/*",
+        "third_party/*", "*/third_party/*", "dist/*", "*/dist/*"
+    ],
+    "generated": [
+        "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*", "*.g.dart", "*.designer.cs",
+        "*/__snapshots__/*", "*.snap"
+    ],
+    "binary": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.ico", "*.pdf", "*.zip", "*.gz", "*.jar",
+        "*.woff", "*.woff2", "*.ttf", "*.exe", "*.dll", "*.so", "*.class", "*.pyc"
+    ]
+}
+
+SKIP_LABELS = {
+    "lockfile": "의존성 잠금 파일",
+    "minified": "압축(minified) 파일",
+    "vendor": "외부(vendor) 코드",
+    "generated": "자동 생성 파일",
+    "binary": "바이너리 파일",
+    "excluded": "분석 제외 파일",
+    "removed": "삭제된 파일",
+    "no_patch": "diff 없음(바이너리 또는 대용량 변경)"
+}
+
+# 이보다 긴 줄이 있으면 압축된 코드로 간주
+MINIFIED_LINE_LENGTH = 1000
+
+
+def _new_stats() -> Dict[str, int]:
+    return {
+        "files_summarized": 0,
+        "files_dropped": 0,
+        "whitespace_hunks": 0,
+        "context_lines_removed": 0
+    }
+
+
+def _skip_kind(filename: str, patch: str, status: str) -> Optional[str]:
+    """요약 처리할 파일 종류 (일반 코드면 None)"""
+    name = filename.lower()
+    for kind, patterns in SKIP_FILE_PATTERNS.items():
+        if any(fnmatch(name, pattern) for pattern in patterns):
+            return kind
+    if any(fnmatch(name, pattern) for pattern in settings.diff_skip_patterns):
+        return "excluded"
+    if status == "removed":
+        return "removed"
+    if not patch:
+        return "no_patch"
+    if patch.startswith("Binary files") or "\nBinary files " in patch or "\nGIT binary patch" in patch:
+        return "binary"
+    if any(len(line) > MINIFIED_LINE_LENGTH for line in patch.split("\n")):
+        return "minified"
+    return None
+
+
+def _normalize(line: str) -> str:
+    """
+    공백 비교용 정규화 - 줄 끝 공백과 토큰 사이 공백만 무시
+    앞쪽 들여쓰기(파이썬 블록 구조)와 따옴표 안 문자열은 그대로 비교
+    """
+    body = line.strip()
+    if not body:
+        return ""
+    indent = line[:len(line) - len(line.lstrip())]
+    parts = STRING_PATTERN.split(body)
+    for index in range(0, len(parts), 2):  # 홀수 번째는 문자열 리터럴
+        code = WORD_GAP_PATTERN.sub("\x00", parts[index])
+        parts[index] = "".join(code.split()).replace("\x00", " ")
+    return indent + "".join(parts)
+
+
+def _whitespace_only(removed: List[str], added: List[str]) -> bool:
+    """빈 줄을 빼고 정규화한 줄들이 같으면 공백만 바뀐 변경"""
+    return [line for line in map(_normalize, removed) if line] == [line for line in map(_normalize, added) if line]
+
+
+def _compact_hunk(header: str, lines: List[str], context_lines: int, stats: Dict[str, int]) -> List[str]:
+    """
+    헝크 하나 압축
+    - 공백만 바뀐 헝크는 헤더 한 줄로 접음
+    - 변경 줄에서 context_lines보다 먼 문맥 줄은 제거하고, 끊긴 부분은 줄 번호를 다시 계산한 헝크로 나눔
+    """
+    match = HUNK_HEADER_PATTERN.match(header)
+    removed = [line[1:] for line in lines if line.startswith("-")]
+    added = [line[1:] for line in lines if line.startswith("+")]
+    if not removed and not added:
+        return [header] + lines
+    if _whitespace_only(removed, added):
+        stats["whitespace_hunks"] += 1
+        return [f"{header} [공백만 변경됨: +{len(added)} -{len(removed)}줄 생략]"]
+    if context_lines < 0:
+        return [header] + lines
+
+    keep = [False] * len(lines)
+    for index, line in enumerate(lines):
+        if line[:1] in ("+", "-"):
+            for near in range(max(index - context_lines, 0), min(index + context_lines + 1, len(lines))):
+                keep[near] = True
+        elif line.startswith("\\") and index and keep[index - 1]:
+            keep[index] = True  # "\ No newline at end of file"은 앞 줄을 따라감
+
+    output: List[str] = []
+    group: List[str] = []
+    old_line, new_line = int(match.group(1)), int(match.group(3))
+    group_start = (old_line, new_line)
+
+    def flush():
+        old_count = sum(1 for line in group if not line.startswith(("+", "\\")))
+        new_count = sum(1 for line in group if not line.startswith(("-", "\\")))
+        # 줄 수가 0인 쪽은 git과 같이 직전 줄 번호를 씀
+        old_start = group_start[0] - (1 if old_count == 0 else 0)
+        new_start = group_start[1] - (1 if new_count == 0 else 0)
+        section = match.group(5) if not output else ""
+        output.append(f"@@ -{old_start},{old_count} +{new_start},{new_count} @@{section}")
+        output.extend(group)
+
+    for index, line in enumerate(lines):
+        if keep[index]:
+            if not group:
+                group_start = (old_line, new_line)
+            group.append(line)
+        else:
+            stats["context_lines_removed"] += 1
+            if group:
+                flush()
+                group = []
+        if line.startswith("-"):
+            old_line += 1
+        elif line.startswith("+"):
+            new_line += 1
+        elif not line.startswith("\\"):
+            old_line += 1
+            new_line += 1
+    if group:
+        flush()
+    return output
+
+
+def compact_patch(patch: str, context_lines: int, stats: Dict[str, int]) -> str:
+    """unified diff patch 하나의 헝크별 압축 (헝크 앞의 diff --git/index/---/+++ 줄은 유지)"""
+    output: List[str] = []
+    header: Optional[str] = None
+    lines: List[str] = []
+    for line in patch.split("\n"):
+        if HUNK_HEADER_PATTERN.match(line):
+            if header is not None:
+                output.extend(_compact_hunk(header, lines, context_lines, stats))
+            else:
+                output.extend(lines)
+            header, lines = line, []
+        else:
+            lines.append(line)
+    if header is not None:
+        output.extend(_compact_hunk(header, lines, context_lines, stats))
+    else:
+        output.extend(lines)
+    return "\n".join(output)
+
+
+def _compact_file(
+    filename: str,
+    header: str,
+    patch: str,
+    additions: int,
+    deletions: int,
+    status: str,
+    stats: Dict[str, int]
+) -> str:
+    """파일 하나의 LLM용 diff 구역 (생략 대상 파일은 요약 한 줄, drop 모드면 빈 문자열)"""
+    kind = _skip_kind(filename, patch, status) if filename else None
+    if kind == "no_patch" and not additions and not deletions:
+        return ""  # 이름만 바뀐 파일 등 내용 변경 없음
+    if kind is not None:
+        if settings.diff_generated_files == "drop":
+            stats["files_dropped"] += 1
+            return ""
+        stats["files_summarized"] += 1
+        return f"{header}\n[{SKIP_LABELS[kind]} 변경 생략: +{additions} -{deletions}줄]"
+    body = compact_patch(patch, settings.diff_context_lines, stats)
+    return f"{header}\n{body}" if header else body
+
+
+def _finish(original: str, compacted: str, stats: Dict[str, int]) -> Tuple[str, Dict[str, int]]:
+    original_bytes = len(original.encode("utf-8"))
+    compacted_bytes = len(compacted.encode("utf-8"))
+    original_tokens = count_tokens(original)
+    compacted_tokens = count_tokens(compacted) if compacted != original else original_tokens
+    stats.update({
+        "original_bytes": original_bytes,
+        "compacted_bytes": compacted_bytes,
+        "bytes_saved": original_bytes - compacted_bytes,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": original_tokens - compacted_tokens
+    })
+    return compacted, stats
+
+
+def compact_files(files: List[Dict[str, Any]]) -> Tuple[str, Dict[str, int]]:
+    """
+    커밋 파일 목록(filename/patch/additions/deletions/status) → LLM용 combined diff와 절감 통계
+    ("=== 파일명 ===" 구역 형식은 압축하지 않은 diff와 같음)
+    """
+    original = "\n\n".join(
+        f"=== {file.get('filename')} ===\n{file.get('patch')}" for file in files if file.get("patch")
+    )
+    stats = _new_stats()
+    if not settings.diff_compaction:
+        return _finish(original, original, stats)
+
+    sections = []
+    for file in files:
+        section = _compact_file(
+            file.get("filename") or "",
+            f"=== {file.get('filename')} ===",
+            file.get("patch") or "",
+            file.get("additions") or 0,
+            file.get("deletions") or 0,
+            file.get("status") or "",
+            stats
+        )
+        if section:
+            sections.append(section)
+    return _finish(original, "\n\n".join(sections), stats)
+
+
+def compact_diff(code_diff: str) -> Tuple[str, Dict[str, int]]:
+    """
+    사용자가 직접 넘긴 diff 텍스트 압축 (/analyze)
+    "=== 파일명 ===" 또는 "diff --git" 구역별로 나눠 compact_files와 같은 규칙 적용
+    """
+    stats = _new_stats()
+    if not settings.diff_compaction:
+        return _finish(code_diff, code_diff, stats)
+
+    sections = []
+    for header, lines in split_files(code_diff):
+        filename = ""
+        if header.startswith("=== "):
+            filename = header[4:-4]
+        elif header.startswith("diff --git "):
+            filename = header.rsplit(" b/", 1)[-1]
+        patch = "\n".join(lines).strip("\n")
+        status = "removed" if any(line.startswith("deleted file mode") for line in lines[:5]) else ""
+        additions = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+        deletions = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+        section = _compact_file(filename, header, patch, additions, deletions, status, stats)
+        if section:
+            sections.append(section)
+    return _finish(code_diff, "\n\n".join(sections), stats)
@@ -0,0 +1,76 @@
+# backend/services/diff_lines.py
+from typing import Iterable, Iterator, Tuple
+
+# 줄 종류
+HEADER = "header"    # 파일 구분(=== 파일명 ===, diff --git, index, ---/+++)과 헝크 밖의 줄
+HUNK = "hunk"        # @@ 헝크 헤더
+ADDED = "added"
+REMOVED = "removed"
+CONTEXT = "context"
+
+_BODY_KINDS = {"+": ADDED, "-": REMOVED, " ": CONTEXT, "\\": CONTEXT, "": CONTEXT}
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """텍스트를 줄 단위로 하나씩 반환 (split으로 줄 목록을 한꺼번에 만들지 않음)"""
+    start = 0
+    length = len(text)
+    while start <= length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end]
+        start = end + 1
+
+
+def classify_lines(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    unified diff 줄 분류 - (종류, 내용)을 한 줄씩 반환
+    헝크 안의 +/-/공백 줄만 코드로 보고 첫 글자를 뗀 내용을 돌려줌
+    (헝크 밖의 "+++ b/파일", "--- a/파일" 같은 줄은 추가/삭제 줄로 세지 않음)
+    여러 diff를 이어 붙인 입력은 헝크 안이라도 "---" 다음 줄이 "+++"이면 새 파일 헤더로 봄
+    """
+    in_hunk = False
+    pending = None  # 헝크 안의 "---" 줄 (다음 줄을 보고 삭제 줄/파일 헤더 결정)
+    for line in lines:
+        if pending is not None:
+            if line.startswith("+++"):
+                in_hunk = False
+                yield HEADER, pending
+                yield HEADER, line
+                pending = None
+                continue
+            yield REMOVED, pending[1:]
+            pending = None
+        if in_hunk:
+            if line.startswith("---"):
+                pending = line
+                continue
+            kind = _BODY_KINDS.get(line[:1])
+            if kind is not None:
+                yield kind, line[1:]
+                continue
+        in_hunk = line.startswith("@@")
+        yield (HUNK if in_hunk else HEADER), line
+    if pending is not None:
+        yield REMOVED, pending[1:]
+
+
+def added_code(code_diff: str) -> Tuple[str, int, int]:
+    """
+    추가된 코드 줄만 모은 텍스트와 (검사한 줄 수, 건너뛴 줄 수)
+    헝크가 하나도 없는 입력(diff가 아닌 코드 조각)은 전체를 검사
+    """
+    added = []
+    skipped = 0
+    hunks = 0
+    for kind, content in classify_lines(iter_lines(code_diff)):
+        if kind == ADDED:
+            added.append(content)
+            continue
+        skipped += 1
+        if kind == HUNK:
+            hunks += 1
+    if not hunks:
+        return code_diff, skipped, 0
+    return "\n".join(added), len(added), skipped
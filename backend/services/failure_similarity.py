@@ -0,0 +1,295 @@
+# backend/services/failure_similarity.py
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import List, Optional, Dict, Any, Set, Tuple
+
+import numpy as np
+
+# MinHash 서명 길이와 LSH 밴드 구성 (32밴드 × 4행: 유사도 약 0.4 이상부터 후보로 잡힘)
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+# 해시 계수는 고정 시드로 생성 - 저장된 서명과 새 서명이 같은 함수로 계산되어야 함
+_PRIME = np.uint64(4294967291)  # 2^32 미만 최대 소수
+_rng = np.random.RandomState(20250722)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)[:, None]
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)[:, None]
+_BAND_MIX = (_rng.randint(1, 2 ** 62, size=ROWS, dtype=np.int64).astype(np.uint64) | np.uint64(1))
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def diff_shingles(diff: str) -> np.ndarray:
+    """
+    diff의 변경 줄(+/-)을 헝크 단위로 토큰화해 5-토큰 shingle 해시 집합 생성
+    (줄 앞의 +/- 기호도 토큰으로 넣어 추가/삭제를 구분)
+    """
+    hashes: Set[int] = set()
+    tokens: List[str] = []
+
+    def flush():
+        if not tokens:
+            return
+        for start in range(max(len(tokens) - SHINGLE_SIZE + 1, 1)):
+            hashes.add(zlib.crc32(" ".join(tokens[start:start + SHINGLE_SIZE]).encode("utf-8")))
+        tokens.clear()
+
+    for line in diff.split("\n"):
+        if line.startswith("@@") or line.startswith("=== "):
+            flush()  # 헝크/파일 경계를 넘는 shingle은 만들지 않음
+        elif line[:1] in ("+", "-") and not line.startswith(("+++", "---")):
+            tokens.append(line[0])
+            tokens.extend(TOKEN_PATTERN.findall(line[1:]))
+    flush()
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash(shingles: np.ndarray, block: int = 4096) -> np.ndarray:
+    """shingle 해시 집합 → MinHash 서명 (uint32 × NUM_PERM)"""
+    signature = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint64)
+    for start in range(0, len(shingles), block):
+        chunk = shingles[start:start + block][None, :]
+        values = (_A * chunk + _B) % _PRIME
+        np.minimum(signature, values.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """서명(들) → 밴드별 버킷 키 (uint64, 마지막 축이 밴드)"""
+    rows = signatures.astype(np.uint64).reshape(signatures.shape[:-1] + (BANDS, ROWS))
+    return (rows * _BAND_MIX).sum(axis=-1, dtype=np.uint64)
+
+
+class _Snapshot:
+    """디스크에 저장된 인덱스 (memory-mapped, 읽기 전용)"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.count = 0
+        self.signatures = np.zeros((0, NUM_PERM), dtype=np.uint32)
+        self.band_keys = np.zeros((BANDS, 0), dtype=np.uint64)  # 밴드별 정렬된 키
+        self.band_ids = np.zeros((BANDS, 0), dtype=np.int64)
+        self.offsets = np.zeros((0, 2), dtype=np.int64)  # meta.jsonl 안의 (시작, 끝) 바이트 위치
+        self.shas = np.zeros(0, dtype="S40")  # 정렬된 커밋 SHA (고정 길이 바이트열)
+        self.meta: Optional[mmap.mmap] = None
+        if directory and os.path.exists(os.path.join(directory, "signatures.npy")):
+            self.signatures = np.load(os.path.join(directory, "signatures.npy"), mmap_mode="r")
+            self.band_keys = np.load(os.path.join(directory, "band_keys.npy"), mmap_mode="r")
+            self.band_ids = np.load(os.path.join(directory, "band_ids.npy"), mmap_mode="r")
+            self.offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode="r")
+            self.count = len(self.signatures)
+            with open(os.path.join(directory, "meta.jsonl"), "rb") as meta_file:
+                if os.fstat(meta_file.fileno()).st_size:
+                    self.meta = mmap.mmap(meta_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.path.exists(os.path.join(directory, "shas.npy")):
+                self.shas = np.load(os.path.join(directory, "shas.npy"), mmap_mode="r")
+            else:
+                # SHA 배열 없이 저장된 이전 인덱스 - 메타데이터에서 한 번 만들고 다음 save()부터 파일로 기록
+                self.shas = np.sort(np.array(
+                    [self.meta_at(doc_id)["sha"].encode("ascii") for doc_id in range(self.count)], dtype="S40"
+                ))
+
+    def has_sha(self, sha: str) -> bool:
+        """정렬된 SHA 배열에서 이진 탐색"""
+        key = sha.encode("ascii")
+        if not len(self.shas) or len(key) > self.shas.dtype.itemsize:
+            return False
+        position = int(np.searchsorted(self.shas, key))
+        return position < len(self.shas) and self.shas[position] == key
+
+    def meta_at(self, doc_id: int) -> Dict[str, Any]:
+        start, end = self.offsets[doc_id]
+        return json.loads(self.meta[int(start):int(end)])
+
+
+class FailureSimilarityIndex:
+    """
+    과거 실패 커밋 diff의 MinHash/LSH 인덱스
+    - 저장된 부분: 서명 행렬과 밴드별 (정렬된 버킷 키, 커밋 id) 배열을 .npy로 저장하고 mmap으로 로드
+      → 조회는 밴드마다 searchsorted 한 번, 로드 시 전체를 메모리에 올리지 않음
+    - 새로 추가한 커밋은 메모리 델타에 두었다가 save()에서 병합해 다시 기록
+    - 중복 확인용 SHA도 정렬된 .npy로 저장해 시작 시 메타데이터 전체를 읽지 않음
+    - save()는 스레드에서 실행되므로 스냅샷/델타 교체와 add()는 잠금으로 보호,
+      query()는 잠금 안에서 스냅샷과 델타를 함께 잡아 두고 조회
+    """
+
+    def __init__(self, directory: str = ""):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot(directory)
+        self._new_signatures: List[np.ndarray] = []
+        self._new_meta: List[Dict[str, Any]] = []
+        self._new_buckets: Dict[tuple, List[int]] = {}
+        self._new_shas: Set[str] = set()
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._snapshot.count + len(self._new_signatures)
+
+    def contains(self, sha: str) -> bool:
+        with self._lock:
+            if sha in self._new_shas:
+                return True
+            snapshot = self._snapshot
+        return snapshot.has_sha(sha)
+
+    def add(self, sha: str, subject: str, files: List[str], diff: str) -> bool:
+        """실패 커밋 하나 추가 (이미 있거나 비교할 변경 줄이 없으면 False)"""
+        if self.contains(sha):
+            return False
+        shingles = diff_shingles(diff)
+        if not len(shingles):
+            return False
+        signature = minhash(shingles)
+        with self._lock:
+            doc_id = self._snapshot.count + len(self._new_signatures)
+            for band, key in enumerate(band_keys(signature).tolist()):
+                self._new_buckets.setdefault((band, key), []).append(doc_id)
+            self._new_signatures.append(signature)
+            self._new_meta.append({"sha": sha, "subject": subject, "files": files[:20]})
+            self._new_shas.add(sha)
+        return True
+
+    def query(
+        self,
+        diff: str,
+        k: int = 5,
+        exclude: Optional[str] = None,
+        max_candidates: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """diff와 가장 비슷한 과거 실패 커밋 k개 (similarity: 추정 Jaccard 유사도)"""
+        with self._lock:
+            view = self._snapshot, self._new_signatures, self._new_meta, self._new_buckets
+        snapshot, _, _, new_buckets = view
+        if not snapshot.count and not view[1]:
+            return []
+        shingles = diff_shingles(diff)
+        if not len(shingles):
+            return []
+        signature = minhash(shingles)
+        keys = band_keys(signature)
+
+        hits: Counter = Counter()
+        for band in range(BANDS):
+            key = keys[band]
+            if snapshot.count:
+                sorted_keys = snapshot.band_keys[band]
+                lo = np.searchsorted(sorted_keys, key, side="left")
+                hi = np.searchsorted(sorted_keys, key, side="right")
+                hits.update(snapshot.band_ids[band, lo:hi].tolist())
+            hits.update(new_buckets.get((band, int(key)), ()))
+        if not hits:
+            return []
+
+        # 많은 밴드에서 겹친 후보부터 정확한 서명 비교
+        candidates = [doc_id for doc_id, _ in hits.most_common(max_candidates)]
+        candidate_signatures = np.stack([_signature(view, doc_id) for doc_id in candidates])
+        similarities = (candidate_signatures == signature).mean(axis=1)
+
+        results = []
+        for index in np.argsort(-similarities, kind="stable"):
+            meta = _meta(view, candidates[index])
+            if meta["sha"] == exclude:
+                continue
+            results.append({**meta, "similarity": round(float(similarities[index]), 4)})
+            if len(results) >= k:
+                break
+        return results
+
+    def save(self):
+        """메모리 델타를 디스크 인덱스에 병합 (별도 스레드에서 호출, 디렉터리가 없으면 메모리만 유지)"""
+        with self._lock:
+            snapshot = self._snapshot
+            pending_signatures = list(self._new_signatures)
+            pending_meta = list(self._new_meta)
+        if not self.directory or not pending_signatures:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        added = len(pending_signatures)
+        signatures = np.concatenate([np.asarray(snapshot.signatures), np.stack(pending_signatures)])
+
+        # 밴드별로 키를 정렬해 두면 조회는 이진 탐색만으로 충분
+        keys = band_keys(signatures).T  # (BANDS, N)
+        order = np.argsort(keys, axis=1, kind="stable")
+        sorted_keys = np.take_along_axis(keys, order, axis=1)
+
+        lines = [
+            (json.dumps(meta, ensure_ascii=False) + "\n").encode("utf-8")
+            for meta in pending_meta
+        ]
+        with open(os.path.join(self.directory, "meta.jsonl"), "ab") as meta_file:
+            # 이전 저장이 중간에 끊겨 남은 줄이 있어도 실제 파일 끝부터 기록
+            meta_file.seek(0, os.SEEK_END)
+            base = meta_file.tell()
+            meta_file.write(b"".join(lines))
+        ends = base + np.cumsum([len(line) for line in lines], dtype=np.int64)
+        starts = np.concatenate([[base], ends[:-1]])
+        offsets = np.concatenate([np.asarray(snapshot.offsets), np.stack([starts, ends], axis=1)])
+        shas = np.sort(np.concatenate([
+            np.asarray(snapshot.shas), np.array([meta["sha"].encode("ascii") for meta in pending_meta])
+        ]))
+
+        # 서명/오프셋을 먼저 쓰고 밴드 배열을 마지막에 교체 (모든 파일은 임시 파일 → rename)
+        self._write_array("signatures.npy", signatures)
+        self._write_array("offsets.npy", offsets)
+        self._write_array("shas.npy", shas)
+        self._write_array("band_ids.npy", order)
+        self._write_array("band_keys.npy", sorted_keys)
+
+        # 새 스냅샷과 저장 중 추가된 델타를 한 번에 교체 (교체 전까지는 기존 스냅샷 + 델타로 조회)
+        saved = _Snapshot(self.directory)
+        with self._lock:
+            self._snapshot = saved
+            self._new_signatures = self._new_signatures[added:]
+            self._new_meta = self._new_meta[added:]
+            self._new_buckets = _buckets(self._new_signatures, saved.count)
+            self._new_shas = {meta["sha"] for meta in self._new_meta}
+
+    def _write_array(self, filename: str, array: np.ndarray):
+        path = os.path.join(self.directory, filename)
+        with open(path + ".tmp", "wb") as array_file:
+            np.save(array_file, array)
+        os.replace(path + ".tmp", path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot_count, pending = self._snapshot.count, len(self._new_signatures)
+        return {
+            "failed_commits": snapshot_count + pending,
+            "on_disk": snapshot_count,
+            "pending": pending
+        }
+
+
+# query()가 잠금 안에서 잡아 둔 (스냅샷, 델타 서명, 델타 메타, 델타 버킷)
+_View = Tuple[_Snapshot, List[np.ndarray], List[Dict[str, Any]], Dict[tuple, List[int]]]
+
+
+def _signature(view: _View, doc_id: int) -> np.ndarray:
+    snapshot, new_signatures = view[0], view[1]
+    if doc_id < snapshot.count:
+        return snapshot.signatures[doc_id]
+    return new_signatures[doc_id - snapshot.count]
+
+
+def _meta(view: _View, doc_id: int) -> Dict[str, Any]:
+    snapshot, new_meta = view[0], view[2]
+    if doc_id < snapshot.count:
+        return snapshot.meta_at(doc_id)
+    return new_meta[doc_id - snapshot.count]
+
+
+def _buckets(signatures: List[np.ndarray], base: int) -> Dict[tuple, List[int]]:
+    """델타 서명의 LSH 버킷 (커밋 id는 스냅샷 다음 번호부터)"""
+    buckets: Dict[tuple, List[int]] = {}
+    for offset, signature in enumerate(signatures):
+        for band, key in enumerate(band_keys(signature).tolist()):
+            buckets.setdefault((band, key), []).append(base + offset)
+    return buckets
@@ -0,0 +1,83 @@
+# backend/services/github_http_cache.py
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# 40자리 전체 SHA로 조회한 커밋은 내용이 바뀌지 않으므로 재검증 없이 재사용 가능
+FULL_SHA_PATTERN = re.compile(r"^[0-9a-fA-F]{40}$")
+
+
+def is_full_sha(ref: str) -> bool:
+    return bool(FULL_SHA_PATTERN.match(ref or ""))
+
+
+class GitHubHTTPCache:
+    """
+    GitHub API 응답 캐시 (URL 단위 ETag / Last-Modified 저장)
+    - 일반 응답: If-None-Match / If-Modified-Since로 재검증 (304는 rate limit에 포함되지 않음)
+    - 불변 응답(전체 SHA 커밋 상세): 재검증 없이 바로 반환
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self.immutable_hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], token: Optional[str]) -> str:
+        """URL + 쿼리 + 인증 주체 기준 키 (토큰마다 접근 가능한 응답이 다를 수 있음)"""
+        token_id = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16] if token else ""
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{token_id}|{url}|{query}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(
+        self,
+        key: str,
+        data: Any,
+        headers: Dict[str, str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        immutable: bool = False
+    ):
+        if not etag and not last_modified and not immutable:
+            return  # 재검증할 수단이 없으면 저장하지 않음
+        self._entries[key] = {
+            "data": data,
+            "headers": headers,
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": immutable
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "capacity": self.max_entries,
+            "immutable_hits": self.immutable_hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses
+        }
@@ -0,0 +1,186 @@
+# backend/services/github_rate_limiter.py
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# 요청 우선순위: 사용자가 기다리는 요청이 배치 작업보다 먼저 예산을 사용
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+
+class RateLimitWaitTooLong(Exception):
+    """허용된 최대 대기 시간 안에 요청 예산이 회복되지 않는 경우"""
+    def __init__(self, wait_seconds: float, reset_at: float):
+        super().__init__(f"GitHub API 요청 한도 초과 - 약 {int(wait_seconds)}초 후 재시도 가능")
+        self.wait_seconds = wait_seconds
+        self.reset_at = reset_at
+
+
+def token_identity(token: Optional[str]) -> str:
+    """토큰별 예산 구분용 식별자 (토큰 원문은 보관하지 않음)"""
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+
+
+class _Budget:
+    """토큰 하나의 rate limit 상태"""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None  # 응답 헤더를 받기 전에는 알 수 없음
+        self.reset_at = 0.0
+        self.blocked_until = 0.0  # secondary limit (Retry-After)
+        self.next_bulk_at = 0.0
+        self.interactive_waiting = 0
+        self.bulk_waiting = 0
+        self.interactive_idle = asyncio.Event()
+        self.interactive_idle.set()
+
+
+class GitHubRateLimiter:
+    """
+    GitHub rate limit 스케줄러
+    - 모든 응답의 X-RateLimit-Remaining / X-RateLimit-Reset, Retry-After 헤더를 추적
+    - 예산이 바닥나면 실패 대신 회복 시점까지 대기(큐잉)
+    - 배치 요청은 남은 예산을 리셋 시각까지 균등 분배해 간격을 두고 실행하며,
+      일정 비율은 대화형 요청용으로 남겨 둠
+    """
+
+    def __init__(
+        self,
+        bulk_reserve_ratio: float = 0.1,
+        interactive_max_wait: float = 30.0,
+        bulk_max_wait: float = 3600.0
+    ):
+        self.bulk_reserve_ratio = bulk_reserve_ratio
+        self.interactive_max_wait = interactive_max_wait
+        self.bulk_max_wait = bulk_max_wait
+        self._budgets: Dict[str, _Budget] = {}
+
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    def _budget(self, token: Optional[str]) -> _Budget:
+        key = token_identity(token)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget()
+        return budget
+
+    async def acquire(self, token: Optional[str], priority: int = PRIORITY_INTERACTIVE):
+        """요청 하나를 보낼 수 있을 때까지 대기한 뒤 예산 1개를 예약"""
+        budget = self._budget(token)
+        max_wait = self.interactive_max_wait if priority == PRIORITY_INTERACTIVE else self.bulk_max_wait
+        started = time.monotonic()
+        throttled = False
+
+        if priority == PRIORITY_INTERACTIVE:
+            budget.interactive_waiting += 1
+            budget.interactive_idle.clear()
+        else:
+            budget.bulk_waiting += 1
+
+        try:
+            while True:
+                # 배치 요청은 대기 중인 대화형 요청이 모두 나간 뒤에 진행
+                if priority == PRIORITY_BULK and not budget.interactive_idle.is_set():
+                    await budget.interactive_idle.wait()
+                    continue
+
+                wait = self._required_wait(budget, priority, time.time())
+                if wait <= 0:
+                    if budget.remaining is not None:
+                        budget.remaining -= 1
+                    return
+
+                waited = time.monotonic() - started
+                if waited + wait > max_wait:
+                    raise RateLimitWaitTooLong(wait, max(budget.reset_at, budget.blocked_until))
+
+                if not throttled:
+                    throttled = True
+                    self.throttled += 1
+                # 대기 중에도 다른 응답 헤더로 상태가 갱신될 수 있으므로 짧게 나눠 재확인
+                sleep_for = min(wait, 1.0)
+                self.throttled_seconds += sleep_for
+                await asyncio.sleep(sleep_for)
+        finally:
+            if priority == PRIORITY_INTERACTIVE:
+                budget.interactive_waiting -= 1
+                if budget.interactive_waiting == 0:
+                    budget.interactive_idle.set()
+            else:
+                budget.bulk_waiting -= 1
+
+    def _required_wait(self, budget: _Budget, priority: int, now: float) -> float:
+        """지금 요청하려면 더 기다려야 하는 시간(초), 0 이하면 즉시 가능"""
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+
+        # 리셋 시각이 지나면 예산 복구
+        if budget.remaining is not None and budget.reset_at and now >= budget.reset_at:
+            budget.remaining = budget.limit
+
+        if budget.remaining is None:
+            return 0.0  # 아직 헤더를 받지 못함 - 첫 응답으로 상태 파악
+
+        time_to_reset = max(budget.reset_at - now, 0.0)
+        if priority == PRIORITY_INTERACTIVE:
+            return 0.0 if budget.remaining > 0 else time_to_reset + 1.0
+
+        reserve = int((budget.limit or 0) * self.bulk_reserve_ratio)
+        usable = budget.remaining - reserve
+        if usable <= 0:
+            return time_to_reset + 1.0
+
+        # 남은 배치 예산을 리셋 시각까지 균등하게 분배
+        if budget.next_bulk_at > now:
+            return budget.next_bulk_at - now
+        budget.next_bulk_at = now + time_to_reset / usable
+        return 0.0
+
+    def update(self, token: Optional[str], status: int, headers: Mapping[str, str]):
+        """응답 헤더로 예산 상태 갱신, 한도 초과 응답이면 True 반환"""
+        budget = self._budget(token)
+        now = time.time()
+
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if limit is not None:
+            budget.limit = int(limit)
+        if remaining is not None:
+            budget.remaining = int(remaining)
+        if reset is not None:
+            budget.reset_at = float(reset)
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            budget.blocked_until = max(budget.blocked_until, now + float(retry_after))
+            return True
+
+        if status in (403, 429) and budget.remaining == 0:
+            budget.blocked_until = max(budget.blocked_until, budget.reset_at)
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """토큰별 남은 예산 (metrics 엔드포인트용)"""
+        now = time.time()
+        return {
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 1),
+            "budgets": {
+                key: {
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_in": round(max(budget.reset_at - now, 0.0), 1) if budget.reset_at else None,
+                    "blocked_for": round(max(budget.blocked_until - now, 0.0), 1),
+                    "interactive_waiting": budget.interactive_waiting,
+                    "bulk_waiting": budget.bulk_waiting
+                }
+                for key, budget in self._budgets.items()
+            }
+        }
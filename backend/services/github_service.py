@@ -1,10 +1,19 @@
 import aiohttp
 import asyncio
-from typing import List, Optional, Dict, Any
+from multidict import CIMultiDict
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime
 import logging
 
-from ..models.github_models import (
+from config import settings
+from services.commit_source import CommitSource, CommitSourceError
+from services.github_http_cache import GitHubHTTPCache, is_full_sha
+from services.github_rate_limiter import (
+    GitHubRateLimiter,
+    RateLimitWaitTooLong,
+    PRIORITY_INTERACTIVE
+)
+from models.github_models import (
     GitHubConfig, 
     CommitResponse, 
     CommitDetailResponse,
@@ -12,22 +21,52 @@ from ..models.github_models import (
     CommitInfo,
     GitHubUser,
     CommitStats,
-    FileChange,
-    AnalysisOptions
+    FileChange
 )
 
 logger = logging.getLogger(__name__)
 
-class GitHubService:
+def _parse_next_link(link_header: Optional[str]) -> Optional[str]:
+    """Link 헤더에서 rel="next" URL 추출"""
+    if not link_header:
+        return None
+    for part in link_header.split(","):
+        segments = part.split(";")
+        if any(segment.strip() == 'rel="next"' for segment in segments[1:]):
+            return segments[0].strip().strip("<>")
+    return None
+
+class GitHubAPIError(CommitSourceError):
+    """GitHub API 호출 실패 (status: HTTP 상태 코드, 네트워크 오류는 None)"""
+    pass
+
+class GitHubService(CommitSource):
     BASE_URL = "https://api.github.com"
     
     def __init__(self):
         self.session = None
+        self.http_cache = GitHubHTTPCache(max_entries=settings.github_http_cache_size)
+        self.rate_limiter = GitHubRateLimiter(
+            bulk_reserve_ratio=settings.github_bulk_reserve_ratio,
+            interactive_max_wait=settings.github_interactive_max_wait,
+            bulk_max_wait=settings.github_bulk_max_wait
+        )
     
     async def get_session(self) -> aiohttp.ClientSession:
-        """aiohttp 세션 생성"""
+        """aiohttp 세션 생성 (커넥션 풀을 재사용하도록 프로세스당 하나 유지)"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=settings.github_max_connections,
+                limit_per_host=settings.github_max_connections_per_host,
+                ttl_dns_cache=settings.github_dns_cache_ttl,
+                keepalive_timeout=settings.github_keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=settings.github_timeout,
+                connect=settings.github_connect_timeout
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
         return self.session
     
     def _get_headers(self, token: Optional[str] = None) -> Dict[str, str]:
@@ -40,16 +79,89 @@ class GitHubService:
             headers["Authorization"] = f"token {token}"
         return headers
     
+    async def _get_json(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        immutable: bool = False,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        GET 요청 후 (status, 본문, 응답 헤더) 반환
+        - 200: JSON 본문, 그 외: 오류 텍스트
+        - ETag/Last-Modified로 조건부 요청, 304면 캐시된 본문을 200으로 반환
+        - immutable=True이고 캐시에 있으면 네트워크 요청 없이 반환
+        - rate limit 예산이 없으면 회복될 때까지 대기, 한도 초과 응답은 재시도
+        """
+        cache_key = self.http_cache.make_key(url, params, token)
+        cached = self.http_cache.get(cache_key)
+        if cached is not None and cached["immutable"]:
+            self.http_cache.immutable_hits += 1
+            return 200, cached["data"], cached["headers"]
+        
+        headers = self._get_headers(token)
+        headers.update(self.http_cache.conditional_headers(cached))
+        session = await self.get_session()
+        
+        try:
+            for attempt in range(settings.github_rate_limit_retries + 1):
+                await self.rate_limiter.acquire(token, priority)
+                async with session.get(url, headers=headers, params=params) as response:
+                    # GitHub는 헤더 이름을 소문자로 보내므로 대소문자 무시 사본 사용
+                    response_headers = CIMultiDict(response.headers)
+                    limited = self.rate_limiter.update(token, response.status, response_headers)
+                    if limited and attempt < settings.github_rate_limit_retries:
+                        logger.warning(f"GitHub rate limit 도달, 대기 후 재시도: {url}")
+                        continue
+                    return await self._read_response(response, response_headers, cached, cache_key, immutable)
+                    
+        except RateLimitWaitTooLong as e:
+            raise GitHubAPIError(
+                f"API 요청 한도를 초과했습니다. 약 {int(e.wait_seconds)}초 후 다시 시도해주세요.", 403
+            )
+        except asyncio.TimeoutError:
+            raise GitHubAPIError("GitHub API 요청 시간이 초과되었습니다.")
+        except aiohttp.ClientError as e:
+            raise GitHubAPIError(f"네트워크 오류: {str(e)}")
+    
+    async def _read_response(
+        self,
+        response: aiohttp.ClientResponse,
+        response_headers: Dict[str, str],
+        cached: Optional[Dict[str, Any]],
+        cache_key: str,
+        immutable: bool
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """응답 본문 읽기 및 HTTP 캐시 반영"""
+        if response.status == 304 and cached is not None:
+            self.http_cache.not_modified += 1
+            # 304 응답에는 Link 등이 빠질 수 있으므로 원래 응답 헤더를 반환
+            return 200, cached["data"], cached["headers"]
+        if response.status == 200:
+            self.http_cache.misses += 1
+            data = await response.json()
+            self.http_cache.store(
+                cache_key,
+                data,
+                response_headers,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                immutable=immutable
+            )
+            return 200, data, response_headers
+        return response.status, await response.text(), response_headers
+    
     async def get_commits(
         self,
         config: GitHubConfig,
         per_page: int = 10,
         page: int = 1,
         since: Optional[str] = None,
-        until: Optional[str] = None
+        until: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> List[CommitResponse]:
         """커밋 목록 조회"""
-        session = await self.get_session()
         url = f"{self.BASE_URL}/repos/{config.owner}/{config.repo}/commits"
         
         params = {
@@ -63,130 +175,113 @@ class GitHubService:
         if until:
             params["until"] = until
         
-        headers = self._get_headers(config.token)
+        commits, _ = await self._get_commit_page(url, config.token, params, priority)
+        return commits
+    
+    async def iter_commits(
+        self,
+        config: GitHubConfig,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        per_page: int = 100,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[CommitResponse]:
+        """
+        커밋 목록 전체 순회 (Link: rel="next"를 따라 자동 페이지네이션)
+        - 현재 페이지를 소비하는 동안 다음 페이지를 미리 요청
+        - 메모리에는 현재 페이지와 미리 받은 다음 페이지만 유지
+        """
+        url = f"{self.BASE_URL}/repos/{config.owner}/{config.repo}/commits"
+        params = {
+            "sha": config.branch,
+            "per_page": per_page
+        }
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
         
+        next_fetch = asyncio.ensure_future(
+            self._get_commit_page(url, config.token, params, priority)
+        )
         try:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [self._parse_commit(commit) for commit in data]
-                elif response.status == 404:
-                    raise Exception("저장소를 찾을 수 없습니다.")
-                elif response.status == 403:
-                    raise Exception("API 제한 또는 권한이 없습니다.")
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API 오류: {response.status} - {error_text}")
-                    
-        except aiohttp.ClientError as e:
-            raise Exception(f"네트워크 오류: {str(e)}")
+            while next_fetch is not None:
+                commits, next_url = await next_fetch
+                next_fetch = None
+                if next_url:
+                    # next URL에는 쿼리가 모두 포함되어 있음
+                    next_fetch = asyncio.ensure_future(
+                        self._get_commit_page(next_url, config.token, None, priority)
+                    )
+                for commit in commits:
+                    yield commit
+        finally:
+            # 소비자가 중간에 멈추면 미리 받던 페이지 요청 취소
+            if next_fetch is not None and not next_fetch.done():
+                next_fetch.cancel()
+    
+    async def _get_commit_page(
+        self,
+        url: str,
+        token: Optional[str],
+        params: Optional[Dict[str, Any]],
+        priority: int
+    ) -> Tuple[List[CommitResponse], Optional[str]]:
+        """커밋 목록 한 페이지 조회 후 (커밋 목록, 다음 페이지 URL) 반환"""
+        status, data, headers = await self._get_json(url, token, params, priority=priority)
+        if status == 200:
+            commits = [self._parse_commit(commit) for commit in data]
+            return commits, _parse_next_link(headers.get("Link"))
+        elif status == 404:
+            raise GitHubAPIError("저장소를 찾을 수 없습니다.", status)
+        elif status == 403:
+            raise GitHubAPIError("API 제한 또는 권한이 없습니다.", status)
+        else:
+            raise GitHubAPIError(f"GitHub API 오류: {status} - {data}", status)
     
     async def get_commit_detail(
         self,
         config: GitHubConfig,
-        sha: str
+        sha: str,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> CommitDetailResponse:
-        """특정 커밋의 상세 정보 조회"""
-        session = await self.get_session()
+        """특정 커밋의 상세 정보 조회 (전체 SHA는 불변이므로 재검증 없이 캐시 사용)"""
         url = f"{self.BASE_URL}/repos/{config.owner}/{config.repo}/commits/{sha}"
-        headers = self._get_headers(config.token)
-        
-        try:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_commit_detail(data)
-                elif response.status == 404:
-                    raise Exception("커밋을 찾을 수 없습니다.")
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API 오류: {response.status} - {error_text}")
-                    
-        except aiohttp.ClientError as e:
-            raise Exception(f"네트워크 오류: {str(e)}")
-    
-    async def get_repository_info(self, config: GitHubConfig) -> Dict[str, Any]:
-        """저장소 기본 정보 조회"""
-        session = await self.get_session()
-        url = f"{self.BASE_URL}/repos/{config.owner}/{config.repo}"
-        headers = self._get_headers(config.token)
         
-        try:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "name": data.get("name"),
-                        "full_name": data.get("full_name"),
-                        "description": data.get("description"),
-                        "language": data.get("language"),
-                        "stars": data.get("stargazers_count"),
-                        "forks": data.get("forks_count"),
-                        "size": data.get("size"),
-                        "created_at": data.get("created_at"),
-                        "updated_at": data.get("updated_at"),
-                        "default_branch": data.get("default_branch")
-                    }
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API 오류: {response.status} - {error_text}")
-                    
-        except aiohttp.ClientError as e:
-            raise Exception(f"네트워크 오류: {str(e)}")
+        status, data, _ = await self._get_json(
+            url, config.token, immutable=is_full_sha(sha), priority=priority
+        )
+        if status == 200:
+            return self._parse_commit_detail(data)
+        elif status == 404:
+            raise GitHubAPIError("커밋을 찾을 수 없습니다.", status)
+        else:
+            raise GitHubAPIError(f"GitHub API 오류: {status} - {data}", status)
     
-    async def analyze_commits(
+    async def get_repository_info(
         self,
         config: GitHubConfig,
-        commit_shas: List[str],
-        file_types: List[str],
-        analysis_options: AnalysisOptions
+        priority: int = PRIORITY_INTERACTIVE
     ) -> Dict[str, Any]:
-        """커밋 분석 (향후 LLM 연동)"""
-        analysis_results = []
-        
-        for sha in commit_shas:
-            try:
-                commit_detail = await self.get_commit_detail(config, sha)
-                
-                # 파일 타입 필터링
-                filtered_files = self._filter_files_by_type(
-                    commit_detail.files, file_types
-                )
-                
-                if filtered_files:
-                    analysis_result = {
-                        "commit_sha": sha,
-                        "commit_message": commit_detail.commit.message,
-                        "author": commit_detail.commit.author.name,
-                        "date": commit_detail.commit.author.date,
-                        "files_analyzed": len(filtered_files),
-                        "files": [
-                            {
-                                "filename": file.filename,
-                                "status": file.status,
-                                "changes": file.changes,
-                                "patch": file.patch
-                            }
-                            for file in filtered_files
-                        ],
-                        "analysis_status": "ready_for_llm"  # LLM 분석 대기
-                    }
-                    analysis_results.append(analysis_result)
-                    
-            except Exception as e:
-                logger.error(f"커밋 {sha} 분석 중 오류: {str(e)}")
-                analysis_results.append({
-                    "commit_sha": sha,
-                    "error": str(e),
-                    "analysis_status": "failed"
-                })
+        """저장소 기본 정보 조회"""
+        url = f"{self.BASE_URL}/repos/{config.owner}/{config.repo}"
         
-        return {
-            "total_commits": len(commit_shas),
-            "analyzed_commits": len([r for r in analysis_results if "error" not in r]),
-            "failed_commits": len([r for r in analysis_results if "error" in r]),
-            "results": analysis_results
-        }
+        status, data, _ = await self._get_json(url, config.token, priority=priority)
+        if status == 200:
+            return {
+                "name": data.get("name"),
+                "full_name": data.get("full_name"),
+                "description": data.get("description"),
+                "language": data.get("language"),
+                "stars": data.get("stargazers_count"),
+                "forks": data.get("forks_count"),
+                "size": data.get("size"),
+                "created_at": data.get("created_at"),
+                "updated_at": data.get("updated_at"),
+                "default_branch": data.get("default_branch")
+            }
+        else:
+            raise GitHubAPIError(f"GitHub API 오류: {status} - {data}", status)
     
     def _parse_commit(self, data: Dict[str, Any]) -> CommitResponse:
         """GitHub API 응답을 CommitResponse로 변환"""
@@ -255,21 +350,8 @@ class GitHubService:
             patch=data.get("patch")
         )
     
-    def _filter_files_by_type(
-        self, 
-        files: List[FileChange], 
-        file_types: List[str]
-    ) -> List[FileChange]:
-        """파일 타입으로 필터링"""
-        if not file_types:
-            return files
-        
-        return [
-            file for file in files
-            if any(file.filename.endswith(ext) for ext in file_types)
-        ]
-    
     async def close(self):
         """세션 종료"""
         if self.session and not self.session.closed:
-            await self.session.close()
\ No newline at end of file
+            await self.session.close()
+            self.session = None
\ No newline at end of file
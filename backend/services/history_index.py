@@ -0,0 +1,493 @@
+# backend/services/history_index.py
+import json
+import logging
+import os
+import re
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+
+from services.cochange_matrix import CoChangeMatrix
+from services.diff_lines import ADDED, REMOVED, classify_lines, iter_lines
+
+logger = logging.getLogger(__name__)
+
+# 수정/되돌림 성격의 커밋 메시지 (conventional commit "fix:" 포함)
+# 실패 라벨이 아님 - 이 커밋이 고친 줄/파일을 마지막으로 바꾼 이전 커밋이 실패(문제 유입) 커밋
+FIX_PATTERN = re.compile(
+    r"\b(fix(e[sd])?|bug(fix)?|hotfix|revert(ed)?|broken|build\s+(break|fail\w*)|compile\s+error)\b"
+    r"|버그|핫픽스|롤백|되돌림|(빌드|컴파일)\s*(실패|오류|에러|깨짐)|(오류|에러)\s*수정",
+    re.IGNORECASE
+)
+# git revert 기본 메시지에서 되돌린 커밋 추출
+REVERT_PATTERN = re.compile(r"This reverts commit ([0-9a-fA-F]{40})")
+# 수정 커밋이 지운 줄 중 이보다 짧은 줄("}", "else:" 등)은 유입 커밋 추적에 쓰지 않음
+MIN_BLAME_LINE = 4
+
+
+def is_fix_message(message: str) -> bool:
+    return bool(FIX_PATTERN.search(message or ""))
+
+
+def changed_lines(patch: str, kind: str) -> Set[str]:
+    """patch에서 추가(ADDED) 또는 삭제(REMOVED)된 줄 (앞뒤 공백 제거, 짧은 줄 제외)"""
+    lines = set()
+    for line_kind, content in classify_lines(iter_lines(patch)):
+        if line_kind == kind:
+            content = content.strip()
+            if len(content) >= MIN_BLAME_LINE:
+                lines.add(content)
+    return lines
+
+
+def directory_prefixes(path: str) -> List[str]:
+    """'a/b/c.py' → ['a/', 'a/b/']"""
+    parts = path.split("/")[:-1]
+    return ["/".join(parts[:depth]) + "/" for depth in range(1, len(parts) + 1)]
+
+
+class CommitRecord:
+    """
+    인덱스에 저장되는 커밋 하나 (파일은 (경로 id, 추가 줄 수, 삭제 줄 수))
+    failed: 문제를 유입한 커밋 (이후 revert됐거나 수정 커밋이 고친 줄을 마지막으로 추가)
+    fix: 메시지가 수정/되돌림 성격인 커밋 (실패 라벨과 별개)
+    """
+    __slots__ = ("sha", "timestamp", "subject", "failed", "fix", "files")
+
+    def __init__(
+        self,
+        sha: str,
+        timestamp: float,
+        subject: str,
+        failed: bool,
+        files: List[Tuple[int, int, int]],
+        fix: bool = False
+    ):
+        self.sha = sha
+        self.timestamp = timestamp
+        self.subject = subject
+        self.failed = failed
+        self.fix = fix
+        self.files = files
+
+
+class HistoryIndex:
+    """
+    저장소 하나의 커밋 이력 인덱스
+    - 파일 경로 / 디렉터리 prefix별 변경 커밋 수, churn(추가+삭제 줄 수), 실패 커밋 수 집계
+    - 경로는 정수 id로 바꿔 배열로 관리하므로 위험도 조회는 dict 조회 + 배열 접근만으로 끝남
+    - 실패 라벨(SZZ 방식): 이후 커밋에서 revert됐거나, 수정 커밋이 지운 줄을 마지막으로 추가한 커밋
+      (최신 커밋부터 수집하므로 수정 커밋의 삭제 줄을 기다렸다가 그 줄을 추가한 더 오래된 커밋에 라벨링,
+       patch가 없거나 추가만 한 수정은 그 파일을 마지막으로 바꾼 커밋에 라벨링)
+    - 수정 커밋 자체는 실패가 아니라 fix 플래그로만 기록
+    - 파일 조합별 동시 변경/실패 횟수는 CoChangeMatrix(희소 행렬)로 함께 관리
+    - 디스크에는 추가 전용 JSON Lines 로그로 저장해 새로 수집한 커밋만 덧붙임
+    """
+
+    # 변경 이력이 적은 경로의 실패율을 저장소 평균 쪽으로 당기는 가중치 (가상 커밋 수)
+    PRIOR_WEIGHT = 5.0
+
+    def __init__(self, log_path: str = "", cochange_max_files: int = 50):
+        self.log_path = log_path
+        self.legacy_reset = False
+        self._reset(cochange_max_files)
+
+        if log_path and os.path.exists(log_path):
+            if not self._load():
+                # 이전 형식 로그는 라벨을 다시 매길 수 없으므로 보관해 두고 처음부터 다시 수집
+                logger.warning(f"이전 형식의 이력 로그를 다시 수집합니다 (기존 로그: {log_path}.legacy)")
+                os.replace(log_path, log_path + ".legacy")
+                self._reset(cochange_max_files)
+                self.legacy_reset = True
+            self.cochange.compact()
+
+    def _reset(self, cochange_max_files: int):
+        self.head: Optional[str] = None  # 마지막 수집 시점의 최신 커밋
+        self.commits: Dict[str, CommitRecord] = {}
+        self.total_failures = 0
+
+        self.path_ids: Dict[str, int] = {}
+        self.paths: List[str] = []
+        # 경로 id별 집계 배열
+        self.path_commits: List[int] = []
+        self.path_churn: List[int] = []
+        self.path_failures: List[int] = []
+        # 디렉터리 prefix별 [변경 커밋 수, churn, 실패 커밋 수]
+        self.dir_stats: Dict[str, List[int]] = {}
+        self.cochange = CoChangeMatrix(max_files=cochange_max_files)
+
+        self._pending_reverts = set()  # 아직 수집하지 않은 (더 오래된) revert 대상
+        # 아직 유입 커밋을 찾지 못한 수정: 경로 → {수정 커밋이 지운 줄: 수정 커밋}, 경로 → 수정 커밋(파일 단위)
+        self._pending_lines: Dict[str, Dict[str, str]] = {}
+        self._pending_files: Dict[str, str] = {}
+        self._log_buffer: List[str] = []
+
+    # ----- 수집 -----
+    def add_commit(
+        self,
+        sha: str,
+        timestamp: float,
+        message: str,
+        files: Iterable[Tuple[str, int, int]],
+        patches: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """
+        커밋 하나 반영 (이미 있으면 False) - 최신 커밋부터 순서대로 호출
+        patches: 경로별 patch (있으면 줄 단위로 유입 커밋 추적, 없으면 파일 단위)
+        """
+        if sha in self.commits:
+            return False
+        files = [(path, additions, deletions) for path, additions, deletions in files]
+        patches = patches or {}
+        revert_match = REVERT_PATTERN.search(message or "")
+        fix = is_fix_message(message)
+        self._add(
+            sha,
+            timestamp,
+            (message or "").split("\n", 1)[0],
+            self._introduced_fixed_lines(files, patches),
+            files,
+            revert_match.group(1).lower() if revert_match else None,
+            log=True,
+            fix=fix
+        )
+        if fix:
+            self._wait_for_introducers(sha, files, patches)
+        return True
+
+    def needs_patches(self, message: str, paths: Iterable[str]) -> bool:
+        """줄 단위 추적에 이 커밋의 patch가 필요한지 (수정 커밋이거나 유입 커밋을 기다리는 파일을 바꿈)"""
+        return is_fix_message(message) or any(path in self._pending_lines for path in paths)
+
+    def _introduced_fixed_lines(self, files: List[Tuple[str, int, int]], patches: Dict[str, str]) -> bool:
+        """이 커밋이 이후 수정 커밋이 고친 줄/파일을 마지막으로 바꿨는지 (찾은 항목은 대기 목록에서 제거)"""
+        introduced = False
+        for path, _, _ in files:
+            if self._pending_files.pop(path, None) is not None:
+                introduced = True
+            pending = self._pending_lines.get(path)
+            if pending is None:
+                continue
+            patch = patches.get(path)
+            if patch is None:
+                # patch가 없으면 줄을 비교할 수 없으므로 파일 단위로 판단
+                del self._pending_lines[path]
+                introduced = True
+                continue
+            matched = pending.keys() & changed_lines(patch, ADDED)
+            if matched:
+                introduced = True
+                for line in matched:
+                    del pending[line]
+                if not pending:
+                    del self._pending_lines[path]
+        return introduced
+
+    def _wait_for_introducers(self, sha: str, files: List[Tuple[str, int, int]], patches: Dict[str, str]):
+        """수정 커밋이 지운 줄을 더 오래된 커밋에서 찾도록 등록 (지운 줄이 없으면 파일 단위)"""
+        for path, _, _ in files:
+            patch = patches.get(path)
+            removed = changed_lines(patch, REMOVED) if patch is not None else set()
+            if removed:
+                pending = self._pending_lines.setdefault(path, {})
+                for line in removed:
+                    pending.setdefault(line, sha)
+            else:
+                self._pending_files.setdefault(path, sha)
+
+    def resolve_pending(self):
+        """
+        수집이 끝난 뒤 아직 유입 커밋을 찾지 못한 수정 처리 (이미 인덱스에 있던 커밋이 대상인 경우 등)
+        - 수정 커밋보다 이전 커밋 중 그 파일을 마지막으로 바꾼 커밋을 실패로 라벨링
+        """
+        fixes: Dict[int, Set[str]] = {}
+        for path, pending in self._pending_lines.items():
+            fixes.setdefault(self._path_id(path), set()).update(pending.values())
+        for path, fix_sha in self._pending_files.items():
+            fixes.setdefault(self._path_id(path), set()).add(fix_sha)
+        self._pending_lines.clear()
+        self._pending_files.clear()
+        if not fixes:
+            return
+
+        # (경로 id, 수정 커밋) → 그 이전에 경로를 마지막으로 바꾼 커밋
+        latest: Dict[Tuple[int, str], CommitRecord] = {}
+        for record in self.commits.values():
+            for path_id, _, _ in record.files:
+                for fix_sha in fixes.get(path_id, ()):
+                    fix = self.commits.get(fix_sha)
+                    if fix is None or record.sha == fix_sha or record.timestamp > fix.timestamp:
+                        continue
+                    current = latest.get((path_id, fix_sha))
+                    if current is None or record.timestamp > current.timestamp:
+                        latest[(path_id, fix_sha)] = record
+        for record in {record.sha: record for record in latest.values()}.values():
+            self._mark_failed(record)
+            self._log_buffer.append(json.dumps({"failed": record.sha}))
+
+    def add_labeled_commit(
+        self,
+        sha: str,
+        timestamp: float,
+        subject: str,
+        failed: bool,
+        files: List[Tuple[str, int, int]],
+        fix: bool = False
+    ):
+        """라벨이 이미 정해진 커밋 반영 (학습 데이터 재구성용, 로그에 기록하지 않음)"""
+        if sha not in self.commits:
+            self._add(sha, timestamp, subject, failed, files, None, log=False, fix=fix)
+
+    def set_head(self, sha: str):
+        self.head = sha
+        self._log_buffer.append(json.dumps({"head": sha}))
+
+    def _add(
+        self,
+        sha: str,
+        timestamp: float,
+        subject: str,
+        failed: bool,
+        files: List[Tuple[str, int, int]],
+        reverts: Optional[str],
+        log: bool,
+        fix: bool = False
+    ):
+        failed = failed or sha in self._pending_reverts
+        self._pending_reverts.discard(sha)
+        record = CommitRecord(
+            sha, timestamp, subject, failed,
+            [(self._path_id(path), additions, deletions) for path, additions, deletions in files],
+            fix
+        )
+        self.commits[sha] = record
+
+        directories = {}
+        for path_id, additions, deletions in record.files:
+            churn = additions + deletions
+            self.path_commits[path_id] += 1
+            self.path_churn[path_id] += churn
+            for prefix in directory_prefixes(self.paths[path_id]):
+                directories[prefix] = directories.get(prefix, 0) + churn
+        # 디렉터리는 커밋당 한 번만 셈
+        for prefix, churn in directories.items():
+            stats = self.dir_stats.get(prefix)
+            if stats is None:
+                stats = self.dir_stats[prefix] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += churn
+        if failed:
+            self._count_failure(record)
+        self.cochange.add_commit((path_id for path_id, _, _ in record.files), failed)
+
+        if reverts:
+            target = self.commits.get(reverts)
+            if target is None:
+                self._pending_reverts.add(reverts)
+            else:
+                self._mark_failed(target)
+
+        if log:
+            entry = {"c": sha, "t": timestamp, "s": subject, "f": failed, "x": fix, "files": files}
+            if reverts:
+                entry["r"] = reverts
+            self._log_buffer.append(json.dumps(entry, ensure_ascii=False))
+
+    def _path_id(self, path: str) -> int:
+        path_id = self.path_ids.get(path)
+        if path_id is None:
+            path_id = self.path_ids[path] = len(self.paths)
+            self.paths.append(path)
+            self.path_commits.append(0)
+            self.path_churn.append(0)
+            self.path_failures.append(0)
+        return path_id
+
+    def _mark_failed(self, record: CommitRecord):
+        """이미 반영한 커밋을 나중에 실패로 라벨링 (revert 대상, 수정 커밋의 유입 커밋)"""
+        if record.failed:
+            return
+        record.failed = True
+        self._count_failure(record)
+        self.cochange.mark_failed(path_id for path_id, _, _ in record.files)
+
+    def _count_failure(self, record: CommitRecord):
+        self.total_failures += 1
+        directories = set()
+        for path_id, _, _ in record.files:
+            self.path_failures[path_id] += 1
+            directories.update(directory_prefixes(self.paths[path_id]))
+        for prefix in directories:
+            self.dir_stats[prefix][2] += 1
+
+    # ----- 조회 -----
+    def failure_rate(self, failures: int, commits: int) -> float:
+        """저장소 평균 실패율을 사전분포로 둔 평활화 실패율"""
+        prior = self.total_failures / len(self.commits) if self.commits else 0.0
+        return (failures + prior * self.PRIOR_WEIGHT) / (commits + self.PRIOR_WEIGHT)
+
+    def path_risk(self, path: str) -> Dict[str, Any]:
+        """
+        경로 하나의 위험도
+        - 이력이 있는 파일이면 파일 기준, 새 파일이면 가장 깊은 디렉터리 prefix 기준
+        """
+        path_id = self.path_ids.get(path)
+        if path_id is not None:
+            scope = path
+            commits = self.path_commits[path_id]
+            churn = self.path_churn[path_id]
+            failures = self.path_failures[path_id]
+        else:
+            scope, commits, churn, failures = None, 0, 0, 0
+            for prefix in reversed(directory_prefixes(path)):
+                stats = self.dir_stats.get(prefix)
+                if stats is not None:
+                    scope = prefix
+                    commits, churn, failures = stats
+                    break
+        return {
+            "path": path,
+            "scope": scope,
+            "commits": commits,
+            "churn": churn,
+            "failures": failures,
+            "risk": round(self.failure_rate(failures, commits), 4)
+        }
+
+    def co_changed(self, path: str, k: int = 5, changed: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        파일과 자주 함께 바뀐 파일 top-k와 그 조합의 실패 이력
+        - confidence: 이 파일이 바뀐 커밋 중 상대 파일도 함께 바뀐 비율
+        - in_commit: changed(이번 커밋 변경 파일)에 포함됐는지 - False면 함께 바꾸던 파일이 빠진 것
+        """
+        path_id = self.path_ids.get(path)
+        if path_id is None:
+            return []
+        changed = set(changed)
+        return [
+            {
+                "path": self.paths[other_id],
+                "commits": commits,
+                "confidence": round(commits / total, 4) if total else 0.0,
+                "failures": failures,
+                "failure_rate": round(self.failure_rate(failures, commits), 4),
+                "in_commit": self.paths[other_id] in changed
+            }
+            for other_id, commits, failures, total in self.cochange.top_k(path_id, k)
+        ]
+
+    def assess(self, paths: Iterable[str], k: int = 5) -> Dict[str, Any]:
+        """변경 파일 목록 전체의 경로 위험도 (위험도 높은 순) + 파일별 동시 변경 top-k"""
+        paths = list(paths)
+        files = sorted((self.path_risk(path) for path in paths), key=lambda item: item["risk"], reverse=True)
+        co_changes = {}
+        for path in paths:
+            companions = self.co_changed(path, k, paths)
+            if companions:
+                co_changes[path] = companions
+        return {
+            "indexed_commits": len(self.commits),
+            "baseline_risk": round(self.failure_rate(0, 0), 4),
+            "max_risk": files[0]["risk"] if files else 0.0,
+            "files": files,
+            "co_changes": co_changes
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "commits": len(self.commits),
+            "failed_commits": self.total_failures,
+            "fix_commits": sum(1 for record in self.commits.values() if record.fix),
+            "paths": len(self.paths),
+            "directories": len(self.dir_stats),
+            "head": self.head,
+            "cochange": self.cochange.stats()
+        }
+
+    # ----- 저장 -----
+    def take_log(self) -> List[str]:
+        """디스크에 아직 쓰지 않은 로그 줄 (이벤트 루프에서 꺼낸 뒤 별도 스레드에서 write_log)"""
+        lines, self._log_buffer = self._log_buffer, []
+        return lines
+
+    def write_log(self, lines: List[str]):
+        if not self.log_path or not lines:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write("\n".join(lines) + "\n")
+
+    def _load(self) -> bool:
+        """로그 재생 (수정 커밋 메시지를 실패 라벨로 쓰던 이전 형식이면 False)"""
+        with open(self.log_path, encoding="utf-8") as log_file:
+            for line in log_file:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 쓰는 도중 중단된 마지막 줄
+                if "head" in entry:
+                    self.head = entry["head"]
+                elif "failed" in entry:
+                    record = self.commits.get(entry["failed"])
+                    if record is not None:
+                        self._mark_failed(record)
+                elif "x" not in entry:
+                    return False
+                elif entry["c"] not in self.commits:
+                    self._add(
+                        entry["c"], entry["t"], entry["s"], entry["f"],
+                        [tuple(file) for file in entry["files"]],
+                        entry.get("r"),
+                        log=False,
+                        fix=entry["x"]
+                    )
+        return True
+
+
+def format_history_for_prompt(assessment: Optional[Dict[str, Any]], max_files: int = 5, max_pairs: int = 8) -> str:
+    """assess() 결과를 프롬프트에 넣을 요약 텍스트로 변환 (이력이 없으면 빈 문자열)"""
+    if not assessment or not assessment["indexed_commits"]:
+        return ""
+    lines = [
+        f"- 수집된 커밋 {assessment['indexed_commits']}개, 저장소 평균 실패율 {assessment['baseline_risk'] * 100:.1f}%"
+    ]
+    prediction = assessment.get("prediction")
+    if prediction:
+        lines.append(
+            f"- 이력 기반 예측 모델: 빌드 성공 확률 {prediction['success_probability'] * 100:.0f}% "
+            f"({prediction['grade']})"
+        )
+    for item in assessment["files"][:max_files]:
+        if item["scope"] is None:
+            lines.append(f"- {item['path']}: 이력 없음 (신규 경로)")
+        else:
+            scope = "" if item["scope"] == item["path"] else f" ({item['scope']} 기준)"
+            lines.append(
+                f"- {item['path']}{scope}: 변경 {item['commits']}회, 실패 {item['failures']}회, "
+                f"실패율 {item['risk'] * 100:.1f}%"
+            )
+
+    # 실패율이 높은 조합부터, 평소 함께 바뀌던 파일이 빠진 경우 표시
+    pairs, seen = [], set()
+    for path, companions in assessment.get("co_changes", {}).items():
+        for companion in companions:
+            key = frozenset((path, companion["path"]))
+            if key not in seen:  # 둘 다 이번 커밋에 포함된 조합은 한 번만
+                seen.add(key)
+                pairs.append((path, companion))
+    pairs.sort(key=lambda pair: (pair[1]["failure_rate"], pair[1]["confidence"]), reverse=True)
+    if pairs:
+        lines.append("- 동시 수정 파일 조합:")
+    for path, companion in pairs[:max_pairs]:
+        presence = "이번 커밋에 포함" if companion["in_commit"] else "이번 커밋에서 누락"
+        lines.append(
+            f"  - {path} ↔ {companion['path']}: 함께 변경 {companion['commits']}회 "
+            f"(동반율 {companion['confidence'] * 100:.0f}%), 그중 실패 {companion['failures']}회 "
+            f"(실패율 {companion['failure_rate'] * 100:.1f}%), {presence}"
+        )
+
+    similar = assessment.get("similar_failures") or []
+    if similar:
+        lines.append("- 변경 내용이 비슷한 과거 실패 커밋:")
+    for item in similar:
+        lines.append(f"  - {item['sha'][:7]} \"{item['subject']}\" (유사도 {item['similarity'] * 100:.0f}%)")
+    return "\n".join(lines)
@@ -0,0 +1,258 @@
+# backend/services/history_miner.py
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Optional, Dict, Any
+
+from services.commit_source import CommitSource
+from services.history_index import HistoryIndex
+from services.failure_similarity import FailureSimilarityIndex
+from services.commit_risk_model import CommitRiskModel, train_from_history
+from services.github_rate_limiter import PRIORITY_BULK
+from services.single_flight import SingleFlight
+from models.github_models import GitHubConfig, CommitDetailResponse
+
+logger = logging.getLogger(__name__)
+
+
+def repository_key(owner: str, repo: str) -> str:
+    return f"{owner}/{repo}".lower()
+
+
+class HistoryMiner:
+    """
+    저장소별 이력 인덱스 관리 및 수집 작업 실행
+    - 수집은 CommitSource(GitHub API 또는 로컬 clone)의 전체 히스토리를 최신 커밋부터 순회
+    - 두 번째 수집부터는 이전 수집의 최신 커밋에 도달하면 멈추므로 새 커밋만 처리
+    - 같은 저장소의 수집 요청이 겹치면 하나의 작업으로 병합
+    - 실패로 라벨링된 커밋은 patch까지 조회해 유사도 검색 인덱스(FailureSimilarityIndex)에 추가
+    - 새 커밋이 들어오면 빌드 성공 확률 예측 모델(CommitRiskModel)을 다시 학습
+    """
+
+    def __init__(
+        self,
+        index_dir: str = "",
+        checkpoint_every: int = 500,
+        cochange_max_files: int = 50,
+        fetch_concurrency: int = 8
+    ):
+        self.index_dir = index_dir
+        self.checkpoint_every = checkpoint_every
+        self.cochange_max_files = cochange_max_files
+        self.fetch_concurrency = fetch_concurrency
+        self._indexes: Dict[str, HistoryIndex] = {}
+        self._similarity: Dict[str, FailureSimilarityIndex] = {}
+        self._models: Dict[str, CommitRiskModel] = {}
+        self._jobs = SingleFlight()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._background = set()
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+
+    def load(self):
+        """저장된 인덱스 로그 전체 읽기 (시작 시 한 번, 별도 스레드에서 호출)"""
+        if not self.index_dir:
+            return
+        for filename in os.listdir(self.index_dir):
+            if filename.endswith(".jsonl"):
+                owner, _, repo = filename[:-len(".jsonl")].partition("__")
+                key = repository_key(owner, repo)
+                index = self._indexes[key] = HistoryIndex(
+                    os.path.join(self.index_dir, filename), self.cochange_max_files
+                )
+                if index.legacy_reset:
+                    # 이전 라벨(수정 커밋 = 실패)로 만든 유사도 인덱스/모델은 다시 수집할 때 새로 만듦
+                    shutil.rmtree(self._path_for(owner, repo, ".minhash"), ignore_errors=True)
+                self._similarity[key] = FailureSimilarityIndex(self._path_for(owner, repo, ".minhash"))
+                model = None if index.legacy_reset else CommitRiskModel.load(self._path_for(owner, repo, ".model.npz"))
+                if model is not None:
+                    self._models[key] = model
+                logger.info(f"이력 인덱스 로드: {key} ({len(self._indexes[key].commits)}개 커밋)")
+
+    def get(self, owner: str, repo: str) -> Optional[HistoryIndex]:
+        """수집된 인덱스 조회 (없으면 None)"""
+        return self._indexes.get(repository_key(owner, repo))
+
+    def similarity(self, owner: str, repo: str) -> Optional[FailureSimilarityIndex]:
+        """과거 실패 커밋 유사도 인덱스 조회 (없으면 None)"""
+        return self._similarity.get(repository_key(owner, repo))
+
+    def model(self, owner: str, repo: str) -> Optional[CommitRiskModel]:
+        """학습된 빌드 성공 확률 예측 모델 조회 (없으면 None)"""
+        return self._models.get(repository_key(owner, repo))
+
+    def _path_for(self, owner: str, repo: str, suffix: str) -> str:
+        if not self.index_dir:
+            return ""
+        return os.path.join(self.index_dir, f"{owner}__{repo}{suffix}".lower())
+
+    def _index_for(self, owner: str, repo: str) -> HistoryIndex:
+        key = repository_key(owner, repo)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = HistoryIndex(
+                self._path_for(owner, repo, ".jsonl"), self.cochange_max_files
+            )
+            self._similarity[key] = FailureSimilarityIndex(self._path_for(owner, repo, ".minhash"))
+        return index
+
+    async def ingest(self, source: CommitSource, config: GitHubConfig) -> Dict[str, Any]:
+        """커밋 이력 수집 (진행 중인 같은 저장소 수집이 있으면 그 결과를 기다림)"""
+        key = repository_key(config.owner, config.repo)
+        return await self._jobs.do(key, lambda: self._ingest(source, config))
+
+    def start(self, source: CommitSource, config: GitHubConfig) -> bool:
+        """백그라운드 수집 시작 (이미 진행 중이면 False)"""
+        if self.is_running(config.owner, config.repo):
+            return False
+        task = asyncio.ensure_future(self.ingest(source, config))
+        self._background.add(task)
+        # 결과/오류는 status()로 확인하므로 여기서는 소비만 함
+        task.add_done_callback(lambda t: (self._background.discard(t), t.cancelled() or t.exception()))
+        return True
+
+    def is_running(self, owner: str, repo: str) -> bool:
+        return self._jobs.get(repository_key(owner, repo)) is not None
+
+    async def _ingest(self, source: CommitSource, config: GitHubConfig) -> Dict[str, Any]:
+        key = repository_key(config.owner, config.repo)
+        index = self._index_for(config.owner, config.repo)
+        status = self._status[key] = {
+            "state": "running",
+            "started_at": time.time(),
+            "ingested": 0,
+            "failures_indexed": 0,
+            "error": None
+        }
+        new_head = None
+        try:
+            async for detail in source.iter_commit_details(config, stop_at=index.head):
+                if new_head is None:
+                    new_head = detail.sha
+                if detail.sha in index.commits:
+                    continue
+                patches = await self._patches(source, config, index, detail)
+                added = index.add_commit(
+                    detail.sha,
+                    detail.commit.committer.date.timestamp(),
+                    detail.commit.message,
+                    ((file.filename, file.additions, file.deletions) for file in detail.files),
+                    patches
+                )
+                if added:
+                    status["ingested"] += 1
+                    if status["ingested"] % self.checkpoint_every == 0:
+                        await asyncio.to_thread(index.write_log, index.take_log())
+            # 중간에 실패하면 head를 갱신하지 않으므로 다음 수집이 처음부터 다시 확인 (중복 커밋은 무시)
+            index.resolve_pending()
+            if new_head is not None:
+                index.set_head(new_head)
+            index.cochange.compact()
+            await self._index_failures(source, config, index, self._similarity[key], status)
+            if status["ingested"] or key not in self._models:
+                await self._train(config.owner, config.repo, index)
+            status["state"] = "done"
+        except Exception as e:
+            logger.error(f"이력 수집 실패 ({key}): {str(e)}")
+            status["state"] = "failed"
+            status["error"] = str(e)
+            raise
+        finally:
+            status["finished_at"] = time.time()
+            await asyncio.to_thread(index.write_log, index.take_log())
+        return self.status(config.owner, config.repo)
+
+    async def _patches(
+        self,
+        source: CommitSource,
+        config: GitHubConfig,
+        index: HistoryIndex,
+        detail: CommitDetailResponse
+    ) -> Dict[str, str]:
+        """
+        실패 라벨링(수정 커밋이 지운 줄의 유입 커밋 추적)에 쓸 파일별 patch
+        로컬 git 순회처럼 patch 없이 받은 커밋은 필요한 커밋(수정 커밋, 추적 중인 파일을 바꾼 커밋)만 다시 조회
+        """
+        patches = {file.filename: file.patch for file in detail.files if file.patch}
+        if patches or not index.needs_patches(detail.commit.message, (file.filename for file in detail.files)):
+            return patches
+        try:
+            detail = await source.get_commit_detail(config, detail.sha, priority=PRIORITY_BULK)
+        except Exception as e:
+            logger.warning(f"커밋 {detail.sha} patch 조회 실패, 파일 단위로 라벨링합니다: {str(e)}")
+            return {}
+        return {file.filename: file.patch for file in detail.files if file.patch}
+
+    async def _index_failures(
+        self,
+        source: CommitSource,
+        config: GitHubConfig,
+        index: HistoryIndex,
+        similarity: FailureSimilarityIndex,
+        status: Dict[str, Any]
+    ):
+        """유사도 인덱스에 아직 없는 실패 커밋의 patch를 조회해 추가 (revert로 나중에 라벨링된 커밋 포함)"""
+        shas = [
+            sha for sha, record in index.commits.items()
+            if record.failed and not similarity.contains(sha)
+        ]
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def fetch(sha: str):
+            async with semaphore:
+                try:
+                    return await source.get_commit_detail(config, sha, priority=PRIORITY_BULK)
+                except Exception as e:
+                    logger.warning(f"실패 커밋 {sha} 조회 실패: {str(e)}")
+                    return None
+
+        for detail in asyncio.as_completed([fetch(sha) for sha in shas]):
+            detail = await detail
+            if detail is None:
+                continue
+            diff = "\n".join(
+                f"=== {file.filename} ===\n{file.patch}" for file in detail.files if file.patch
+            )
+            if similarity.add(
+                detail.sha,
+                detail.commit.message.split("\n", 1)[0],
+                [file.filename for file in detail.files],
+                diff
+            ):
+                status["failures_indexed"] += 1
+        await asyncio.to_thread(similarity.save)
+
+    async def _train(self, owner: str, repo: str, index: HistoryIndex):
+        """예측 모델 재학습 (학습 중에도 기존 모델로 계속 예측)"""
+        model = await asyncio.to_thread(train_from_history, index)
+        if model is None:
+            return  # 실패/성공 커밋이 아직 충분하지 않음
+        path = self._path_for(owner, repo, ".model.npz")
+        if path:
+            await asyncio.to_thread(model.save, path)
+        self._models[repository_key(owner, repo)] = model
+        logger.info(f"예측 모델 학습 완료 ({repository_key(owner, repo)}): {model.metrics}")
+
+    def status(self, owner: str, repo: str) -> Dict[str, Any]:
+        key = repository_key(owner, repo)
+        index = self._indexes.get(key)
+        return {
+            "repository": key,
+            "job": self._status.get(key),
+            "index": index.stats() if index is not None else None,
+            "similarity": self._similarity[key].stats() if key in self._similarity else None,
+            "model": self._models[key].metrics if key in self._models else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            key: {
+                **index.stats(),
+                "similarity": self._similarity[key].stats(),
+                "model": self._models[key].metrics if key in self._models else None,
+                "running": self._jobs.get(key) is not None
+            }
+            for key, index in self._indexes.items()
+        }
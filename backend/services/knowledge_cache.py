@@ -0,0 +1,78 @@
+# backend/services/knowledge_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class KnowledgeCache:
+    """
+    감지된 API 패턴 조합 → 포맷팅된 RAG 지식 캐시 (TTL + LRU)
+    - 패턴 조합 수가 적어 같은 검색이 반복되므로 검색/포맷팅 결과를 그대로 재사용
+    - TTL이 지나면 다시 검색 (인덱서가 문서를 갱신한 경우 대비)
+    - 인덱스를 다시 빌드하면 invalidate()로 전체 삭제, 진행 중이던 검색 결과는 저장하지 않음(세대 비교)
+    - 인덱스 재빌드(/rag/reload)는 스레드에서 실행되므로 잠금으로 보호
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: str, generation: int):
+        """조회 시점의 세대(generation)가 그대로일 때만 저장"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """인덱스 재빌드 시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "capacity": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,122 @@
+# backend/services/knowledge_chunks.py
+import re
+from typing import Any, Dict, List
+
+from services.token_counter import count_tokens
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+# 섹션 제목에 포함되면 점수에 곱하는 가중치 (치명적 위험 우선, 식별 패턴은 감지에 이미 쓰였으므로 후순위)
+SECTION_WEIGHTS = (("치명적", 1.5), ("API 식별 패턴", 0.2))
+# 최고 점수 대비 이 비율보다 낮은 섹션은 관련 없는 것으로 보고 제외
+MIN_RELATIVE_SCORE = 0.3
+# 섹션 점수 중 문서 관련도(문서 내 최고 섹션 점수) 비중 - 검색어는 API 이름이라 섹션 본문보다 문서가 중요
+DOCUMENT_WEIGHT = 0.7
+
+
+def split_sections(filename: str, content: str) -> List[Dict[str, Any]]:
+    """
+    마크다운 문서를 제목 단위 섹션으로 분할
+    - 각 섹션: filename, title(# 문서 제목), section(## > ### 경로), content(본문), order(문서 내 순서)
+    - 본문이 없는 상위 제목("## 주요 주의사항")은 하위 섹션 경로에만 남김
+    - 제목이 없는 문서는 전체를 한 섹션으로 취급
+    """
+    chunks: List[Dict[str, Any]] = []
+    title = ""
+    trail: List[tuple] = []
+    body: List[str] = []
+
+    def flush():
+        text = "\n".join(line for line in body if line.strip() != "---").strip()
+        if text:
+            chunks.append({
+                "filename": filename,
+                "title": title,
+                "section": " > ".join(heading for _, heading in trail),
+                "content": text,
+                "order": len(chunks)
+            })
+        body.clear()
+
+    for line in content.splitlines():
+        match = HEADING_PATTERN.match(line)
+        if match is None:
+            body.append(line)
+            continue
+        flush()
+        level, heading = len(match.group(1)), match.group(2)
+        if level == 1:
+            title, trail = heading, []
+        else:
+            trail = [(depth, name) for depth, name in trail if depth < level] + [(level, heading)]
+    flush()
+    return chunks
+
+
+def index_text(chunk: Dict[str, Any]) -> str:
+    """검색용 텍스트 - 문서 제목과 섹션 경로를 포함해 문서 단위 검색어도 섹션에 걸리도록"""
+    return "\n".join(filter(None, [chunk.get("title", ""), chunk.get("section", ""), chunk["content"]]))
+
+
+def section_weight(section: str) -> float:
+    for keyword, weight in SECTION_WEIGHTS:
+        if keyword in section:
+            return weight
+    return 1.0
+
+
+def format_chunk(chunk: Dict[str, Any]) -> str:
+    if chunk.get("section"):
+        return f"**{chunk['section']}**\n{chunk['content']}\n"
+    return f"{chunk['content']}\n"
+
+
+def relative_scores(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    검색어 하나의 결과(점수 내림차순)를 0~1로 정규화
+    점수 = 문서 관련도와 섹션 자체 점수의 가중 평균 (관련 문서의 섹션은 본문에 검색어가 없어도 상위 유지)
+    """
+    if not results or results[0]["score"] <= 0:
+        return []
+    best = results[0]["score"]
+    document_best: Dict[str, float] = {}
+    for chunk in results:
+        document_best.setdefault(chunk["filename"], chunk["score"])
+    return [
+        dict(
+            chunk,
+            score=(DOCUMENT_WEIGHT * document_best[chunk["filename"]] + (1 - DOCUMENT_WEIGHT) * chunk["score"]) / best
+        )
+        for chunk in results
+    ]
+
+
+def pack_chunks(chunks: List[Dict[str, Any]], max_tokens: int) -> List[Dict[str, Any]]:
+    """
+    점수(섹션 가중치 반영) 높은 섹션부터 토큰 예산 안에 채워 넣기
+    - 예산을 넘는 섹션은 건너뛰고 더 작은 다음 섹션을 계속 시도
+    - 결과는 문서(가장 높은 섹션 순) → 문서 내 원래 순서로 정렬해 읽기 쉽게 구성
+    """
+    ranked = sorted(
+        (dict(chunk, score=chunk["score"] * section_weight(chunk.get("section", ""))) for chunk in chunks),
+        key=lambda chunk: chunk["score"],
+        reverse=True
+    )
+    if not ranked or ranked[0]["score"] <= 0:
+        return []
+
+    floor = ranked[0]["score"] * MIN_RELATIVE_SCORE
+    packed: List[Dict[str, Any]] = []
+    used = 0
+    for chunk in ranked:
+        if chunk["score"] < floor:
+            break
+        tokens = count_tokens(format_chunk(chunk))
+        if used + tokens > max_tokens:
+            continue
+        packed.append(chunk)
+        used += tokens
+
+    document_rank: Dict[str, int] = {}
+    for chunk in packed:
+        document_rank.setdefault(chunk["filename"], len(document_rank))
+    return sorted(packed, key=lambda chunk: (document_rank[chunk["filename"]], chunk.get("order", 0)))
@@ -1,131 +1,610 @@
 # backend/services/llm_service.py
 import os
-from openai import AzureOpenAI
+import asyncio
+from openai import AsyncAzureOpenAI
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Dict, AsyncIterator, Awaitable, Optional
+from config import settings
 from services.azure_rag_service import AzureRAGService
+from services.analysis_cache import AnalysisCache, make_cache_key
+from services.single_flight import SingleFlight, StreamBuffer
+from services.diff_chunker import split_diff
+from services.token_counter import count_tokens, count_message_tokens, add_usage, PromptTooLargeError
 
 # 환경변수 로드
 load_dotenv()
 
+# 프롬프트 템플릿이나 시스템 프롬프트를 바꾸면 올려서 기존 캐시 결과를 무효화
+PROMPT_TEMPLATE_VERSION = "2"
+
+RAG_SYSTEM_PROMPT = "당신은 전문적인 코드 리뷰어입니다. 코드 변경사항을 분석하고 상세한 피드백을 제공합니다. 제공된 API 가이드라인을 참고하여 더 정확한 분석을 제공하세요."
+CRITICAL_SYSTEM_PROMPT = "당신은 시니어 DevOps 엔지니어입니다. 코드 변경사항을 분석하여 빌드 실패, 배포 위험, 런타임 에러 등 치명적인 문제를 찾아내는 것이 주 임무입니다."
+
+# 프롬프트 고정 부분 (요청마다 바뀌는 데이터보다 앞에 두어 provider의 prompt prefix 캐시가 적중하도록 함)
+ANALYSIS_SECTIONS = {
+    "코드 품질": "코드의 가독성, 복잡도, 구조적 문제점을 분석해주세요.",
+    "보안 취약점": "보안상 취약점이나 위험한 패턴을 찾아 지적해주세요.",
+    "성능 최적화": "성능 개선 가능한 부분을 찾아 제안해주세요.",
+    "버그 탐지": "잠재적인 버그나 오류 가능성을 찾아주세요.",
+    "리팩토링 제안": "코드 구조 개선 및 리팩토링 방안을 제안해주세요."
+}
+
+RAG_ANALYSIS_GUIDE = """맨 아래의 코드 변경사항(파일명, 커밋 메시지, diff)을 분석 요청 항목에 따라 분석해주세요.
+
+**API 가이드라인이 함께 제공되면 반드시 참고하여 해당 API 사용 시 주의사항을 중점적으로 분석해주세요.**
+
+**응답 형식:**
+다음 마크다운 형식으로 응답해주세요:
+
+## 🔍 코드 분석 결과
+
+### 📚 관련 API 가이드라인 요약
+(제공된 가이드라인 중 이번 변경과 관련된 내용만 요약, 가이드라인이 없으면 생략)
+
+### 📊 전체 요약
+- 간단한 변경사항 요약
+
+### 🎯 상세 분석
+(요청된 분석 항목들에 대한 상세 내용)
+
+### ⚠️ 발견된 이슈
+1. 이슈 1
+2. 이슈 2
+
+### 💡 개선 제안
+1. 제안 1
+2. 제안 2
+
+### 📈 점수 (10점 만점)
+- 전체 품질: X/10
+- 보안성: X/10
+- 성능: X/10
+
+한국어로 전문적이고 구체적으로 분석해주세요."""
+
+CRITICAL_ANALYSIS_GUIDE = """맨 아래의 커밋 변경사항을 분석하여 **치명적인 오류 가능성**을 찾아주세요.
+
+**🚨 중점 분석 영역:**
+1. **빌드 실패 위험**: 컴파일 에러, 의존성 문제, 설정 오류
+2. **런타임 크래시**: NullPointer, 배열 오버플로우, 타입 에러
+3. **배포 위험**: 환경 설정, 데이터베이스 스키마, API 호환성
+4. **보안 취약점**: SQL 인젝션, XSS, 인증 우회, 개인정보 유출
+5. **성능 저하**: 무한루프, 메모리 누수, 대용량 처리 문제
+
+**응답 형식:**
+## 🚨 치명적 이슈 분석
+
+### ⚡ 위험도 평가
+- **전체 위험도**: 🔴 높음 | 🟡 중간 | 🟢 낮음
+- **빌드 성공률**: XX%
+- **배포 안전성**: 🔴 위험 | 🟡 주의 | 🟢 안전
+
+### 🔥 발견된 치명적 이슈
+1. **[이슈 유형]** 구체적인 문제점
+   - 발생 가능성: XX%
+   - 영향 범위: 설명
+   - 해결 방법: 구체적 수정안
+
+### ✅ 확인된 안전 요소
+- 안전하다고 판단되는 변경사항들
+
+### 🎯 즉시 조치 사항
+1. **우선순위 1**: 반드시 수정해야 할 사항
+2. **우선순위 2**: 배포 전 검토 필요
+
+### 📋 검증 체크리스트
+- [ ] 단위 테스트 통과 확인
+- [ ] 통합 테스트 실행
+- [ ] 스테이징 환경 배포 테스트
+- [ ] 성능 테스트 실행
+
+**Jenkins 빌드나 배포에서 문제가 발생할 가능성이 있다면 반드시 명시해주세요.**
+**소소한 성능 개선이나 코드 스타일은 무시하고, 오직 시스템을 망가뜨릴 수 있는 치명적 문제에만 집중해주세요.**"""
+
+# 분석 종류별 로그 라벨과 temperature (치명적 이슈 분석은 더 정확한 분석을 위해 낮춤)
+ANALYSIS_LABELS = {"rag": "RAG 강화", "critical": "치명적 이슈 분석"}
+ANALYSIS_TEMPERATURES = {"rag": 0.3, "critical": 0.1}
+
+# 프롬프트가 토큰 한도를 넘을 때 diff를 더 잘게 나누는 하한
+MIN_CHUNK_TOKENS = 500
+
+# 큰 diff를 나눠 분석한 부분 결과를 하나의 보고서로 합칠 때의 지시문
+REDUCE_INSTRUCTION = """아래 결과들은 하나의 커밋을 여러 부분으로 나눠 각각 분석한 것입니다.
+전체 커밋에 대한 하나의 보고서로 통합해주세요:
+- 부분 분석과 동일한 마크다운 형식(섹션 제목과 순서)을 그대로 사용
+- 중복된 이슈는 하나로 합치고, 부분 간 연관된 문제(예: 한 파일의 변경이 다른 파일을 깨뜨리는 경우)는 함께 서술
+- 위험도/점수/확률은 부분 결과 중 가장 심각한 판단을 기준으로 전체 커밋 관점에서 다시 평가
+- 부분 번호나 "부분 분석"이라는 표현은 결과에 드러내지 말 것
+한국어로 전문적이고 구체적으로 작성해주세요."""
+
 class AzureOpenAIService:
     def __init__(self):
         try:
-            self.client = AzureOpenAI(
+            # 비동기 클라이언트: 완성 대기 중에도 이벤트 루프를 막지 않음
+            self.client = AsyncAzureOpenAI(
                 azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
                 api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION")
+                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+                timeout=settings.llm_timeout
             )
             self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
             self.rag_service = AzureRAGService()  # RAG 서비스 초기화
+            # 워커당 동시에 진행할 LLM 호출 수 상한
+            self.llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+            # 동일 입력 재분석 방지용 결과 캐시
+            self.cache = AnalysisCache(
+                max_entries=settings.analysis_cache_size,
+                db_path=settings.analysis_cache_db,
+                max_disk_entries=settings.analysis_cache_disk_max
+            )
+            # 동일 분석의 동시 요청을 하나의 업스트림 호출로 병합
+            self.inflight = SingleFlight()
             print(f"Azure OpenAI 초기화 성공 - Deployment: {self.deployment}")
         except Exception as e:
             print(f"Azure OpenAI 초기화 실패: {e}")
             raise
     
-    def analyze_code(
+    async def analyze_code(
         self, 
         code_diff: str, 
         commit_message: str, 
         filename: str,
-        analysis_types: List[str]
+        analysis_types: List[str],
+        usage: Optional[Dict[str, int]] = None
     ) -> str:
         """
         일반적인 코드 분석 (더미 데이터용) + RAG 연동
+        usage: 넘기면 요청별 토큰 사용량(prompt_tokens, completion_tokens, llm_calls 등)을 누적
+        """
+        return await self._analyze("rag", code_diff, commit_message, filename, analysis_types, usage=usage)
+    
+    async def analyze_code_stream(
+        self, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        analyze_code의 스트리밍 버전 - 생성되는 토큰을 도착 즉시 전달
         """
+        async for delta in self._analyze_stream(
+            "rag", code_diff, commit_message, filename, analysis_types, usage=usage
+        ):
+            yield delta
+    
+    async def analyze_code_for_critical_issues(
+        self, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> str:
+        """
+        치명적 오류 탐지에 집중한 코드 분석 (실제 GitHub 데이터용, RAG 없음)
+        history_context: 커밋 이력 기반 경로 위험도/동시 수정 패턴 요약 (없으면 생략)
+        """
+        return await self._analyze(
+            "critical", code_diff, commit_message, filename, analysis_types, history_context, usage
+        )
+    
+    async def analyze_code_for_critical_issues_stream(
+        self, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        analyze_code_for_critical_issues의 스트리밍 버전
+        """
+        async for delta in self._analyze_stream(
+            "critical", code_diff, commit_message, filename, analysis_types, history_context, usage
+        ):
+            yield delta
+    
+    async def _analyze(
+        self, 
+        kind: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> str:
+        """캐시 → 진행 중인 동일 요청 합류 → 실제 LLM 호출 순으로 분석"""
+        label = ANALYSIS_LABELS[kind]
         try:
-            # 1. 외부 API 패턴 감지
-            detected_patterns = self.rag_service.detect_external_apis(code_diff)
-            print(f"감지된 API 패턴: {detected_patterns}")
+            cache_key = self._cache_key(kind, code_diff, commit_message, filename, analysis_types, history_context)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print(f"분석 결과 캐시 적중 ({label})")
+                add_usage(usage, cache_hits=1)
+                return cached
             
-            # 2. RAG에서 관련 지식 검색
-            knowledge_docs = self.rag_service.search_api_knowledge(detected_patterns)
-            
-            # 3. RAG 지식을 프롬프트용으로 포맷팅
-            api_knowledge = self.rag_service.format_knowledge_for_prompt(knowledge_docs)
-            has_rag_content = len(api_knowledge.strip()) > 0
-            print(f"📝 [LLM] RAG 콘텐츠 포함 여부: {'✅ YES' if has_rag_content else '❌ NO'}")
-        
-            # 4. RAG 지식이 포함된 프롬프트 생성
-            prompt = self._create_analysis_prompt_with_rag(
-                code_diff, commit_message, filename, analysis_types, api_knowledge
+            if self.inflight.get(cache_key) is not None:
+                print(f"진행 중인 동일 분석에 합류 ({label})")
+                add_usage(usage, inflight_joins=1)
+            return await self.inflight.do(
+                cache_key,
+                lambda: self._run_analysis(
+                    kind, cache_key, code_diff, commit_message, filename, analysis_types, history_context, usage
+                )
             )
             
-            print(f"Azure OpenAI API 호출 시작 (RAG 강화) - Model: {self.deployment}")
-            
-            # Azure OpenAI API 호출
-            response = self.client.chat.completions.create(
-                model=self.deployment,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "당신은 전문적인 코드 리뷰어입니다. 코드 변경사항을 분석하고 상세한 피드백을 제공합니다. 제공된 API 가이드라인을 참고하여 더 정확한 분석을 제공하세요."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            result = response.choices[0].message.content
-            print("Azure OpenAI API 호출 성공 (RAG 강화)")
-            return result
-            
+        except PromptTooLargeError:
+            raise
         except Exception as e:
             print(f"Azure OpenAI API 호출 실패: {e}")
             raise Exception(f"Azure OpenAI API 호출 실패: {str(e)}")
     
-    def analyze_code_for_critical_issues(
+    async def _run_analysis(
         self, 
+        kind: str, 
+        cache_key: str, 
         code_diff: str, 
         commit_message: str, 
         filename: str,
-        analysis_types: List[str]
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
     ) -> str:
+        """프롬프트 구성 후 LLM 호출, 결과를 캐시에 저장"""
+        label = ANALYSIS_LABELS[kind]
+        messages = await self._prepare_messages(
+            kind, code_diff, commit_message, filename, analysis_types, history_context, usage
+        )
+        
+        print(f"Azure OpenAI API 호출 시작 ({label}) - Model: {self.deployment}")
+        result = await self._complete(messages, temperature=ANALYSIS_TEMPERATURES[kind])
+        print(f"Azure OpenAI API 호출 성공 ({label})")
+        add_usage(usage, completion_tokens=count_tokens(result))
+        await self.cache.set(cache_key, result)
+        return result
+    
+    async def _prepare_messages(
+        self, 
+        kind: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, str]]:
         """
-        치명적 오류 탐지에 집중한 코드 분석 (실제 GitHub 데이터용, RAG 없음)
+        최종 LLM 호출 메시지 구성 + 호출 전 토큰 검사
+        - diff가 조각 예산(llm_chunk_tokens)을 넘으면 map-reduce: 조각별 분석 후 통합 프롬프트
+        - 완성된 프롬프트가 llm_max_prompt_tokens를 넘으면 diff를 더 잘게 나눠 다시 구성하고,
+          더 나눌 수 없으면 네트워크 호출 없이 PromptTooLargeError
+        - RAG 분석은 지식 검색(네트워크)을 먼저 시작해 두고 diff 분할/토큰 계산(스레드)과 동시에 진행
         """
+        knowledge = None
+        if kind == "rag":
+            knowledge = asyncio.ensure_future(self._retrieve_knowledge(code_diff))
+        
         try:
-            # 치명적 이슈 중심 프롬프트 생성 (RAG 없음)
-            prompt = self._create_critical_analysis_prompt(
-                code_diff, commit_message, filename, analysis_types
-            )
-            
-            print(f"Azure OpenAI API 호출 시작 (치명적 이슈 분석) - Model: {self.deployment}")
-            
-            # Azure OpenAI API 호출
-            response = self.client.chat.completions.create(
-                model=self.deployment,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "당신은 시니어 DevOps 엔지니어입니다. 코드 변경사항을 분석하여 빌드 실패, 배포 위험, 런타임 에러 등 치명적인 문제를 찾아내는 것이 주 임무입니다."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,  # 더 정확한 분석을 위해 낮춤
-                max_tokens=2000
-            )
+            chunk_tokens = settings.llm_chunk_tokens
+            while True:
+                chunks = await asyncio.to_thread(split_diff, code_diff, chunk_tokens)
+                if len(chunks) > 1:
+                    if knowledge is not None:
+                        knowledge.cancel()  # 조각 분석마다 조각의 API 패턴으로 다시 검색
+                        knowledge = None
+                    add_usage(usage, chunks=len(chunks))
+                    reports = await self._map_chunks(
+                        kind, chunks, commit_message, filename, analysis_types, history_context, usage
+                    )
+                    messages = await self._build_reduce_messages(kind, reports, commit_message, filename, usage)
+                else:
+                    messages = await self._build_messages(
+                        kind, code_diff, commit_message, filename, analysis_types, history_context, knowledge
+                    )
+                
+                prompt_tokens = count_message_tokens(messages)
+                if prompt_tokens <= settings.llm_max_prompt_tokens:
+                    add_usage(usage, prompt_tokens=prompt_tokens, llm_calls=1)
+                    return messages
+                
+                # diff 외 섹션(RAG 지식, 이력 요약 등)까지 합쳐 넘친 경우 diff를 절반 크기 조각으로
+                diff_tokens = count_tokens(code_diff)
+                if len(chunks) == 1 and diff_tokens // 2 >= MIN_CHUNK_TOKENS:
+                    chunk_tokens = diff_tokens // 2
+                    continue
+                raise PromptTooLargeError(
+                    f"프롬프트가 토큰 한도를 넘습니다 ({prompt_tokens} > {settings.llm_max_prompt_tokens} 토큰)"
+                )
+        finally:
+            # 분할/토큰 검사에서 예외가 나도 검색 작업이 고아로 남지 않도록
+            if knowledge is not None and not knowledge.done():
+                knowledge.cancel()
+    
+    async def _map_chunks(
+        self, 
+        kind: str, 
+        chunks: List[str], 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> List[str]:
+        """
+        map 단계: diff 조각별 분석을 동시에 실행 (요청당 동시 실행 수는 llm_chunk_concurrency로 제한)
+        조각 분석도 _analyze를 거치므로 캐시/동일 요청 병합이 조각 단위로 적용됨
+        """
+        label = ANALYSIS_LABELS[kind]
+        print(f"큰 diff 분할 분석 ({label}) - {len(chunks)}개 조각")
+        semaphore = asyncio.Semaphore(settings.llm_chunk_concurrency)
+        
+        async def analyze_chunk(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self._analyze(
+                    kind, chunk, commit_message, f"{filename} (부분 {index}/{len(chunks)})",
+                    analysis_types, history_context, usage
+                )
+        
+        return await asyncio.gather(*[
+            analyze_chunk(index, chunk) for index, chunk in enumerate(chunks, 1)
+        ])
+    
+    async def _build_reduce_messages(
+        self, 
+        kind: str, 
+        reports: List[str], 
+        commit_message: str, 
+        filename: str,
+        usage: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        reduce 단계 메시지 구성
+        부분 결과가 많아 합친 입력이 토큰 예산을 넘으면 묶음별로 먼저 합치는 과정을 반복 (계층적 reduce)
+        """
+        while len(reports) > 1 and count_tokens("\n\n".join(reports)) > settings.llm_chunk_tokens:
+            groups = self._group_reports(reports)
+            if len(groups) == len(reports):
+                break  # 결과 하나하나가 예산보다 커서 더 묶을 수 없음
+            reports = await asyncio.gather(*[
+                self._reduce_group(kind, group, commit_message, filename, usage) for group in groups
+            ])
+        return self._reduce_messages(kind, reports, commit_message, filename)
+    
+    async def _reduce_group(
+        self, 
+        kind: str, 
+        reports: List[str], 
+        commit_message: str, 
+        filename: str,
+        usage: Optional[Dict[str, int]] = None
+    ) -> str:
+        messages = self._reduce_messages(kind, reports, commit_message, filename)
+        add_usage(usage, prompt_tokens=count_message_tokens(messages), llm_calls=1)
+        result = await self._complete(messages, temperature=ANALYSIS_TEMPERATURES[kind])
+        add_usage(usage, completion_tokens=count_tokens(result))
+        return result
+    
+    def _group_reports(self, reports: List[str]) -> List[List[str]]:
+        """부분 결과를 순서대로 토큰 예산 안에서 묶음 (묶음당 최소 2개)"""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for report in reports:
+            tokens = count_tokens(report)
+            if len(current) >= 2 and used + tokens > settings.llm_chunk_tokens:
+                groups.append(current)
+                current, used = [], 0
+            current.append(report)
+            used += tokens
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _reduce_messages(
+        self, 
+        kind: str, 
+        reports: List[str], 
+        commit_message: str, 
+        filename: str
+    ) -> List[Dict[str, str]]:
+        system_prompt = RAG_SYSTEM_PROMPT if kind == "rag" else CRITICAL_SYSTEM_PROMPT
+        sections = "\n\n".join(
+            f"--- 부분 분석 {index}/{len(reports)} ---\n{report}" for index, report in enumerate(reports, 1)
+        )
+        prompt = f"""{REDUCE_INSTRUCTION}
+
+**파일명:** {filename}
+**커밋 메시지:** {commit_message}
+
+{sections}"""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def _analyze_stream(
+        self, 
+        kind: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        _analyze의 스트리밍 버전 (캐시 적중 시 결과 전체를 한 번에 전달)
+        진행 중인 동일 스트리밍 분석에 합류하면 지금까지 생성된 조각부터 이어서 받음
+        """
+        label = ANALYSIS_LABELS[kind]
+        try:
+            cache_key = self._cache_key(kind, code_diff, commit_message, filename, analysis_types, history_context)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print(f"분석 결과 캐시 적중 ({label})")
+                add_usage(usage, cache_hits=1)
+                yield cached
+                return
             
-            result = response.choices[0].message.content
-            print("Azure OpenAI API 호출 성공 (치명적 이슈 분석)")
-            return result
+            if self.inflight.get(cache_key) is not None:
+                print(f"진행 중인 동일 분석에 합류 ({label})")
+                add_usage(usage, inflight_joins=1)
+            async for delta in self.inflight.stream(
+                cache_key,
+                lambda buffer: self._run_stream(
+                    kind, cache_key, code_diff, commit_message, filename, analysis_types,
+                    history_context, usage, buffer
+                )
+            ):
+                yield delta
             
+        except PromptTooLargeError:
+            raise
         except Exception as e:
             print(f"Azure OpenAI API 호출 실패: {e}")
             raise Exception(f"Azure OpenAI API 호출 실패: {str(e)}")
     
-    def _summarize_api_knowledge(self, api_knowledge: str, max_length=300) -> str:
-        # 최대 max_length 글자까지만 자르고 ... 붙이기
-        if len(api_knowledge) > max_length:
-            return api_knowledge[:max_length].strip() + "..."
-        return api_knowledge
+    async def _run_stream(
+        self, 
+        kind: str, 
+        cache_key: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str,
+        usage: Optional[Dict[str, int]],
+        buffer: StreamBuffer
+    ) -> str:
+        """_run_analysis의 스트리밍 버전 - 생성되는 조각을 buffer에 써서 합류한 요청들과 공유"""
+        label = ANALYSIS_LABELS[kind]
+        # 큰 diff는 조각 분석을 한 번에 받고, 통합(reduce) 결과만 스트리밍
+        messages = await self._prepare_messages(
+            kind, code_diff, commit_message, filename, analysis_types, history_context, usage
+        )
+        
+        print(f"Azure OpenAI 스트리밍 호출 시작 ({label}) - Model: {self.deployment}")
+        async for delta in self._stream(messages, temperature=ANALYSIS_TEMPERATURES[kind]):
+            buffer.append(delta)
+        print(f"Azure OpenAI 스트리밍 호출 완료 ({label})")
+        result = "".join(buffer.parts)
+        add_usage(usage, completion_tokens=count_tokens(result))
+        await self.cache.set(cache_key, result)
+        return result
+    
+    def _cache_key(
+        self, 
+        kind: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = ""
+    ) -> str:
+        """분석 종류/입력/배포/프롬프트 버전 기반 캐시 키 (RAG 분석은 RAG 문서 버전 포함)"""
+        return make_cache_key(
+            kind, code_diff, commit_message, filename, analysis_types,
+            self.deployment or "", PROMPT_TEMPLATE_VERSION, history_context,
+            self.rag_service.knowledge_version if kind == "rag" else ""
+        )
+    
+    async def _build_messages(
+        self, 
+        kind: str, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = "",
+        knowledge: Optional[Awaitable[str]] = None
+    ) -> List[Dict[str, str]]:
+        if kind == "rag":
+            return await self._build_rag_messages(code_diff, commit_message, filename, analysis_types, knowledge)
+        return self._build_critical_messages(code_diff, commit_message, filename, analysis_types, history_context)
+    
+    async def _build_rag_messages(
+        self, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        knowledge: Optional[Awaitable[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        RAG 지식 검색 후 일반 분석용 메시지 구성
+        knowledge: 미리 시작해 둔 지식 검색 (없으면 여기서 검색)
+        """
+        # 1~2. 외부 API 패턴 감지 → RAG에서 관련 지식 검색 + 포맷팅
+        api_knowledge = await (knowledge if knowledge is not None else self._retrieve_knowledge(code_diff))
+        has_rag_content = len(api_knowledge.strip()) > 0
+        print(f"📝 [LLM] RAG 콘텐츠 포함 여부: {'✅ YES' if has_rag_content else '❌ NO'}")
+        
+        # 3. RAG 지식이 포함된 프롬프트 생성
+        prompt = self._create_analysis_prompt_with_rag(
+            code_diff, commit_message, filename, analysis_types, api_knowledge
+        )
+        return [
+            {"role": "system", "content": RAG_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def _retrieve_knowledge(self, code_diff: str) -> str:
+        """외부 API 패턴 감지 후 관련 지식 검색 (패턴 조합별 캐시, 시간 초과/실패 시 빈 지식)"""
+        detected_patterns = self.rag_service.detect_external_apis(code_diff)
+        print(f"감지된 API 패턴: {detected_patterns}")
+        return await self.rag_service.get_api_knowledge(detected_patterns)
+    
+    def _build_critical_messages(
+        self, 
+        code_diff: str, 
+        commit_message: str, 
+        filename: str,
+        analysis_types: List[str],
+        history_context: str = ""
+    ) -> List[Dict[str, str]]:
+        """치명적 이슈 분석용 메시지 구성 (RAG 없음)"""
+        prompt = self._create_critical_analysis_prompt(
+            code_diff, commit_message, filename, analysis_types, history_context
+        )
+        return [
+            {"role": "system", "content": CRITICAL_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def _complete(self, messages: List[Dict[str, str]], temperature: float) -> str:
+        """Azure OpenAI 완성 호출 (전체 응답 대기)"""
+        async with self.llm_semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=settings.llm_max_completion_tokens
+            )
+        return response.choices[0].message.content
+    
+    async def _stream(self, messages: List[Dict[str, str]], temperature: float) -> AsyncIterator[str]:
+        """Azure OpenAI 스트리밍 호출 - 토큰 조각을 순서대로 반환"""
+        async with self.llm_semaphore:
+            stream = await self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=settings.llm_max_completion_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                # Azure는 첫 청크에 content filter 결과만 담아 choices가 비어 있을 수 있음
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+    
     
     def _create_analysis_prompt_with_rag(
         self, 
@@ -137,28 +616,21 @@ class AzureOpenAIService:
     ) -> str:
         """
         RAG 지식이 포함된 일반 코드 분석용 프롬프트 생성
+        고정 지침/응답 형식 → API 가이드라인(한 번만) → 요청별 데이터 순서 (앞부분이 요청 간에 같아야 prefix 캐시 적중)
         """
-        analysis_sections = {
-            "코드 품질": "코드의 가독성, 복잡도, 구조적 문제점을 분석해주세요.",
-            "보안 취약점": "보안상 취약점이나 위험한 패턴을 찾아 지적해주세요.",
-            "성능 최적화": "성능 개선 가능한 부분을 찾아 제안해주세요.",
-            "버그 탐지": "잠재적인 버그나 오류 가능성을 찾아주세요.",
-            "리팩토링 제안": "코드 구조 개선 및 리팩토링 방안을 제안해주세요."
-        }
-        
         # 선택된 분석 항목만 포함
         selected_analyses = []
         for analysis_type in analysis_types:
-            if analysis_type in analysis_sections:
-                selected_analyses.append(f"- {analysis_type}: {analysis_sections[analysis_type]}")
+            if analysis_type in ANALYSIS_SECTIONS:
+                selected_analyses.append(f"- {analysis_type}: {ANALYSIS_SECTIONS[analysis_type]}")
         
         analysis_text = "\n".join(selected_analyses)
-        
-        summarized_knowledge = self._summarize_api_knowledge(api_knowledge, max_length=300)
 
-        print(api_knowledge, "로 포맷팅 완료")
+        return f"""{RAG_ANALYSIS_GUIDE}
 
-        prompt = f"""다음 코드 변경사항을 분석해주세요:
+**분석 요청 항목:**
+{analysis_text}
+{api_knowledge}
 
 **파일명:** {filename}
 **커밋 메시지:** {commit_message}
@@ -166,56 +638,28 @@ class AzureOpenAIService:
 **코드 변경사항:**
 ```diff
 {code_diff}
-```
-**분석 요청 항목:**
-{analysis_text}
-
-{api_knowledge}
-
-**위에 제공된 API 가이드라인이 있다면 반드시 참고하여 해당 API 사용 시 주의사항을 중점적으로 분석해주세요.**
-
-**응답 형식:**
-다음 마크다운 형식으로 응답해주세요:
-
-## 🔍 코드 분석 결과
-
-##관련 API 가이드라인 요약:
-{api_knowledge}
-
-### 📊 전체 요약
-- 간단한 변경사항 요약
-
-### 🎯 상세 분석
-(요청된 분석 항목들에 대한 상세 내용)
-
-### ⚠️ 발견된 이슈
-1. 이슈 1
-2. 이슈 2
-
-### 💡 개선 제안
-1. 제안 1
-2. 제안 2
-
-### 📈 점수 (10점 만점)
-- 전체 품질: X/10
-- 보안성: X/10
-- 성능: X/10
-
-한국어로 전문적이고 구체적으로 분석해주세요."""
-
-        return prompt
+```"""
     
     def _create_critical_analysis_prompt(
         self, 
         code_diff: str, 
         commit_message: str, 
         filename: str,
-        analysis_types: List[str]
+        analysis_types: List[str],
+        history_context: str = ""
     ) -> str:
         """
         치명적 이슈 탐지용 프롬프트 생성 (RAG 없음)
+        고정 지침/응답 형식을 앞에, 요청별 데이터(diff, 이력 요약)를 뒤에 배치
         """
-        prompt = f"""다음 커밋 변경사항을 분석하여 **치명적인 오류 가능성**을 찾아주세요:
+        history_section = ""
+        if history_context:
+            history_section = f"""
+**📈 커밋 이력 기반 위험 신호 (과거 실패 이력, 동시 수정 파일 조합):**
+{history_context}
+- 함께 수정되던 파일이 누락됐거나 실패율이 높은 조합이면 빌드 실패 위험 판단에 반영해주세요.
+"""
+        return f"""{CRITICAL_ANALYSIS_GUIDE}
 
 **파일명:** {filename}
 **커밋 메시지:** {commit_message}
@@ -224,42 +668,4 @@ class AzureOpenAIService:
 ```diff
 {code_diff}
 ```
-
-**🚨 중점 분석 영역:**
-1. **빌드 실패 위험**: 컴파일 에러, 의존성 문제, 설정 오류
-2. **런타임 크래시**: NullPointer, 배열 오버플로우, 타입 에러
-3. **배포 위험**: 환경 설정, 데이터베이스 스키마, API 호환성
-4. **보안 취약점**: SQL 인젝션, XSS, 인증 우회, 개인정보 유출
-5. **성능 저하**: 무한루프, 메모리 누수, 대용량 처리 문제
-
-**응답 형식:**
-## 🚨 치명적 이슈 분석
-
-### ⚡ 위험도 평가
-- **전체 위험도**: 🔴 높음 | 🟡 중간 | 🟢 낮음
-- **빌드 성공률**: XX%
-- **배포 안전성**: 🔴 위험 | 🟡 주의 | 🟢 안전
-
-### 🔥 발견된 치명적 이슈
-1. **[이슈 유형]** 구체적인 문제점
-   - 발생 가능성: XX%
-   - 영향 범위: 설명
-   - 해결 방법: 구체적 수정안
-
-### ✅ 확인된 안전 요소
-- 안전하다고 판단되는 변경사항들
-
-### 🎯 즉시 조치 사항
-1. **우선순위 1**: 반드시 수정해야 할 사항
-2. **우선순위 2**: 배포 전 검토 필요
-
-### 📋 검증 체크리스트
-- [ ] 단위 테스트 통과 확인
-- [ ] 통합 테스트 실행
-- [ ] 스테이징 환경 배포 테스트
-- [ ] 성능 테스트 실행
-
-**Jenkins 빌드나 배포에서 문제가 발생할 가능성이 있다면 반드시 명시해주세요.**
-**소소한 성능 개선이나 코드 스타일은 무시하고, 오직 시스템을 망가뜨릴 수 있는 치명적 문제에만 집중해주세요.**"""
-
-        return prompt
\ No newline at end of file
+{history_section}"""
@@ -0,0 +1,369 @@
+# backend/services/local_git_service.py
+import asyncio
+import codecs
+import logging
+import os
+import re
+from datetime import datetime
+from typing import List, Optional, AsyncIterator, Awaitable, Tuple
+
+from services.commit_source import CommitSource, CommitSourceError
+from services.github_rate_limiter import PRIORITY_INTERACTIVE
+from models.github_models import (
+    GitHubConfig,
+    CommitResponse,
+    CommitDetailResponse,
+    Author,
+    CommitInfo,
+    CommitStats,
+    FileChange
+)
+
+logger = logging.getLogger(__name__)
+
+# git log 출력 구분자 (필드: NUL, 레코드: RS)
+FIELD_SEP = "\x00"
+RECORD_SEP = "\x1e"
+LOG_FORMAT = "%H%x00%P%x00%an%x00%ae%x00%aI%x00%cn%x00%ce%x00%cI%x00%B%x1e"
+# 이력 수집용: 레코드 구분자를 앞에 두고 메시지 뒤에 --numstat 출력이 이어지도록 함
+HISTORY_FORMAT = "%x1e%H%x00%P%x00%an%x00%ae%x00%aI%x00%cn%x00%ce%x00%cI%x00%B%x00"
+
+# 요청으로 받은 SHA/브랜치 허용 형식 ("-"로 시작하면 git 옵션으로 해석되므로 거부)
+REVISION_PATTERN = re.compile(r"^[0-9A-Za-z_.@^~/][0-9A-Za-z_.@^~/-]*$")
+
+# git diff --raw 상태 코드 → GitHub API 파일 상태
+STATUS_MAP = {
+    "A": "added",
+    "M": "modified",
+    "D": "removed",
+    "R": "renamed",
+    "C": "copied",
+    "T": "changed"
+}
+
+class LocalGitService(CommitSource):
+    """
+    로컬 clone에서 커밋 데이터를 읽는 공급원 (git plumbing 명령 사용)
+    - GitHubService와 같은 CommitResponse / CommitDetailResponse 모델 반환
+    - 네트워크/rate limit 없이 디스크 속도로 동작
+    """
+
+    def __init__(self, repo_path: str, git_binary: str = "git"):
+        if not os.path.isdir(repo_path):
+            raise CommitSourceError(f"로컬 저장소 경로를 찾을 수 없습니다: {repo_path}")
+        self.repo_path = repo_path
+        self.git_binary = git_binary
+
+    async def _git(self, *args: str) -> str:
+        """git 명령 실행 후 표준 출력 반환"""
+        process = await asyncio.create_subprocess_exec(
+            self.git_binary, "-C", self.repo_path, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise self._git_error(stderr)
+        return stdout.decode("utf-8", errors="replace")
+
+    def _git_error(self, stderr: bytes) -> CommitSourceError:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        if "unknown revision" in message or "bad object" in message or "bad revision" in message:
+            return CommitSourceError("커밋을 찾을 수 없습니다.", 404)
+        return CommitSourceError(f"git 명령 실패: {message}")
+
+    def _revision(self, value: str, label: str) -> str:
+        """요청으로 받은 SHA/브랜치 검증 (옵션 주입 방지)"""
+        if not value or not REVISION_PATTERN.match(value) or ".." in value:
+            raise CommitSourceError(f"잘못된 {label}입니다: {value}", 400)
+        return value
+
+    async def get_commits(
+        self,
+        config: GitHubConfig,
+        per_page: int = 10,
+        page: int = 1,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> List[CommitResponse]:
+        """커밋 목록 조회 (GitHubService.get_commits와 같은 페이지 의미)"""
+        args = ["log", f"--format={LOG_FORMAT}", f"--max-count={per_page}", f"--skip={(page - 1) * per_page}"]
+        args += self._range_args(since, until)
+        args += ["--end-of-options", self._revision(config.branch, "브랜치")]
+        output = await self._git(*args)
+        return [
+            self._parse_log_record(record)
+            for record in output.split(RECORD_SEP)
+            if record.strip()
+        ]
+
+    async def iter_commits(
+        self,
+        config: GitHubConfig,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        per_page: int = 100,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[CommitResponse]:
+        """
+        커밋 전체 순회 - git log 출력을 읽는 대로 하나씩 반환 (메모리 사용량 일정)
+        """
+        args = ["log", f"--format={LOG_FORMAT}"] + self._range_args(since, until)
+        args += ["--end-of-options", self._revision(config.branch, "브랜치")]
+        async for record in self._stream_records(args):
+            yield self._parse_log_record(record)
+    
+    async def iter_commit_details(
+        self,
+        config: GitHubConfig,
+        stop_at: Optional[str] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[CommitDetailResponse]:
+        """
+        이력 수집용 전체 순회 - git log --numstat 한 번으로 파일별 변경 줄 수까지 읽음
+        (커밋마다 git을 따로 실행하지 않으며 patch는 포함하지 않음)
+        """
+        args = [
+            "-c", "core.quotePath=false",
+            "log", f"--format={HISTORY_FORMAT}", "--numstat", "--no-renames",
+            "--end-of-options", self._revision(config.branch, "브랜치")
+        ]
+        async for record in self._stream_records(args):
+            fields = record.lstrip("\n").split(FIELD_SEP, 9)
+            commit = self._commit_from_fields(fields[:9])
+            if commit.sha == stop_at:
+                break
+            files = []
+            for line in fields[9].splitlines() if len(fields) > 9 else []:
+                parts = line.split("\t", 2)
+                if len(parts) != 3:
+                    continue
+                added, deleted, path = parts
+                additions = int(added) if added != "-" else 0
+                deletions = int(deleted) if deleted != "-" else 0
+                files.append(FileChange(
+                    sha="",
+                    filename=path,
+                    status="modified",
+                    additions=additions,
+                    deletions=deletions,
+                    changes=additions + deletions
+                ))
+            additions = sum(file.additions for file in files)
+            deletions = sum(file.deletions for file in files)
+            yield CommitDetailResponse(
+                **commit.dict(exclude={"stats"}),
+                stats=CommitStats(total=additions + deletions, additions=additions, deletions=deletions),
+                files=files
+            )
+    
+    async def _stream_records(self, args: List[str]) -> AsyncIterator[str]:
+        """
+        git 출력을 읽는 대로 RS 구분자 단위 레코드로 반환 (메모리 사용량 일정)
+        git이 실패하면(없는 브랜치 등) 마지막 레코드 대신 CommitSourceError
+        """
+        process = await asyncio.create_subprocess_exec(
+            self.git_binary, "-C", self.repo_path, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        # stderr 파이프가 가득 차 git이 멈추지 않도록 동시에 읽어 둠
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        # 청크 경계에서 멀티바이트 문자가 잘려도 안전하도록 점진적 디코더 사용
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        try:
+            while True:
+                chunk = await process.stdout.read(64 * 1024)
+                if not chunk:
+                    break
+                buffer += decoder.decode(chunk)
+                *records, buffer = buffer.split(RECORD_SEP)
+                for record in records:
+                    if record.strip():
+                        yield record
+            if await process.wait() != 0:
+                raise self._git_error(await stderr_task)
+            if buffer.strip():
+                yield buffer
+        finally:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            stderr_task.cancel()
+
+    async def get_commit_detail(
+        self,
+        config: GitHubConfig,
+        sha: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> CommitDetailResponse:
+        """특정 커밋의 상세 정보 조회 (첫 번째 부모 기준 diff, GitHub API와 동일)"""
+        sha = self._revision(sha, "커밋 SHA")
+        output = await self._git("show", "-s", f"--format={LOG_FORMAT}", "--end-of-options", sha, "--")
+        fields = self._split_log_record(output.split(RECORD_SEP)[0])
+        try:
+            if len(fields) != 9 or not REVISION_PATTERN.match(fields[0]):
+                raise ValueError("커밋 레코드 형식이 아님")
+            commit = self._commit_from_fields(fields)
+        except ValueError:
+            raise CommitSourceError("커밋을 찾을 수 없습니다.", 404)
+
+        parents = fields[1].split()
+        if parents:
+            options, revisions = [], [parents[0], commit.sha]
+        else:
+            options, revisions = ["--root"], [commit.sha]
+
+        def diff_tree(*format_args: str) -> Awaitable[str]:
+            return self._git(
+                "diff-tree", "-r", "-M", "--no-commit-id", *format_args, *options, "--end-of-options", *revisions
+            )
+
+        raw_output, numstat_output, patch_output = await asyncio.gather(
+            diff_tree("--raw", "-z"),
+            diff_tree("--numstat", "-z"),
+            diff_tree("-p")
+        )
+
+        files = self._build_file_changes(
+            self._parse_raw(raw_output),
+            self._parse_numstat(numstat_output),
+            self._split_patches(patch_output)
+        )
+        additions = sum(file.additions for file in files)
+        deletions = sum(file.deletions for file in files)
+
+        return CommitDetailResponse(
+            **commit.dict(exclude={"stats"}),
+            stats=CommitStats(total=additions + deletions, additions=additions, deletions=deletions),
+            files=files
+        )
+
+    def _range_args(self, since: Optional[str], until: Optional[str]) -> List[str]:
+        args = []
+        if since:
+            args.append(f"--since={since}")
+        if until:
+            args.append(f"--until={until}")
+        return args
+
+    def _split_log_record(self, record: str) -> List[str]:
+        """git log 레코드 → [SHA, 부모 SHA들, 작성자 이름, 이메일, 날짜, 커미터 이름, 이메일, 날짜, 메시지]"""
+        return record.lstrip("\n").split(FIELD_SEP, 8)
+
+    def _parse_log_record(self, record: str) -> CommitResponse:
+        """git log 레코드 하나를 CommitResponse로 변환"""
+        return self._commit_from_fields(self._split_log_record(record))
+
+    def _commit_from_fields(self, fields: List[str]) -> CommitResponse:
+        sha, _, author_name, author_email, author_date, committer_name, committer_email, committer_date, message = fields
+        return CommitResponse(
+            sha=sha,
+            commit=CommitInfo(
+                author=Author(
+                    name=author_name,
+                    email=author_email,
+                    date=datetime.fromisoformat(author_date)
+                ),
+                committer=Author(
+                    name=committer_name,
+                    email=committer_email,
+                    date=datetime.fromisoformat(committer_date)
+                ),
+                message=message.rstrip("\n"),
+                comment_count=0
+            ),
+            author=None,
+            committer=None,
+            stats=None,
+            html_url=""
+        )
+
+    def _parse_raw(self, output: str) -> List[Tuple[str, str, str]]:
+        """diff-tree --raw -z 출력 → [(상태 코드, 새 blob SHA, 파일명)]"""
+        entries = []
+        tokens = output.split("\x00")
+        i = 0
+        while i < len(tokens):
+            meta = tokens[i]
+            if not meta.startswith(":"):
+                i += 1
+                continue
+            # :<old mode> <new mode> <old sha> <new sha> <status>
+            _, _, _, new_sha, status = meta[1:].split(" ")
+            status_code = status[0]
+            if status_code in ("R", "C"):
+                path = tokens[i + 2]  # 이전 경로, 새 경로 순
+                i += 3
+            else:
+                path = tokens[i + 1]
+                i += 2
+            entries.append((status_code, new_sha, path))
+        return entries
+
+    def _parse_numstat(self, output: str) -> List[Tuple[int, int]]:
+        """diff-tree --numstat -z 출력 → [(추가 줄 수, 삭제 줄 수)] (바이너리는 0)"""
+        counts = []
+        tokens = output.split("\x00")
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if not token:
+                i += 1
+                continue
+            added, deleted, path = token.split("\t", 2)
+            counts.append((
+                int(added) if added != "-" else 0,
+                int(deleted) if deleted != "-" else 0
+            ))
+            # 이름 변경은 경로가 비어 있고 이전/새 경로가 뒤따름
+            i += 3 if path == "" else 1
+        return counts
+
+    def _split_patches(self, output: str) -> List[Optional[str]]:
+        """diff-tree -p 출력을 파일별로 나눠 GitHub patch 형식(@@ 헝크부터)으로 변환"""
+        patches = []
+        current: Optional[List[str]] = None
+        for line in output.split("\n"):
+            if line.startswith("diff --git "):
+                if current is not None:
+                    patches.append(self._hunks_only(current))
+                current = []
+            elif current is not None:
+                current.append(line)
+        if current is not None:
+            patches.append(self._hunks_only(current))
+        return patches
+
+    def _hunks_only(self, lines: List[str]) -> Optional[str]:
+        for index, line in enumerate(lines):
+            if line.startswith("@@"):
+                return "\n".join(lines[index:]).rstrip("\n")
+        return None  # 바이너리 또는 모드 변경만 있는 경우
+
+    def _build_file_changes(
+        self,
+        raw_entries: List[Tuple[str, str, str]],
+        numstats: List[Tuple[int, int]],
+        patches: List[Optional[str]]
+    ) -> List[FileChange]:
+        """git은 세 출력을 같은 순서로 내보내므로 순서대로 결합"""
+        files = []
+        for index, (status_code, blob_sha, path) in enumerate(raw_entries):
+            additions, deletions = numstats[index] if index < len(numstats) else (0, 0)
+            files.append(FileChange(
+                sha=blob_sha,
+                filename=path,
+                status=STATUS_MAP.get(status_code, "modified"),
+                additions=additions,
+                deletions=deletions,
+                changes=additions + deletions,
+                patch=patches[index] if index < len(patches) else None
+            ))
+        return files
+
+    async def close(self):
+        """GitHubService와 인터페이스를 맞추기 위한 종료 메서드 (정리할 자원 없음)"""
+        pass
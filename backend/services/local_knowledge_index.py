@@ -0,0 +1,250 @@
+# backend/services/local_knowledge_index.py
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from services.knowledge_chunks import split_sections, index_text
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식을 바꾸면 올려서 기존 인덱스를 다시 빌드
+INDEX_VERSION = 2
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+EMBEDDING_DIM = 256
+# 임베딩 코사인 유사도를 BM25 점수에 더할 때의 가중치
+VECTOR_WEIGHT = 1.0
+
+
+def tokenize(text: str) -> List[str]:
+    """영문/숫자는 소문자 단어, 한글은 2글자 단위 (조사가 붙은 형태도 같은 토큰으로 잡히도록)"""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if word[0] >= "가" and len(word) > 2:
+            tokens.extend(word[index:index + 2] for index in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def embed(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """문자 3-gram 해시 임베딩 (외부 모델 없이 계산, L2 정규화)"""
+    vector = np.zeros(dim, dtype=np.float32)
+    normalized = " ".join(text.lower().split())
+    grams = Counter(normalized[index:index + 3] for index in range(len(normalized) - 2))
+    for gram, count in grams.items():
+        hashed = zlib.crc32(gram.encode("utf-8"))
+        sign = 1.0 if hashed & 0x80000000 else -1.0
+        vector[hashed % dim] += sign * (1.0 + math.log(count))
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def load_documents(docs_dir: str) -> List[Dict[str, str]]:
+    """RAG 디렉터리의 마크다운 문서 목록"""
+    documents = []
+    for path in sorted(glob.glob(os.path.join(docs_dir, "*.md"))):
+        with open(path, encoding="utf-8") as doc_file:
+            documents.append({"filename": os.path.basename(path), "content": doc_file.read()})
+    return documents
+
+
+def load_sections(docs_dir: str) -> List[Dict[str, Any]]:
+    """RAG 문서들을 제목 단위 섹션으로 분할한 목록 (인덱스의 검색 단위)"""
+    return [
+        chunk
+        for document in load_documents(docs_dir)
+        for chunk in split_sections(document["filename"], document["content"])
+    ]
+
+
+def docs_fingerprint(docs_dir: str, with_embeddings: bool) -> str:
+    """문서 파일 목록/수정 시각/크기 기반 지문 (바뀌면 인덱스 재빌드)"""
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{with_embeddings}".encode("utf-8"))
+    for path in sorted(glob.glob(os.path.join(docs_dir, "*.md"))):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LocalKnowledgeIndex:
+    """
+    RAG 문서 섹션용 로컬 검색 인덱스 (Azure Search 대체)
+    - 검색 단위는 split_sections로 나눈 섹션 (문서 제목/섹션 경로 포함해 색인)
+    - BM25 역색인: 용어별 posting(문서 id, 빈도)을 CSR 형태 배열로 저장
+    - 선택: 문자 3-gram 해시 임베딩 행렬 (코사인 유사도를 BM25 점수에 더함)
+    - 디렉터리에 저장하면 배열은 mmap으로 로드
+    """
+
+    ARRAYS = ("offsets", "posting_docs", "posting_freqs", "idf", "doc_lengths")
+
+    def __init__(
+        self,
+        documents: List[Dict[str, Any]],
+        vocab: Dict[str, int],
+        arrays: Dict[str, np.ndarray],
+        embeddings: Optional[np.ndarray] = None
+    ):
+        self.documents = documents
+        self.vocab = vocab
+        self.offsets = arrays["offsets"]
+        self.posting_docs = arrays["posting_docs"]
+        self.posting_freqs = arrays["posting_freqs"]
+        self.idf = arrays["idf"]
+        self.doc_lengths = arrays["doc_lengths"]
+        self.average_length = float(np.mean(self.doc_lengths)) if len(self.doc_lengths) else 0.0
+        self.embeddings = embeddings
+
+    @classmethod
+    def build(cls, documents: List[Dict[str, Any]], with_embeddings: bool = False) -> "LocalKnowledgeIndex":
+        term_docs: Dict[str, List[tuple]] = {}
+        doc_lengths = []
+        for doc_id, document in enumerate(documents):
+            tokens = tokenize(index_text(document))
+            doc_lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                term_docs.setdefault(term, []).append((doc_id, frequency))
+
+        vocab = {term: term_id for term_id, term in enumerate(sorted(term_docs))}
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        posting_docs, posting_freqs, idf = [], [], []
+        count = len(documents)
+        for term in sorted(term_docs):
+            postings = term_docs[term]
+            offsets[vocab[term] + 1] = offsets[vocab[term]] + len(postings)
+            posting_docs.extend(doc_id for doc_id, _ in postings)
+            posting_freqs.extend(frequency for _, frequency in postings)
+            idf.append(math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)))
+
+        arrays = {
+            "offsets": offsets,
+            "posting_docs": np.asarray(posting_docs, dtype=np.int32),
+            "posting_freqs": np.asarray(posting_freqs, dtype=np.float32),
+            "idf": np.asarray(idf, dtype=np.float32),
+            "doc_lengths": np.asarray(doc_lengths, dtype=np.float32)
+        }
+        embeddings = None
+        if with_embeddings:
+            embeddings = np.zeros((len(documents), EMBEDDING_DIM), dtype=np.float32)
+            for doc_id, document in enumerate(documents):
+                embeddings[doc_id] = embed(index_text(document))
+        return cls(documents, vocab, arrays, embeddings)
+
+    @classmethod
+    def from_directory(
+        cls,
+        docs_dir: str,
+        index_dir: str = "",
+        with_embeddings: bool = False
+    ) -> "LocalKnowledgeIndex":
+        """
+        저장된 인덱스가 문서와 일치하면 mmap으로 로드, 아니면 문서 섹션으로 빌드
+        (index_dir가 있으면 빌드 결과를 저장해 다음 시작부터 재사용)
+        """
+        fingerprint = docs_fingerprint(docs_dir, with_embeddings)
+        if index_dir:
+            loaded = cls.load(index_dir, fingerprint)
+            if loaded is not None:
+                return loaded
+        index = cls.build(load_sections(docs_dir), with_embeddings)
+        if index_dir:
+            index.save(index_dir, fingerprint)
+        return index
+
+    def save(self, index_dir: str, fingerprint: str):
+        os.makedirs(index_dir, exist_ok=True)
+        # 메타 파일(지문)을 먼저 지우고 마지막에 기록 → 중간에 끊기면 다음 시작 때 다시 빌드
+        meta_path = os.path.join(index_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        arrays = {name: np.asarray(getattr(self, name)) for name in self.ARRAYS}
+        if self.embeddings is not None:
+            arrays["embeddings"] = np.asarray(self.embeddings)
+        for name, array in arrays.items():
+            path = os.path.join(index_dir, f"{name}.npy")
+            with open(path + ".tmp", "wb") as array_file:
+                np.save(array_file, array)
+            os.replace(path + ".tmp", path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as meta_file:
+            json.dump({
+                "fingerprint": fingerprint,
+                "documents": self.documents,
+                "vocab": self.vocab,
+                "embeddings": self.embeddings is not None
+            }, meta_file, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @classmethod
+    def load(cls, index_dir: str, fingerprint: str) -> Optional["LocalKnowledgeIndex"]:
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            if meta["fingerprint"] != fingerprint:
+                return None
+            arrays = {
+                name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r") for name in cls.ARRAYS
+            }
+            embeddings = None
+            if meta["embeddings"]:
+                embeddings = np.load(os.path.join(index_dir, "embeddings.npy"), mmap_mode="r")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"로컬 RAG 인덱스 로드 실패, 다시 빌드합니다: {e}")
+            return None
+        return cls(meta["documents"], meta["vocab"], arrays, embeddings)
+
+    def _term_scores(self, token: str) -> np.ndarray:
+        """토큰 하나의 문서별 BM25 점수"""
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        term_id = self.vocab.get(token)
+        if term_id is None:
+            return scores
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        doc_ids = self.posting_docs[start:end]
+        frequencies = self.posting_freqs[start:end]
+        normalizer = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_ids] / self.average_length)
+        scores[doc_ids] = self.idf[term_id] * frequencies * (BM25_K1 + 1) / (frequencies + normalizer)
+        return scores
+
+    def search(self, query_terms: List[str], top: int = 1) -> List[Dict[str, Any]]:
+        """
+        검색어(OR 조건) BM25 + 임베딩 점수 상위 섹션 (Azure 검색 결과 형식 + title/section/order)
+        여러 토큰으로 나뉘는 검색어("승인 프로세스")는 토큰 점수 평균 → 검색어 하나가 한 번만 반영됨
+        """
+        if not self.documents:
+            return []
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(query_terms):
+            tokens = tokenize(term)
+            if tokens:
+                scores += sum(self._term_scores(token) for token in tokens) / len(tokens)
+        if self.embeddings is not None:
+            query = " ".join(query_terms)
+            scores += VECTOR_WEIGHT * np.maximum(self.embeddings @ embed(query), 0)
+
+        results = []
+        for doc_id in np.argsort(-scores, kind="stable")[:top]:
+            if scores[doc_id] <= 0:
+                break
+            results.append({"caption": "", **self.documents[doc_id], "score": float(scores[doc_id])})
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.documents),
+            "terms": len(self.vocab),
+            "embeddings": self.embeddings is not None
+        }
@@ -0,0 +1,35 @@
+# backend/services/pattern_matcher.py
+from typing import Dict, Hashable, Iterable, Set, Tuple
+
+import ahocorasick
+
+
+class PatternMatcher:
+    """
+    여러 문자열 패턴을 텍스트 한 번 훑기로 찾는 매처 (Aho-Corasick 오토마톤)
+    - 텍스트 길이에 비례하는 시간으로 겹치는 위치까지 모든 패턴을 찾음 → 패턴 수가 늘어도 다시 훑지 않음
+    - 결과는 패턴마다 (pattern in text)로 검사한 것과 같음
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        values: Dict[str, Set[Hashable]] = {}
+        for pattern, value in patterns:
+            if pattern:
+                values.setdefault(pattern, set()).add(value)
+        self.all_values: Set[Hashable] = set().union(*values.values()) if values else set()
+        self._automaton = ahocorasick.Automaton()
+        for pattern, pattern_values in values.items():
+            self._automaton.add_word(pattern, frozenset(pattern_values))
+        if values:
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> Set[Hashable]:
+        """텍스트에 나타난 패턴들의 값 집합 (모든 값을 찾으면 바로 중단)"""
+        found: Set[Hashable] = set()
+        if not self.all_values or not text:
+            return found
+        for _, pattern_values in self._automaton.iter(text):
+            found |= pattern_values
+            if len(found) == len(self.all_values):
+                break
+        return found
@@ -0,0 +1,104 @@
+# backend/services/single_flight.py
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+class StreamBuffer:
+    """스트리밍 작업이 만든 텍스트 조각 버퍼 - 늦게 합류한 대기자도 처음 조각부터 받음"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self._updated = asyncio.Event()
+
+    def append(self, text: str):
+        self.parts.append(text)
+        self.notify()
+
+    def notify(self):
+        """대기 중인 구독자 깨우기 (다음 대기용 이벤트로 교체)"""
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def wait(self):
+        await self._updated.wait()
+
+
+class SingleFlight:
+    """
+    동일 키의 동시 요청 병합 (request coalescing)
+    - 같은 키로 진행 중인 작업이 있으면 새로 시작하지 않고 그 결과를 공유
+    - 작업은 별도 Task로 실행되므로 최초 요청자가 연결을 끊어도 나머지 대기자는 결과를 받음
+    - stream(): 작업이 StreamBuffer에 쓰는 조각을 모든 대기자에게 도착 순서대로 전달
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._buffers: Dict[str, StreamBuffer] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 해당하는 작업을 한 번만 실행하고 결과를 모든 대기자에게 반환"""
+        task = self._calls.get(key)
+        if task is None:
+            task = self._start(key, fn())
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, fn: Callable[[StreamBuffer], Awaitable[Any]]) -> AsyncIterator[str]:
+        """
+        do()의 스트리밍 버전 - fn(buffer)는 조각을 buffer에 쓰고 전체 결과를 반환
+        진행 중인 작업이 스트리밍이 아니면(do()로 시작) 완료 후 전체 결과를 한 번에 전달
+        """
+        task = self._calls.get(key)
+        if task is None:
+            buffer = StreamBuffer()
+            task = self._start(key, fn(buffer))
+            self._buffers[key] = buffer
+            task.add_done_callback(lambda t: buffer.notify())
+        else:
+            buffer = self._buffers.get(key)
+            self.coalesced += 1
+        return self._follow(task, buffer)
+
+    async def _follow(self, task: asyncio.Task, buffer: Optional[StreamBuffer]) -> AsyncIterator[str]:
+        if buffer is None:
+            yield await asyncio.shield(task)
+            return
+        index = 0
+        while True:
+            if index < len(buffer.parts):
+                index += 1
+                yield buffer.parts[index - 1]
+            elif task.done():
+                task.result()  # 작업이 실패했으면 예외 전달
+                return
+            else:
+                await buffer.wait()
+
+    def _start(self, key: str, awaitable: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.ensure_future(awaitable)
+        self._calls[key] = task
+        task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        self.leaders += 1
+        return task
+
+    def get(self, key: str) -> Optional[asyncio.Task]:
+        """진행 중인 작업 조회 (없으면 None)"""
+        return self._calls.get(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced
+        }
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            self._buffers.pop(key, None)
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 소비
+        if not task.cancelled():
+            task.exception()
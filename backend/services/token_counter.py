@@ -0,0 +1,71 @@
+# backend/services/token_counter.py
+import logging
+import math
+from functools import lru_cache
+from typing import List, Dict, Optional
+
+import tiktoken
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# chat 메시지 하나당 붙는 역할/구분자 토큰과 응답 시작 토큰
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+class PromptTooLargeError(ValueError):
+    """토큰 한도를 넘어 LLM 호출 전에 거부한 프롬프트"""
+
+
+@lru_cache(maxsize=None)
+def _encoding(name: str) -> Optional[tiktoken.Encoding]:
+    """
+    tiktoken 인코딩 (프로세스당 한 번만 로드)
+    어휘 파일은 처음 한 번 받은 뒤 TIKTOKEN_CACHE_DIR에서 오프라인으로 읽음
+    로드할 수 없으면 None → 근사치로 계산
+    """
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"토크나이저 {name} 로드 실패, 근사치로 계산합니다: {e}")
+        return None
+
+
+def load_tokenizer() -> bool:
+    """시작 시 인코딩을 미리 로드 (요청 처리 중에 어휘 파일을 받지 않도록, 스레드에서 호출)"""
+    return _encoding(settings.llm_tokenizer) is not None
+
+
+def _estimate(text: str) -> int:
+    """ASCII는 약 4바이트당 1토큰, 한글 등 비ASCII 문자는 문자당 약 1토큰"""
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수 (네트워크 호출 없음)"""
+    if not text:
+        return 0
+    encoding = _encoding(settings.llm_tokenizer)
+    if encoding is None:
+        return _estimate(text)
+    # diff 안에 <|endoftext|> 같은 문자열이 있어도 일반 텍스트로 취급
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """chat completion 요청 메시지 전체의 프롬프트 토큰 수"""
+    return TOKENS_PER_REPLY + sum(
+        TOKENS_PER_MESSAGE + count_tokens(message["role"]) + count_tokens(message["content"])
+        for message in messages
+    )
+
+
+def add_usage(usage: Optional[Dict[str, int]], **counts: int):
+    """요청별 토큰 사용량 누적 (usage가 None이면 무시)"""
+    if usage is None:
+        return
+    for key, value in counts.items():
+        usage[key] = usage.get(key, 0) + value
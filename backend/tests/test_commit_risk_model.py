@@ -0,0 +1,104 @@
+# backend/tests/test_commit_risk_model.py
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.commit_risk_model import (  # noqa: E402
+    FEATURE_SIZE,
+    NUMERIC_FEATURES,
+    CommitRiskModel,
+    _fit_platt,
+    featurize,
+    grade_for
+)
+
+
+def _dataset(count, seed=0):
+    """첫 특징이 클수록 실패 확률이 높은 데이터"""
+    rng = np.random.RandomState(seed)
+    matrix = rng.normal(size=(count, FEATURE_SIZE)).astype(np.float32)
+    probabilities = 1 / (1 + np.exp(-(2.5 * matrix[:, 0] - 1.0)))
+    labels = (rng.uniform(size=count) < probabilities).astype(np.float64)
+    return matrix, labels
+
+
+def _assessment():
+    return {
+        "baseline_risk": 0.1,
+        "files": [{"path": "app/api.py", "scope": "app/api.py", "risk": 0.3}],
+        "co_changes": {}
+    }
+
+
+def test_grade_thresholds():
+    assert grade_for(0.95) == "Safe"
+    assert grade_for(0.9) == "Safe"
+    assert grade_for(0.8) == "Caution"
+    assert grade_for(0.5) == "High Risk"
+    assert grade_for(0.1) == "Critical"
+
+
+def test_fit_learns_the_risk_signal():
+    matrix, labels = _dataset(400)
+    model = CommitRiskModel.fit(matrix, labels)
+
+    risky = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    safe = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    risky[0], safe[0] = 2.0, -2.0
+    assert model.failure_probability(risky) > 0.7
+    assert model.failure_probability(safe) < 0.3
+    assert model.predict(safe)["grade"] in ("Safe", "Caution")
+
+
+def test_calibration_and_evaluation_use_disjoint_holdout_halves():
+    matrix, labels = _dataset(1000)
+    model = CommitRiskModel.fit(matrix, labels)
+
+    assert model.metrics["trained_commits"] == 800
+    assert model.metrics["calibration_commits"] == 100
+    assert model.metrics["holdout_commits"] == 100
+    assert model.metrics["brier"] < model.metrics["baseline_brier"]
+
+
+def test_small_history_skips_calibration():
+    matrix, labels = _dataset(150)
+    model = CommitRiskModel.fit(matrix, labels)
+
+    assert model.platt == (1.0, 0.0)
+    assert model.metrics["trained_commits"] == 150
+    assert "brier" not in model.metrics
+
+
+def test_platt_scaling_recovers_logit_scale():
+    rng = np.random.RandomState(1)
+    logits = rng.normal(scale=3.0, size=4000)
+    labels = (rng.uniform(size=4000) < 1 / (1 + np.exp(-0.5 * logits))).astype(np.float64)
+    a, b = _fit_platt(logits, labels, iterations=2000)
+    assert abs(a - 0.5) < 0.1
+    assert abs(b) < 0.15
+
+
+def test_save_and_load_round_trip(tmp_path):
+    matrix, labels = _dataset(200)
+    model = CommitRiskModel.fit(matrix, labels)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+
+    loaded = CommitRiskModel.load(path)
+    assert loaded.metrics == model.metrics
+    assert loaded.failure_probability(matrix[0]) == model.failure_probability(matrix[0])
+    assert CommitRiskModel.load(str(tmp_path / "missing.npz")) is None
+
+
+def test_featurize_flags_fix_commits_without_leaking_fix_words():
+    files = [("app/api.py", 10, 2)]
+    fix = featurize(_assessment(), files, "fix: handle empty payload")
+    feature = featurize(_assessment(), files, "handle empty payload")
+
+    assert fix.shape == (FEATURE_SIZE,)
+    assert fix[NUMERIC_FEATURES - 1] == 1.0 and feature[NUMERIC_FEATURES - 1] == 0.0
+    # 메시지 bag-of-words에는 "fix" 토큰이 들어가지 않음
+    assert np.array_equal(fix[NUMERIC_FEATURES:], feature[NUMERIC_FEATURES:])
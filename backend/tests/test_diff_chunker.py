@@ -0,0 +1,100 @@
+# backend/tests/test_diff_chunker.py
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from config import settings  # noqa: E402
+from services import llm_service  # noqa: E402
+from services.diff_chunker import split_diff, split_files  # noqa: E402
+
+
+def _words(text):
+    """테스트용 토큰 수: 공백으로 나눈 단어 수"""
+    return len(text.split())
+
+
+def _hunk(start, lines, word="token"):
+    return [f"@@ -{start},{lines} +{start},{lines} @@"] + [f"+{word}{start}_{i} a b c" for i in range(lines)]
+
+
+def test_small_diff_is_returned_unchanged():
+    diff = "\n".join(["=== a.py ==="] + _hunk(1, 3))
+    assert split_diff(diff, 1000, _words) == [diff]
+
+
+def test_files_are_split_with_their_header():
+    diff = "\n".join(["=== a.py ==="] + _hunk(1, 10) + ["=== b.py ==="] + _hunk(1, 10))
+    chunks = split_diff(diff, 60, _words)
+
+    assert [chunk.split("\n", 1)[0] for chunk in chunks] == ["=== a.py ===", "=== b.py ==="]
+    assert all(_words(chunk) <= 60 for chunk in chunks)
+
+
+def test_large_file_is_split_at_hunk_boundaries():
+    hunks = [_hunk(start, 8) for start in (1, 50, 100)]
+    diff = "\n".join(["=== big.py ==="] + [line for hunk in hunks for line in hunk])
+    chunks = split_diff(diff, 50, _words)
+
+    assert len(chunks) == 3
+    for chunk, hunk in zip(chunks, hunks):
+        assert chunk.split("\n") == ["=== big.py ==="] + hunk
+
+
+def test_oversized_hunk_is_split_at_lines_with_repeated_hunk_header():
+    hunk = _hunk(1, 30)
+    diff = "\n".join(["=== big.py ==="] + hunk)
+    chunks = split_diff(diff, 40, _words)
+
+    assert len(chunks) > 1
+    body = []
+    for chunk in chunks:
+        lines = chunk.split("\n")
+        assert lines[:2] == ["=== big.py ===", hunk[0]]
+        assert _words(chunk) <= 40
+        body.extend(lines[2:])
+    assert body == hunk[1:]
+
+
+def test_line_longer_than_budget_is_split_by_characters():
+    long_line = "+" + "x" * 500
+    chunks = split_diff("\n".join(["=== min.js ===", "@@ -1 +1 @@", long_line]), 120, len)
+
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert "".join(chunk.split("\n")[2] for chunk in chunks) == long_line
+
+
+def test_split_files_without_headers_is_one_file():
+    assert split_files("@@ -1 +1 @@\n+x") == [("", ["@@ -1 +1 @@", "+x"])]
+
+
+def test_reduce_merges_partial_reports_hierarchically(monkeypatch):
+    monkeypatch.setattr(llm_service, "count_tokens", _words)
+    monkeypatch.setattr(settings, "llm_chunk_tokens", 450)
+    service = llm_service.AzureOpenAIService.__new__(llm_service.AzureOpenAIService)
+    merged = []
+
+    async def complete(messages, temperature):
+        merged.append(messages[1]["content"].count("--- 부분 분석"))
+        return f"merged {len(merged)}"
+
+    service._complete = complete
+    reports = [" ".join(["word"] * 200) + f" report{index}" for index in range(10)]
+    usage = {}
+    messages = asyncio.run(service._build_reduce_messages("critical", reports, "msg", "a.py", usage))
+
+    # 200단어 결과 10개 → 예산(450) 안에서 2개씩 묶어 5번 합친 뒤 최종 reduce 메시지 구성
+    assert merged == [2, 2, 2, 2, 2]
+    assert usage["llm_calls"] == 5
+    assert messages[1]["content"].count("--- 부분 분석") == 5
+    assert "merged 5" in messages[1]["content"]
+
+
+def test_group_reports_keeps_at_least_two_reports_per_group(monkeypatch):
+    monkeypatch.setattr(llm_service, "count_tokens", _words)
+    monkeypatch.setattr(settings, "llm_chunk_tokens", 10)
+    service = llm_service.AzureOpenAIService.__new__(llm_service.AzureOpenAIService)
+    reports = [" ".join(["word"] * 20)] * 5
+
+    assert [len(group) for group in service._group_reports(reports)] == [2, 2, 1]
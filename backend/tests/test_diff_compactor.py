@@ -0,0 +1,49 @@
+# backend/tests/test_diff_compactor.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.diff_compactor import compact_patch, _new_stats  # noqa: E402
+
+
+def _compact(patch):
+    stats = _new_stats()
+    return compact_patch(patch, -1, stats), stats
+
+
+def test_python_dedent_is_not_collapsed():
+    patch = "\n".join([
+        "@@ -10,3 +10,3 @@ def pay(user):",
+        "     if user.is_admin:",
+        "-        commit_payment(user)",
+        "+    commit_payment(user)",
+        "     return True",
+    ])
+    compacted, stats = _compact(patch)
+    assert "+    commit_payment(user)" in compacted
+    assert stats["whitespace_hunks"] == 0
+
+
+def test_spaces_inside_string_literal_are_kept():
+    patch = "\n".join([
+        "@@ -1 +1 @@",
+        '-SEPARATOR = "a  b"',
+        '+SEPARATOR = "a b"',
+    ])
+    compacted, stats = _compact(patch)
+    assert '+SEPARATOR = "a b"' in compacted
+    assert stats["whitespace_hunks"] == 0
+
+
+def test_trailing_and_inner_whitespace_is_collapsed():
+    patch = "\n".join([
+        "@@ -1,2 +1,2 @@",
+        "-    total = add(a,b)   ",
+        "-    return  total",
+        "+    total = add( a, b )",
+        "+    return total",
+    ])
+    compacted, stats = _compact(patch)
+    assert "공백만 변경됨" in compacted
+    assert stats["whitespace_hunks"] == 1
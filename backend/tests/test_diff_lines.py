@@ -0,0 +1,39 @@
+# backend/tests/test_diff_lines.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.diff_lines import ADDED, HEADER, REMOVED, classify_lines, iter_lines  # noqa: E402
+
+
+def _classify(lines):
+    return list(classify_lines(iter_lines("\n".join(lines))))
+
+
+def test_concatenated_diffs_start_a_new_file_header_inside_a_hunk():
+    kinds = _classify([
+        "--- a/first.py",
+        "+++ b/first.py",
+        "@@ -1,1 +1,1 @@",
+        "-old()",
+        "+new()",
+        "--- a/second.py",
+        "+++ b/second.py",
+        "@@ -1,0 +1,1 @@",
+        "+added()",
+    ])
+    assert kinds[5] == (HEADER, "--- a/second.py")
+    assert kinds[6] == (HEADER, "+++ b/second.py")
+    assert [content for kind, content in kinds if kind == ADDED] == ["new()", "added()"]
+
+
+def test_removed_line_starting_with_dashes_stays_removed():
+    kinds = _classify([
+        "@@ -1,2 +1,1 @@",
+        "--- SQL comment",
+        " select 1;",
+        "--- trailing",
+    ])
+    assert kinds[1] == (REMOVED, "-- SQL comment")
+    assert kinds[3] == (REMOVED, "-- trailing")
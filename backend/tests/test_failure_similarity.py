@@ -0,0 +1,94 @@
+# backend/tests/test_failure_similarity.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.failure_similarity import FailureSimilarityIndex, diff_shingles, minhash  # noqa: E402
+
+
+def _diff(name, lines=30, changed=0):
+    """name마다 다른 코드, changed개 줄만 바꾼 변형"""
+    return "\n".join(
+        ["=== app/module.py ===", "@@ -1,30 +1,30 @@"]
+        + [
+            f"+{name}_result_{i} = compute_{name}(value_{i}, limit={i})" if i >= changed
+            else f"+{name}_result_{i} = replaced_call(other_{i})"
+            for i in range(lines)
+        ]
+    )
+
+
+def _sha(number):
+    return f"{number:040x}"
+
+
+def test_minhash_estimates_jaccard_similarity():
+    original = diff_shingles(_diff("alpha"))
+    variant = diff_shingles(_diff("alpha", changed=6))
+    jaccard = len(set(original.tolist()) & set(variant.tolist())) / len(set(original.tolist()) | set(variant.tolist()))
+    estimate = float((minhash(original) == minhash(variant)).mean())
+    assert abs(estimate - jaccard) < 0.15
+
+
+def test_context_and_header_lines_are_not_shingled():
+    assert not len(diff_shingles("=== a.py ===\n@@ -1,2 +1,2 @@\n unchanged line\n--- a/a.py\n+++ b/a.py"))
+
+
+def test_query_finds_near_duplicate_among_unrelated_failures():
+    index = FailureSimilarityIndex()
+    for number in range(50):
+        index.add(_sha(number), f"commit {number}", ["app/module.py"], _diff(f"name{number}"))
+
+    results = index.query(_diff("name17", changed=3), k=3)
+    assert results[0]["sha"] == _sha(17)
+    assert results[0]["similarity"] > 0.7
+    assert all(result["similarity"] < 0.3 for result in results[1:])
+    excluded = index.query(_diff("name17", changed=3), k=3, exclude=_sha(17))
+    assert all(result["sha"] != _sha(17) for result in excluded)
+
+
+def test_duplicate_and_empty_diffs_are_not_added():
+    index = FailureSimilarityIndex()
+    assert index.add(_sha(1), "first", ["a.py"], _diff("one"))
+    assert not index.add(_sha(1), "again", ["a.py"], _diff("two"))
+    assert not index.add(_sha(2), "context only", ["a.py"], "@@ -1 +1 @@\n unchanged")
+    assert index.count == 1
+
+
+def test_save_and_reload_round_trip(tmp_path):
+    directory = str(tmp_path / "minhash")
+    index = FailureSimilarityIndex(directory)
+    for number in range(10):
+        index.add(_sha(number), f"commit {number}", [f"file{number}.py"], _diff(f"name{number}"))
+    index.save()
+    index.add(_sha(10), "after save", ["late.py"], _diff("late"))
+    index.save()
+
+    reloaded = FailureSimilarityIndex(directory)
+    assert reloaded.stats() == {"failed_commits": 11, "on_disk": 11, "pending": 0}
+    assert reloaded.contains(_sha(4)) and reloaded.contains(_sha(10))
+    assert not reloaded.contains(_sha(11))
+    best = reloaded.query(_diff("name4"), k=1)[0]
+    assert best == {"sha": _sha(4), "subject": "commit 4", "files": ["file4.py"], "similarity": 1.0}
+    assert reloaded.query(_diff("late"), k=1)[0]["sha"] == _sha(10)
+
+
+def test_commit_added_during_save_stays_queryable(tmp_path):
+    index = FailureSimilarityIndex(str(tmp_path / "minhash"))
+    for number in range(3):
+        index.add(_sha(number), f"commit {number}", ["a.py"], _diff(f"name{number}"))
+
+    write_array = index._write_array
+
+    def add_while_saving(filename, array):
+        if filename == "band_keys.npy":
+            index.add(_sha(99), "added during save", ["b.py"], _diff("late"))
+        write_array(filename, array)
+
+    index._write_array = add_while_saving
+    index.save()
+
+    assert index.stats() == {"failed_commits": 4, "on_disk": 3, "pending": 1}
+    assert index.query(_diff("late"), k=1)[0]["sha"] == _sha(99)
+    assert index.query(_diff("name1"), k=1)[0]["sha"] == _sha(1)
@@ -0,0 +1,95 @@
+# backend/tests/test_history_index.py
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.history_index import HistoryIndex  # noqa: E402
+
+INTRODUCER = "a" * 40
+UNRELATED = "b" * 40
+FIXER = "c" * 40
+REVERTER = "d" * 40
+
+
+def _patch(removed=(), added=()):
+    return "\n".join(
+        [f"@@ -1,{len(removed)} +1,{len(added)} @@"]
+        + [f"-{line}" for line in removed]
+        + [f"+{line}" for line in added]
+    )
+
+
+def test_reverted_commit_is_failed_and_revert_is_only_a_fix():
+    index = HistoryIndex()
+    # 최신 커밋부터 수집
+    index.add_commit(
+        REVERTER, 200, f'Revert "add cache"\n\nThis reverts commit {INTRODUCER}.', [("app/cache.py", 0, 10)]
+    )
+    index.add_commit(INTRODUCER, 100, "add cache", [("app/cache.py", 10, 0)])
+    index.resolve_pending()
+
+    assert index.commits[INTRODUCER].failed
+    assert not index.commits[REVERTER].failed
+    assert index.commits[REVERTER].fix
+
+
+def test_fix_labels_the_commit_that_added_the_fixed_line():
+    index = HistoryIndex()
+    index.add_commit(
+        FIXER, 300, "fix: handle missing key", [("app/api.py", 1, 1)],
+        {"app/api.py": _patch(removed=["value = data['key']"], added=["value = data.get('key')"])}
+    )
+    index.add_commit(
+        UNRELATED, 200, "add logging", [("app/api.py", 1, 0)],
+        {"app/api.py": _patch(added=["logger.info('called')"])}
+    )
+    index.add_commit(
+        INTRODUCER, 100, "read key from payload", [("app/api.py", 1, 0)],
+        {"app/api.py": _patch(added=["value = data['key']"])}
+    )
+    index.resolve_pending()
+
+    assert index.commits[INTRODUCER].failed
+    assert not index.commits[UNRELATED].failed
+    assert not index.commits[FIXER].failed
+    assert index.stats()["failed_commits"] == 1
+
+
+def test_fix_of_already_indexed_commit_labels_last_commit_touching_the_file(tmp_path):
+    log_path = str(tmp_path / "history.jsonl")
+    index = HistoryIndex(log_path)
+    index.add_commit(UNRELATED, 200, "tune timeout", [("app/api.py", 1, 1)])
+    index.add_commit(INTRODUCER, 100, "add api", [("app/api.py", 10, 0)])
+    index.resolve_pending()
+    index.write_log(index.take_log())
+
+    # 다음 수집: 새 수정 커밋이 고친 줄의 유입 커밋은 이미 인덱스에 있음
+    index.add_commit(
+        FIXER, 300, "hotfix timeout", [("app/api.py", 1, 1)],
+        {"app/api.py": _patch(removed=["timeout = 0"], added=["timeout = 30"])}
+    )
+    index.resolve_pending()
+    index.write_log(index.take_log())
+
+    assert index.commits[UNRELATED].failed
+    assert not index.commits[INTRODUCER].failed
+    assert not index.commits[FIXER].failed
+
+    reloaded = HistoryIndex(log_path)
+    assert [sha for sha, record in reloaded.commits.items() if record.failed] == [UNRELATED]
+    assert reloaded.commits[FIXER].fix
+
+
+def test_legacy_log_is_archived_for_reingestion(tmp_path):
+    log_path = tmp_path / "history.jsonl"
+    log_path.write_text(
+        json.dumps({"c": FIXER, "t": 1, "s": "fix: bug", "f": True, "files": [["a.py", 1, 1]]}) + "\n",
+        encoding="utf-8"
+    )
+    index = HistoryIndex(str(log_path))
+
+    assert index.legacy_reset
+    assert not index.commits
+    assert os.path.exists(str(log_path) + ".legacy")
@@ -0,0 +1,105 @@
+# backend/tests/test_knowledge_chunks.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services import knowledge_chunks  # noqa: E402
+from services.knowledge_chunks import (  # noqa: E402
+    MIN_RELATIVE_SCORE, format_chunk, pack_chunks, relative_scores, split_sections
+)
+
+DOCUMENT = """# 결제 API
+소개 문단
+---
+## 주요 주의사항
+### 치명적 위험
+토큰을 로그에 남기지 않기
+### 한도
+일 한도 확인
+## API 식별 패턴
+payment.client
+"""
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def _chunk(filename, section, score, order=0, words=1):
+    return {"filename": filename, "section": section, "content": " ".join(["w"] * words), "score": score, "order": order}
+
+
+def test_split_sections_keeps_heading_trail():
+    chunks = split_sections("payment.md", DOCUMENT)
+    assert [(chunk["section"], chunk["content"]) for chunk in chunks] == [
+        ("", "소개 문단"),
+        ("주요 주의사항 > 치명적 위험", "토큰을 로그에 남기지 않기"),
+        ("주요 주의사항 > 한도", "일 한도 확인"),
+        ("API 식별 패턴", "payment.client"),
+    ]
+    assert all(chunk["title"] == "결제 API" for chunk in chunks)
+    assert [chunk["order"] for chunk in chunks] == [0, 1, 2, 3]
+
+
+def test_split_sections_without_headings():
+    assert split_sections("plain.md", "first line\nsecond line\n") == [
+        {"filename": "plain.md", "title": "", "section": "", "content": "first line\nsecond line", "order": 0}
+    ]
+    assert split_sections("empty.md", "# 제목만\n---\n") == []
+
+
+def test_relative_scores_blend_document_relevance():
+    results = [
+        {"filename": "a.md", "score": 10.0},
+        {"filename": "b.md", "score": 5.0},
+        {"filename": "a.md", "score": 1.0},
+    ]
+    scores = [chunk["score"] for chunk in relative_scores(results)]
+    assert scores[0] == 1.0
+    # 관련 문서(a.md)의 섹션은 본문 점수가 낮아도 다른 문서 섹션보다 위
+    assert scores[2] > scores[1]
+    assert relative_scores([]) == []
+    assert relative_scores([{"filename": "a.md", "score": 0.0}]) == []
+
+
+def test_pack_chunks_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(knowledge_chunks, "count_tokens", _words)
+    chunks = [
+        _chunk("a.md", "큰 섹션", 1.0, order=0, words=20),
+        _chunk("a.md", "작은 섹션", 0.9, order=1, words=3),
+        _chunk("b.md", "다른 문서", 0.8, order=0, words=3),
+    ]
+    packed = pack_chunks(chunks, max_tokens=10)
+    # 예산을 넘는 큰 섹션은 건너뛰고 작은 섹션으로 채움
+    assert [chunk["section"] for chunk in packed] == ["작은 섹션", "다른 문서"]
+    assert sum(_words(format_chunk(chunk)) for chunk in packed) <= 10
+    assert pack_chunks(chunks, max_tokens=0) == []
+
+
+def test_pack_chunks_drops_low_scores_and_applies_section_weights(monkeypatch):
+    monkeypatch.setattr(knowledge_chunks, "count_tokens", _words)
+    chunks = [
+        _chunk("a.md", "일반", 1.0),
+        _chunk("a.md", "API 식별 패턴", 1.0, order=1),
+        _chunk("a.md", "치명적 위험", 0.8, order=2),
+        _chunk("b.md", "관련 낮음", MIN_RELATIVE_SCORE * 1.2 - 0.01),
+    ]
+    packed = pack_chunks(chunks, max_tokens=1000)
+    # 식별 패턴 섹션(가중치 0.2)과 최고 점수(치명적 1.2) 대비 낮은 섹션은 제외
+    assert [chunk["section"] for chunk in packed] == ["일반", "치명적 위험"]
+    assert packed[1]["score"] > packed[0]["score"]
+    assert pack_chunks([_chunk("a.md", "", 0.0)], max_tokens=1000) == []
+
+
+def test_pack_chunks_orders_by_document_then_position(monkeypatch):
+    monkeypatch.setattr(knowledge_chunks, "count_tokens", _words)
+    chunks = [
+        _chunk("b.md", "b-2", 0.6, order=2),
+        _chunk("a.md", "a-1", 0.9, order=1),
+        _chunk("b.md", "b-0", 1.0, order=0),
+        _chunk("a.md", "a-0", 0.5, order=0),
+    ]
+    packed = pack_chunks(chunks, max_tokens=1000)
+    # 가장 높은 섹션이 있는 문서부터, 문서 안에서는 원래 순서
+    assert [chunk["section"] for chunk in packed] == ["b-0", "b-2", "a-0", "a-1"]
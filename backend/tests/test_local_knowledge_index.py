@@ -0,0 +1,104 @@
+# backend/tests/test_local_knowledge_index.py
+import math
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.knowledge_chunks import index_text  # noqa: E402
+from services.local_knowledge_index import (  # noqa: E402
+    BM25_B, BM25_K1, LocalKnowledgeIndex, docs_fingerprint, tokenize
+)
+
+SECTIONS = [
+    {"filename": "payment.md", "title": "결제 API", "section": "인증", "content": "payment token payment refund", "order": 0},
+    {"filename": "payment.md", "title": "결제 API", "section": "한도", "content": "refund limit per day", "order": 1},
+    {"filename": "sms.md", "title": "문자 API", "section": "발송", "content": "sms send " + "filler " * 30, "order": 0},
+    {"filename": "map.md", "title": "지도 API", "section": "", "content": "map tile payment", "order": 0},
+]
+
+
+def _reference_scores(documents, tokens):
+    """교과서 BM25 (토큰 점수 합)"""
+    docs = [tokenize(index_text(document)) for document in documents]
+    average = sum(len(doc) for doc in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        counts = Counter(doc)
+        score = 0.0
+        for token in tokens:
+            df = sum(1 for other in docs if token in other)
+            if not counts[token]:
+                continue
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / average)
+            score += idf * counts[token] * (BM25_K1 + 1) / (counts[token] + norm)
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_reference_bm25():
+    index = LocalKnowledgeIndex.build(SECTIONS)
+    expected = _reference_scores(SECTIONS, ["payment", "refund"])
+    results = index.search(["payment", "refund"], top=len(SECTIONS))
+
+    ranked = sorted((score, doc_id) for doc_id, score in enumerate(expected) if score > 0)
+    assert [result["content"] for result in results] == [SECTIONS[doc_id]["content"] for _, doc_id in reversed(ranked)]
+    for result, (score, _) in zip(results, reversed(ranked)):
+        assert math.isclose(result["score"], score, rel_tol=1e-5)
+
+
+def test_term_frequency_and_length_normalization_order_results():
+    index = LocalKnowledgeIndex.build(SECTIONS)
+    # payment 2회 등장한 짧은 섹션이 1회 등장한 섹션보다 위
+    assert [result["section"] for result in index.search(["payment"], top=3)] == ["인증", ""]
+    # 긴 섹션에 한 번 나온 용어는 짧은 섹션보다 낮게
+    long_index = LocalKnowledgeIndex.build([
+        {"filename": "a.md", "title": "", "section": "", "content": "quota " + "word " * 40},
+        {"filename": "b.md", "title": "", "section": "", "content": "quota word"},
+    ])
+    assert long_index.search(["quota"], top=2)[0]["filename"] == "b.md"
+
+
+def test_multi_token_term_counts_once_and_title_is_searchable():
+    index = LocalKnowledgeIndex.build(SECTIONS)
+    # 제목에만 있는 용어("문자")로 섹션 검색
+    assert index.search(["문자"])[0]["filename"] == "sms.md"
+    # 여러 토큰으로 나뉘는 검색어는 토큰 점수 평균
+    single = index.search(["payment"], top=1)[0]["score"]
+    doubled = index.search(["payment payment"], top=1)[0]["score"]
+    assert math.isclose(single, doubled, rel_tol=1e-6)
+
+
+def test_no_match_and_empty_index():
+    index = LocalKnowledgeIndex.build(SECTIONS)
+    assert index.search(["nonexistent"], top=5) == []
+    assert index.search([], top=5) == []
+    assert LocalKnowledgeIndex.build([]).search(["payment"]) == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = LocalKnowledgeIndex.build(SECTIONS, with_embeddings=True)
+    index.save(str(tmp_path), "fp-1")
+
+    loaded = LocalKnowledgeIndex.load(str(tmp_path), "fp-1")
+    assert loaded is not None and loaded.embeddings is not None
+    assert loaded.search(["refund", "limit"], top=4) == index.search(["refund", "limit"], top=4)
+    # 지문이 다르면 다시 빌드하도록 None
+    assert LocalKnowledgeIndex.load(str(tmp_path), "fp-2") is None
+
+
+def test_from_directory_rebuilds_when_docs_change(tmp_path):
+    docs, store = tmp_path / "docs", tmp_path / "index"
+    docs.mkdir()
+    (docs / "a.md").write_text("# 결제\n## 환불\nrefund policy\n", encoding="utf-8")
+
+    first = LocalKnowledgeIndex.from_directory(str(docs), str(store))
+    assert first.search(["refund"])[0]["section"] == "환불"
+    assert (store / "meta.json").exists()
+
+    (docs / "b.md").write_text("# 지도\nmap tile refund refund\n", encoding="utf-8")
+    assert docs_fingerprint(str(docs), False) != docs_fingerprint(str(docs), True)
+    second = LocalKnowledgeIndex.from_directory(str(docs), str(store))
+    assert second.stats()["documents"] == 2
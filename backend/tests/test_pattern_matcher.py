@@ -0,0 +1,56 @@
+# backend/tests/test_pattern_matcher.py
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.api_registry import ApiDetectorRegistry  # noqa: E402
+from services.pattern_matcher import PatternMatcher  # noqa: E402
+
+RAG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "RAG")
+
+
+def _substring_loop(patterns, text):
+    """기존 방식: 패턴마다 (pattern in text)"""
+    return {value for pattern, value in patterns if pattern and pattern in text}
+
+
+def test_matches_substring_loop_on_random_inputs():
+    rng = random.Random(7)
+    for _ in range(300):
+        patterns = [
+            ("".join(rng.choice("abc") for _ in range(rng.randint(1, 4))), rng.randint(0, 5))
+            for _ in range(rng.randint(1, 8))
+        ]
+        text = "".join(rng.choice("abc\n") for _ in range(rng.randint(0, 40)))
+        assert PatternMatcher(patterns).find(text) == _substring_loop(patterns, text)
+
+
+def test_overlapping_and_shared_patterns():
+    matcher = PatternMatcher([("pay", "payment"), ("payment", "billing"), ("ayme", "other"), ("pay", "wallet")])
+    assert matcher.find("client.payment()") == {"payment", "billing", "other", "wallet"}
+    assert matcher.find("client.pa()") == set()
+
+
+def test_empty_patterns_and_text():
+    assert PatternMatcher([]).find("anything") == set()
+    assert PatternMatcher([("", "empty")]).find("anything") == set()
+    assert PatternMatcher([("x", 1)]).find("") == set()
+
+
+def test_registry_detection_matches_substring_loop_on_rag_documents():
+    registry = ApiDetectorRegistry(RAG_DIR, reload_interval=0)
+    patterns = [
+        (pattern, api_type) for api_type, api_patterns in registry.api_patterns.items() for pattern in api_patterns
+    ] + [(url, api_type) for url, api_type in registry.url_patterns.items()]
+    assert patterns
+
+    rng = random.Random(3)
+    filler = ["value = config.get(key)", "for item in items:", "return result", "self.cache = {}"]
+    for _ in range(50):
+        lines = [rng.choice(filler) for _ in range(10)]
+        for pattern, _ in rng.sample(patterns, rng.randint(0, 3)):
+            lines.insert(rng.randint(0, len(lines)), f"client = {pattern}")
+        code = "\n".join(lines)
+        assert set(registry.detect(code)) == _substring_loop(patterns, code)
@@ -0,0 +1,91 @@
+# backend/tests/test_single_flight.py
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.analysis_cache import AnalysisCache  # noqa: E402
+from services.llm_service import AzureOpenAIService  # noqa: E402
+from services.single_flight import SingleFlight  # noqa: E402
+
+
+def _service(upstream_calls):
+    service = AzureOpenAIService.__new__(AzureOpenAIService)
+    service.deployment = "test"
+    service.cache = AnalysisCache(max_entries=16)
+    service.inflight = SingleFlight()
+
+    async def prepare_messages(*args, **kwargs):
+        return [{"role": "user", "content": "diff"}]
+
+    async def stream(messages, temperature):
+        upstream_calls.append(messages)
+        for delta in ["위험도: ", "Safe", "\n"]:
+            await asyncio.sleep(0.01)
+            yield delta
+
+    service._prepare_messages = prepare_messages
+    service._stream = stream
+    return service
+
+
+async def _collect(stream):
+    return "".join([delta async for delta in stream])
+
+
+def test_concurrent_streams_share_one_upstream_call():
+    upstream_calls = []
+    service = _service(upstream_calls)
+
+    async def run():
+        streams = [
+            service.analyze_code_for_critical_issues_stream("diff", "msg", "a.py", ["bug"], usage={})
+            for _ in range(10)
+        ]
+        return await asyncio.gather(*(_collect(stream) for stream in streams))
+
+    results = asyncio.run(run())
+    assert len(upstream_calls) == 1
+    assert results == ["위험도: Safe\n"] * 10
+    assert service.inflight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 9}
+
+
+def test_late_follower_receives_earlier_deltas():
+    async def run():
+        flight = SingleFlight()
+
+        async def produce(buffer):
+            for delta in ["a", "b", "c"]:
+                buffer.append(delta)
+                await asyncio.sleep(0.01)
+            return "".join(buffer.parts)
+
+        leader = asyncio.ensure_future(_collect(flight.stream("key", produce)))
+        await asyncio.sleep(0.015)
+        follower, joined = await asyncio.gather(
+            _collect(flight.stream("key", produce)), flight.do("key", lambda: produce(None))
+        )
+        return await leader, follower, joined
+
+    leader, follower, joined = asyncio.run(run())
+    assert leader == follower == "abc"
+    assert joined == "abc"
+
+
+def test_stream_failure_reaches_every_follower():
+    async def run():
+        flight = SingleFlight()
+
+        async def produce(buffer):
+            buffer.append("partial")
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        outcomes = await asyncio.gather(
+            *(_collect(flight.stream("key", produce)) for _ in range(3)), return_exceptions=True
+        )
+        return outcomes
+
+    outcomes = asyncio.run(run())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
@@ -0,0 +1,56 @@
+# backend/tests/test_token_counter.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from config import settings  # noqa: E402
+from services import token_counter  # noqa: E402
+from services.token_counter import (  # noqa: E402
+    TOKENS_PER_MESSAGE,
+    TOKENS_PER_REPLY,
+    add_usage,
+    count_message_tokens,
+    count_tokens
+)
+
+
+def _without_tokenizer(monkeypatch):
+    """어휘 파일을 받을 수 없는 환경 - 존재하지 않는 인코딩 이름으로 실제 로드 실패 경로를 거침"""
+    monkeypatch.setattr(settings, "llm_tokenizer", "no-such-encoding")
+    token_counter._encoding.cache_clear()
+
+
+def test_missing_tokenizer_falls_back_to_estimate(monkeypatch):
+    _without_tokenizer(monkeypatch)
+    try:
+        assert not token_counter.load_tokenizer()
+        assert count_tokens("abcd" * 10) == 10
+        assert count_tokens("abcde") == 2
+        assert count_tokens("한글 분석") == 5  # 비ASCII 4글자 + 공백 1바이트
+        assert count_tokens("") == 0
+    finally:
+        token_counter._encoding.cache_clear()
+
+
+def test_message_tokens_include_per_message_overhead(monkeypatch):
+    _without_tokenizer(monkeypatch)
+    try:
+        messages = [{"role": "user", "content": "abcd" * 5}]
+        expected = TOKENS_PER_REPLY + TOKENS_PER_MESSAGE + count_tokens("user") + 5
+        assert count_message_tokens(messages) == expected
+    finally:
+        token_counter._encoding.cache_clear()
+
+
+def test_special_token_text_is_counted_as_plain_text():
+    # 토크나이저가 있으면 실제 인코딩, 없으면 근사치 - 어느 쪽이든 예외 없이 계산
+    assert count_tokens("diff with <|endoftext|> inside") > 0
+
+
+def test_add_usage_accumulates_and_ignores_none():
+    usage = {}
+    add_usage(usage, prompt_tokens=10, llm_calls=1)
+    add_usage(usage, prompt_tokens=5)
+    add_usage(None, prompt_tokens=5)
+    assert usage == {"prompt_tokens": 15, "llm_calls": 1}
@@ -2,6 +2,9 @@ import streamlit as st
 import requests
 import json
 import os
+import re
+import hashlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -20,9 +23,71 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ===== GitHub 응답 캐시 =====
+GITHUB_CACHE_MAX_ENTRIES = 500
+RANGE_MAX_COMMITS = 1000  # 기간별 커밋 조회 시 최대 커밋 수
+FULL_SHA_PATTERN = re.compile(r"^[0-9a-fA-F]{40}$")
+
+@st.cache_resource
+def get_github_response_cache():
+    """GitHub 응답 캐시 (URL별 ETag/Last-Modified/본문) - 재실행 및 세션 간 공유"""
+    return OrderedDict()
+
+def github_get(url, headers, params=None, immutable=False):
+    """
+    GitHub GET 요청 (조건부 요청 캐시 적용)
+    - 저장된 ETag/Last-Modified로 재검증, 304 응답은 rate limit에 포함되지 않음
+    - immutable=True(전체 SHA 커밋 상세)이면 캐시 적중 시 요청하지 않음
+    반환: (status_code, 200이면 JSON 본문 아니면 None, 다음 페이지 URL 또는 None)
+    """
+    cache = get_github_response_cache()
+    token_id = hashlib.sha256(headers.get("Authorization", "").encode()).hexdigest()[:16]
+    key = json.dumps([token_id, url, params or {}], sort_keys=True, default=str)
+    
+    cached = cache.get(key)
+    if cached is not None:
+        cache.move_to_end(key)
+        if cached["immutable"]:
+            return 200, cached["data"], cached.get("next_url")
+    
+    request_headers = dict(headers)
+    if cached is not None:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+    
+    response = requests.get(url, headers=request_headers, params=params, timeout=10)
+    
+    if response.status_code == 304 and cached is not None:
+        return 200, cached["data"], cached.get("next_url")
+    if response.status_code != 200:
+        return response.status_code, None, None
+    
+    data = response.json()
+    next_url = response.links.get("next", {}).get("url")
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified or immutable:
+        cache[key] = {
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": immutable,
+            "next_url": next_url
+        }
+        cache.move_to_end(key)
+        while len(cache) > GITHUB_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    return 200, data, next_url
+
 # ===== 헬퍼 함수들 =====
-def get_commits(owner, repo, token=None, since=None, until=None, per_page=10):
-    """GitHub API를 통해 커밋 목록 조회"""
+def get_commits(owner, repo, token=None, since=None, until=None, per_page=10, max_commits=None):
+    """
+    GitHub API를 통해 커밋 목록 조회
+    max_commits를 지정하면 Link: rel="next"를 따라 여러 페이지를 최대 max_commits개까지 조회
+    (중간 페이지에서 실패하면 그때까지 받은 커밋을 반환하고 목록이 잘렸다고 경고)
+    """
     try:
         url = f"https://api.github.com/repos/{owner}/{repo}/commits"
         headers = {}
@@ -37,16 +102,34 @@ def get_commits(owner, repo, token=None, since=None, until=None, per_page=10):
         if until:
             params["until"] = until.isoformat()
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        commits = []
+        while True:
+            try:
+                status_code, data, next_url = github_get(url, headers, params=params)
+            except requests.exceptions.RequestException as e:
+                if not commits:
+                    raise
+                status_code, failure = None, f"네트워크 오류: {str(e)}"
+                break
+            if status_code != 200:
+                failure = f"GitHub API 오류: {status_code}"
+                break
+            commits.extend(data)
+            if not max_commits or not next_url or len(commits) >= max_commits:
+                break
+            # next URL에는 쿼리가 모두 포함되어 있음
+            url, params = next_url, None
         
-        if response.status_code == 200:
-            return response.json(), None
-        elif response.status_code == 404:
+        if status_code != 200 and commits:
+            st.warning(f"⚠️ 다음 페이지 조회에 실패해 커밋 {len(commits)}개까지만 표시합니다. ({failure})")
+        if status_code == 200 or commits:
+            return commits[:max_commits] if max_commits else commits, None
+        elif status_code == 404:
             return None, "Repository를 찾을 수 없습니다. Owner/Name을 확인해주세요."
-        elif response.status_code == 403:
+        elif status_code == 403:
             return None, "API 요청 한도를 초과했습니다. GitHub Token을 설정해주세요."
         else:
-            return None, f"GitHub API 오류: {response.status_code}"
+            return None, f"GitHub API 오류: {status_code}"
     except Exception as e:
         return None, f"네트워크 오류: {str(e)}"
 
@@ -58,14 +141,15 @@ def get_commit_detail(owner, repo, sha, token=None):
         if token:
             headers["Authorization"] = f"token {token}"
         
-        response = requests.get(url, headers=headers, timeout=10)
+        # 전체 SHA로 조회한 커밋은 불변이므로 재검증 없이 캐시 사용
+        status_code, data, _ = github_get(url, headers, immutable=bool(FULL_SHA_PATTERN.match(sha)))
         
-        if response.status_code == 200:
-            return response.json(), None
-        elif response.status_code == 404:
+        if status_code == 200:
+            return data, None
+        elif status_code == 404:
             return None, "커밋을 찾을 수 없습니다."
         else:
-            return None, f"GitHub API 오류: {response.status_code}"
+            return None, f"GitHub API 오류: {status_code}"
     except Exception as e:
         return None, f"네트워크 오류: {str(e)}"
 
@@ -132,46 +216,59 @@ def get_dummy_commits():
         }
     ]
 
-def analyze_code_with_ai(code_diff, filename, commit_message, provider, model, analysis_types):
-    """AI 코드 분석 함수 - 백엔드 API 호출"""
+def iter_sse_events(response):
+    """SSE 응답을 (event, data) 쌍으로 순회"""
+    response.encoding = "utf-8"
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line == "":
+            # 빈 줄 = 이벤트 경계
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith(":"):
+            continue  # 주석 (keep-alive)
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].lstrip())
+
+def stream_code_analysis_with_ai(code_diff, filename, commit_message, provider, model, analysis_types):
+    """
+    AI 코드 분석 스트리밍 - 백엔드 /analyze/stream 호출
+    생성되는 텍스트 조각을 순서대로 반환하며, 실패 시 RuntimeError 발생
+    """
+    request_data = {
+        "code_diff": code_diff,
+        "filename": filename,
+        "commit_message": commit_message,
+        "provider": provider,
+        "model": model,
+        "analysis_types": analysis_types
+    }
+    
     try:
-        # 백엔드 API 엔드포인트
-        api_url = f"{API_BASE_URL}/analyze"
-        
-        # 요청 데이터
-        request_data = {
-            "code_diff": code_diff,
-            "filename": filename,
-            "commit_message": commit_message,
-            "provider": provider,
-            "model": model,
-            "analysis_types": analysis_types
-        }
-        
-        # API 호출
-        response = requests.post(
-            api_url,
+        with requests.post(
+            f"{API_BASE_URL}/analyze/stream",
             json=request_data,
-            headers={"Content-Type": "application/json"},
-            timeout=30  # 30초 타임아웃
-        )
-        
-        # 응답 확인
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                return data.get("result"), None
-            else:
-                return None, data.get("error", "알 수 없는 오류가 발생했습니다.")
-        else:
-            return None, f"API 호출 실패: HTTP {response.status_code}"
+            headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+            stream=True,
+            timeout=(5, 60)  # (연결, 토큰 간 최대 대기)
+        ) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"API 호출 실패: HTTP {response.status_code}")
             
+            for event, data in iter_sse_events(response):
+                if event == "delta":
+                    yield data.get("text", "")
+                elif event == "error":
+                    raise RuntimeError(data.get("error", "알 수 없는 오류가 발생했습니다."))
+                elif event == "done":
+                    return
     except requests.exceptions.ConnectionError:
-        return None, f"백엔드 서버에 연결할 수 없습니다. ({API_BASE_URL})"
+        raise RuntimeError(f"백엔드 서버에 연결할 수 없습니다. ({API_BASE_URL})")
     except requests.exceptions.Timeout:
-        return None, "요청 시간이 초과되었습니다. 다시 시도해주세요."
-    except Exception as e:
-        return None, f"API 호출 중 오류가 발생했습니다: {str(e)}"
+        raise RuntimeError("요청 시간이 초과되었습니다. 다시 시도해주세요.")
 
 def analyze_real_commit(repo_owner, repo_name, commit_sha, analysis_types, github_token=None):
     """실제 GitHub API로 특정 커밋 분석 요청"""
@@ -242,13 +339,6 @@ def analyze_specific_commit(commit_sha, analysis_types):
     except Exception as e:
         return None, f"API 호출 중 오류가 발생했습니다: {str(e)}"
 
-def display_analysis_result(result):
-    """AI 분석 결과를 보기 좋게 표시"""
-    if result:
-        st.markdown(result)
-    else:
-        st.warning("분석 결과가 없습니다.")
-
 def check_api_connection():
     """API 서버 연결 상태 확인"""
     try:
@@ -420,20 +510,32 @@ with col2:
                         since_date = datetime.combine(start_date, datetime.min.time())
                         until_date = datetime.combine(end_date, datetime.max.time())
                     
-                    commits, error = get_commits(
-                        repo_owner, 
-                        repo_name, 
-                        github_token,
-                        since=since_date,
-                        until=until_date,
-                        per_page=commit_count if commit_option == "최근 커밋" else 30
-                    )
+                    if commit_option == "기간별 커밋":
+                        # 기간 내 커밋을 페이지를 따라가며 모두 조회
+                        commits, error = get_commits(
+                            repo_owner, 
+                            repo_name, 
+                            github_token,
+                            since=since_date,
+                            until=until_date,
+                            per_page=100,
+                            max_commits=RANGE_MAX_COMMITS
+                        )
+                    else:
+                        commits, error = get_commits(
+                            repo_owner, 
+                            repo_name, 
+                            github_token,
+                            per_page=commit_count if commit_option == "최근 커밋" else 30
+                        )
                     
                     if error:
                         st.error(f"❌ {error}")
                     else:
                         st.session_state['commits'] = commits
                         st.success(f"✅ {len(commits)}개의 커밋을 조회했습니다!")
+                        if len(commits) >= RANGE_MAX_COMMITS:
+                            st.info(f"💡 최대 {RANGE_MAX_COMMITS}개까지만 표시합니다. 기간을 좁혀보세요.")
 
 # 커밋 목록 표시
 if 'commits' in st.session_state:
@@ -517,23 +619,23 @@ if 'commits' in st.session_state:
                             if all_patches:
                                 combined_diff = "\n\n".join(all_patches)
                                 
-                                with st.spinner("🤖 AI가 코드를 분석하는 중..."):
-                                    analysis_result, analysis_error = analyze_code_with_ai(
+                                # 분석 결과를 토큰이 도착하는 대로 표시
+                                st.markdown("### 📊 AI 분석 결과")
+                                try:
+                                    analysis_result = st.write_stream(stream_code_analysis_with_ai(
                                         code_diff=combined_diff,
                                         filename=f"{len(filtered_files)}개 파일",
                                         commit_message=commit_detail.get('commit', {}).get('message', ''),
                                         provider=llm_provider,
                                         model=llm_model,
                                         analysis_types=analysis_options
-                                    )
-                                
-                                # 분석 결과를 즉시 표시
-                                if analysis_error:
-                                    st.error(f"❌ AI 분석 실패: {analysis_error}")
-                                elif analysis_result:
-                                    st.success("✅ AI 분석이 완료되었습니다!")
-                                    st.markdown("### 📊 AI 분석 결과")
-                                    display_analysis_result(analysis_result)
+                                    ))
+                                    if analysis_result:
+                                        st.success("✅ AI 분석이 완료되었습니다!")
+                                    else:
+                                        st.warning("분석 결과가 없습니다.")
+                                except RuntimeError as e:
+                                    st.error(f"❌ AI 분석 실패: {e}")
                             else:
                                 st.warning("분석할 코드 변경사항이 없습니다.")
                 